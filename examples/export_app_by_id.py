@@ -3,13 +3,15 @@ import argparse
 from datetime import datetime, timedelta
 import os
 import sys
-import csv
 from graphreporter.auth.client import AuthClient
 from graphreporter.reports.signin_logs import SignInLogsClient
 from graphreporter.config.settings import Settings
+from graphreporter.export.merge import merge_csv_files, read_csv_metadata
+from graphreporter.sync.dedup import Deduplicator
+from graphreporter.sync.resume import ExportJournal
 
-async def export_for_timeframe(signin_client, app_id, start_date, end_date, output_file):
-    """Export logs for a specific timeframe."""
+async def export_for_timeframe(signin_client, app_id, start_date, end_date, output_file, deduplicator=None, journal=None, chunk_id=None, end_inclusive=True):
+    """Export logs for a specific timeframe, resuming after its last written page."""
     try:
         print(f"Exporting sign-in logs from {start_date.date()} to {end_date.date()}...")
         result = await signin_client.export_to_csv(
@@ -17,16 +19,18 @@ async def export_for_timeframe(signin_client, app_id, start_date, end_date, outp
             start_date=start_date,
             end_date=end_date,
             app_id=app_id,
-            max_results=1000  # Maximum allowed by API in a single call
+            deduplicator=deduplicator,
+            journal=journal,
+            chunk_id=chunk_id,
+            end_inclusive=end_inclusive
         )
         
         if result:
             print(f"Successfully exported to: {output_file}")
             print(f"File size: {os.path.getsize(output_file)} bytes")
             
-            # Count number of records
-            with open(result, 'r', encoding='utf-8') as f:
-                line_count = sum(1 for _ in f) - 1  # Subtract 1 for the header row
+            # Number of records, as recorded by the export
+            line_count = read_csv_metadata(result)["rows"]
             print(f"Number of sign-in records: {line_count}")
             return line_count, result
         else:
@@ -37,54 +41,7 @@ async def export_for_timeframe(signin_client, app_id, start_date, end_date, outp
         print(f"Try using a smaller time window or check your connection.")
         return 0, None
 
-def combine_csv_files(file_list, output_file):
-    """Combine multiple CSV files into a single file, keeping only one header.
-    
-    Args:
-        file_list: List of CSV files to combine
-        output_file: Path to the output combined CSV file
-        
-    Returns:
-        Path to the combined file and the total number of rows
-    """
-    if not file_list:
-        return None, 0
-    
-    # Sort files by date (assuming filename format includes dates)
-    file_list.sort()
-    
-    total_rows = 0
-    with open(output_file, 'w', newline='', encoding='utf-8') as outfile:
-        # Process the first file - keep its header
-        with open(file_list[0], 'r', encoding='utf-8') as firstfile:
-            reader = csv.reader(firstfile)
-            writer = csv.writer(outfile)
-            
-            # Copy header from first file
-            header = next(reader)
-            writer.writerow(header)
-            
-            # Copy data from first file
-            for row in reader:
-                writer.writerow(row)
-                total_rows += 1
-        
-        # Process all other files - skip their headers
-        for file_path in file_list[1:]:
-            with open(file_path, 'r', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                
-                # Skip header
-                next(reader, None)
-                
-                # Copy data
-                for row in reader:
-                    writer.writerow(row)
-                    total_rows += 1
-    
-    return output_file, total_rows
-
-async def main(app_id, days=90, chunk_days=10, combine=True):
+async def main(app_id, days=90, chunk_days=10, combine=True, parallel=1, resume=False, dedup_capacity=None):
     """Export sign-in logs for an application identified by its ID.
     
     Args:
@@ -92,6 +49,12 @@ async def main(app_id, days=90, chunk_days=10, combine=True):
         days: Number of days to look back for logs (default: 90)
         chunk_days: Number of days per query chunk to avoid timeouts (default: 10)
         combine: Whether to combine all CSV files into one (default: True)
+        parallel: Number of chunks to export at the same time (default: 1)
+        resume: Whether to continue an interrupted export, skipping the chunks
+            it already wrote and continuing a partial chunk after its last
+            written page (default: False)
+        dedup_capacity: Expected number of records; if given, records returned
+            twice in the run are dropped, with a Bloom filter of that size
     """
     # Initialize the settings and auth client
     settings = Settings()
@@ -99,18 +62,23 @@ async def main(app_id, days=90, chunk_days=10, combine=True):
     graph_client = auth_client.get_client()
     
     # Create the sign-in logs client
-    signin_client = SignInLogsClient(graph_client)
+    signin_client = SignInLogsClient(
+        graph_client, prefetch=settings.page_prefetch, list_encoding=settings.list_encoding
+    )
     
     # Create the output directory if it doesn't exist
     os.makedirs('exports', exist_ok=True)
     
-    # Calculate date ranges
+    # Calculate date ranges, or reuse the ones of the interrupted export
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=days)
+    journal = ExportJournal(settings.state_dir, f"app_by_id_{app_id}")
+    start_date, end_date = journal.start(start_date, end_date, resume)
     
     # Break the query into smaller time chunks to avoid timeouts
     total_records = 0
     all_files = []
+    chunks = []
     
     current_end = end_date
     current_start = max(end_date - timedelta(days=chunk_days), start_date)
@@ -122,27 +90,52 @@ async def main(app_id, days=90, chunk_days=10, combine=True):
             'exports', 
             f'app_signin_logs_{app_id}_{current_start.date()}_{current_end.date()}.csv'
         )
+        chunks.append((current_start, current_end, chunk_output_file))
         
-        # Export logs for this time chunk
-        chunk_records, chunk_file = await export_for_timeframe(
-            signin_client, app_id, current_start, current_end, chunk_output_file
-        )
-        
-        if chunk_file:
-            total_records += chunk_records
-            all_files.append(chunk_file)
-        
-        # Move to the next time chunk
-        current_end = current_start - timedelta(seconds=1)
+        # Move to the next time chunk; it ends before the shared boundary
+        current_end = current_start
         current_start = max(current_start - timedelta(days=chunk_days), start_date)
         
         # Break if we're going to process the same dates again
         if current_start == start_date and current_end <= start_date:
             break
     
+    # Chunks are half-open, so they share no records; the whole-run filter
+    # still drops records returned twice, if a capacity is given
+    deduplicator = Deduplicator(capacity=dedup_capacity)
+    
+    # Export up to `parallel` chunks at the same time
+    semaphore = asyncio.Semaphore(parallel)
+    
+    async def export_bounded(chunk_start, chunk_end, chunk_output_file):
+        chunk_id = chunk_start.isoformat()
+        if journal.is_complete(chunk_id):
+            progress = journal.chunk(chunk_id)
+            print(f"Skipping chunk {chunk_start.date()} to {chunk_end.date()}, already exported")
+            return progress["written"], progress["output"]
+        
+        async with semaphore:
+            chunk_records, chunk_file = await export_for_timeframe(
+                signin_client, app_id, chunk_start, chunk_end, chunk_output_file, deduplicator, journal, chunk_id,
+                end_inclusive=chunk_end == end_date
+            )
+        
+        # Empty and failed chunks are left open, so --resume queries them again
+        if chunk_file:
+            journal.complete(chunk_id, chunk_records, chunk_file)
+        return chunk_records, chunk_file
+    
+    results = await asyncio.gather(*(export_bounded(*chunk) for chunk in chunks))
+    
+    for chunk_records, chunk_file in results:
+        if chunk_file:
+            total_records += chunk_records
+            all_files.append(chunk_file)
+    
     print(f"\nExport summary:")
     print(f"Total records exported: {total_records}")
     print(f"Files created: {len(all_files)}")
+    print(deduplicator.summary())
     
     # Combine files if requested and if we have multiple files
     if combine and len(all_files) > 1:
@@ -152,7 +145,7 @@ async def main(app_id, days=90, chunk_days=10, combine=True):
         )
         
         print(f"\nCombining files into a single CSV file...")
-        result_file, row_count = combine_csv_files(all_files, combined_file)
+        result_file, row_count = merge_csv_files(sorted(all_files), combined_file)
         
         if result_file:
             print(f"Successfully combined files into: {result_file}")
@@ -164,6 +157,11 @@ async def main(app_id, days=90, chunk_days=10, combine=True):
         print(f"\nMultiple files were created due to the time range. If you want to combine them manually:")
         print(f"1. The files contain headers, so you'll need to remove duplicate headers when combining")
         print(f"2. Use a tool like Excel to merge the CSV files")
+    
+    if len(all_files) == len(chunks):
+        journal.clear()
+    else:
+        print(f"\n{len(chunks) - len(all_files)} chunks returned no data. Run again with --resume to retry only those.")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Export sign-in logs for a specific application ID")
@@ -174,11 +172,17 @@ if __name__ == "__main__":
                         help="Number of days per query chunk to avoid timeouts (default: 10)")
     parser.add_argument("--no-combine", action="store_true",
                         help="Do not combine multiple CSV files into one")
+    parser.add_argument("--parallel", type=int, default=1,
+                        help="Number of chunks to export at the same time (default: 1)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted export, skipping the chunks it already wrote and continuing a partial chunk after its last written page")
+    parser.add_argument("--dedup-capacity", type=int,
+                        help="Expected number of records; drops records returned twice in the run, with a Bloom filter of that size")
     
     args = parser.parse_args()
     
     try:
-        asyncio.run(main(args.app_id, args.days, args.chunk_days, not args.no_combine))
+        asyncio.run(main(args.app_id, args.days, args.chunk_days, not args.no_combine, args.parallel, args.resume, args.dedup_capacity))
     except KeyboardInterrupt:
         print("\nOperation cancelled by user.")
         sys.exit(1)
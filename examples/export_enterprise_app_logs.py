@@ -2,13 +2,15 @@ import asyncio
 import argparse
 from datetime import datetime, timedelta
 import os
-import csv
 from graphreporter.auth.client import AuthClient
 from graphreporter.reports.signin_logs import SignInLogsClient
 from graphreporter.config.settings import Settings
+from graphreporter.export.merge import merge_csv_files, read_csv_metadata
+from graphreporter.sync.dedup import Deduplicator
+from graphreporter.sync.resume import ExportJournal
 
-async def export_chunk(signin_client, app_display_name, start_date, end_date, output_file):
-    """Export logs for a specific timeframe."""
+async def export_chunk(signin_client, app_display_name, start_date, end_date, output_file, deduplicator=None, journal=None, chunk_id=None, end_inclusive=True):
+    """Export logs for a specific timeframe, resuming after its last written page."""
     try:
         print(f"Exporting sign-in logs from {start_date.date()} to {end_date.date()}...")
         result = await signin_client.export_to_csv(
@@ -16,16 +18,18 @@ async def export_chunk(signin_client, app_display_name, start_date, end_date, ou
             start_date=start_date,
             end_date=end_date,
             app_display_name=app_display_name,
-            max_results=1000  # Maximum allowed by API in a single call
+            deduplicator=deduplicator,
+            journal=journal,
+            chunk_id=chunk_id,
+            end_inclusive=end_inclusive
         )
         
         if result:
             print(f"Successfully exported to: {output_file}")
             print(f"File size: {os.path.getsize(output_file)} bytes")
             
-            # Count number of records
-            with open(result, 'r', encoding='utf-8') as f:
-                line_count = sum(1 for _ in f) - 1  # Subtract 1 for the header row
+            # Number of records, as recorded by the export
+            line_count = read_csv_metadata(result)["rows"]
             print(f"Number of sign-in records: {line_count}")
             return line_count, result
         else:
@@ -36,38 +40,6 @@ async def export_chunk(signin_client, app_display_name, start_date, end_date, ou
         print(f"Try using a smaller time window or check your connection.")
         return 0, None
 
-def combine_csv_files(file_list, output_file):
-    """Combine multiple CSV files into a single file, keeping only one header."""
-    if not file_list:
-        return None, 0
-        
-    total_rows = 0
-    with open(output_file, 'w', newline='', encoding='utf-8') as outfile:
-        for i, file_path in enumerate(file_list):
-            if not os.path.exists(file_path):
-                continue
-                
-            with open(file_path, 'r', encoding='utf-8') as infile:
-                reader = csv.reader(infile)
-                writer = csv.writer(outfile)
-                
-                # Write header only from the first file
-                if i == 0:
-                    header = next(reader)
-                    writer.writerow(header)
-                else:
-                    next(reader)  # Skip header from other files
-                
-                # Write all rows
-                for row in reader:
-                    writer.writerow(row)
-                    total_rows += 1
-                    
-            # Clean up individual chunk files
-            os.remove(file_path)
-            
-    return output_file, total_rows
-
 async def main():
     """Export sign-in logs for enterprise applications."""
     # Parse command line arguments
@@ -76,6 +48,9 @@ async def main():
     parser.add_argument('--days', type=int, default=7, help='Number of days to look back (default: 7)')
     parser.add_argument('--chunk-days', type=int, default=5, help='Number of days per chunk to avoid timeouts (default: 5)')
     parser.add_argument('--no-combine', action='store_true', help='Do not combine chunk files into one')
+    parser.add_argument('--parallel', type=int, default=1, help='Number of chunks to export at the same time (default: 1)')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted export, skipping the chunks it already wrote and continuing a partial chunk after its last written page')
+    parser.add_argument('--dedup-capacity', type=int, help='Expected number of records; drops records returned twice in the run, with a Bloom filter of that size')
     args = parser.parse_args()
 
     # Initialize the settings and auth client
@@ -84,11 +59,15 @@ async def main():
     graph_client = auth_client.get_client()
     
     # Create the sign-in logs client
-    signin_client = SignInLogsClient(graph_client)
+    signin_client = SignInLogsClient(
+        graph_client, prefetch=settings.page_prefetch, list_encoding=settings.list_encoding
+    )
     
-    # Set the date range based on the days argument
+    # Set the date range based on the days argument, or reuse the one of the interrupted export
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=args.days)
+    journal = ExportJournal(settings.state_dir, f"enterprise_app_{args.app_name}")
+    start_date, end_date = journal.start(start_date, end_date, args.resume)
     
     # Create the output directory if it doesn't exist
     os.makedirs('exports', exist_ok=True)
@@ -98,32 +77,63 @@ async def main():
     
     # Break the date range into chunks
     chunk_files = []
+    chunks = []
     current_start = start_date
     chunk_number = 1
     
     while current_start < end_date:
         chunk_end = min(current_start + timedelta(days=args.chunk_days), end_date)
         chunk_file = f"{base_output_file}_chunk{chunk_number}.csv"
+        chunks.append((current_start, chunk_end, chunk_file))
+            
+        current_start = chunk_end
+        chunk_number += 1
+    
+    # Chunks are half-open, so they share no records; the whole-run filter
+    # still drops records returned twice, if a capacity is given
+    deduplicator = Deduplicator(capacity=args.dedup_capacity)
+    
+    # Export up to --parallel chunks at the same time
+    semaphore = asyncio.Semaphore(args.parallel)
+    
+    async def export_bounded(chunk_start, chunk_end, chunk_file):
+        chunk_id = chunk_start.isoformat()
+        if journal.is_complete(chunk_id):
+            progress = journal.chunk(chunk_id)
+            print(f"Skipping chunk {chunk_start.date()} to {chunk_end.date()}, already exported")
+            return progress["written"], progress["output"]
         
-        count, result_file = await export_chunk(
-            signin_client,
-            app_display_name,
-            current_start,
-            chunk_end,
-            chunk_file
-        )
+        async with semaphore:
+            count, result_file = await export_chunk(
+                signin_client,
+                app_display_name,
+                chunk_start,
+                chunk_end,
+                chunk_file,
+                deduplicator,
+                journal,
+                chunk_id,
+                end_inclusive=chunk_end == end_date
+            )
         
+        # Empty and failed chunks are left open, so --resume queries them again
+        if result_file:
+            journal.complete(chunk_id, count, result_file)
+        return count, result_file
+    
+    results = await asyncio.gather(*(export_bounded(*chunk) for chunk in chunks))
+    
+    for count, result_file in results:
         if result_file:
             chunk_files.append(result_file)
-            
-        current_start = chunk_end
-        chunk_number += 1
+    
+    print(f"\n{deduplicator.summary()}")
     
     # Combine chunks if requested
     if not args.no_combine and len(chunk_files) > 0:
         print("\nCombining chunk files...")
         final_file = f"{base_output_file}.csv"
-        combined_file, total_rows = combine_csv_files(chunk_files, final_file)
+        combined_file, total_rows = merge_csv_files(chunk_files, final_file, remove_sources=True)
         
         if combined_file:
             print(f"\nSuccessfully combined all chunks into: {combined_file}")
@@ -133,6 +143,11 @@ async def main():
     else:
         print("\nSkipping file combination as requested.")
         print("Individual chunk files are preserved in the exports directory.")
+    
+    if len(chunk_files) == len(chunks):
+        journal.clear()
+    else:
+        print(f"\n{len(chunks) - len(chunk_files)} chunks returned no data. Run again with --resume to retry only those.")
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
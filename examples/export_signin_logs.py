@@ -1,38 +1,100 @@
 import asyncio
+import argparse
 from datetime import datetime, timedelta
 import os
 from graphreporter.auth.client import AuthClient
 from graphreporter.reports.signin_logs import SignInLogsClient
 from graphreporter.config.settings import Settings
+from graphreporter.export.merge import metadata_path, read_csv_metadata, write_csv_metadata
+from graphreporter.sync.checkpoint import CheckpointStore, IncrementalSync
+
+async def export_incremental(signin_client, settings, days, output_file):
+    """Append the sign-in logs created since the previous incremental run."""
+    store = CheckpointStore(settings.state_dir)
+    sync = IncrementalSync(store, store.key("signins"), timedelta(days=days))
+    end_date = datetime.utcnow()
+
+    print(f"Exporting sign-in logs created since {sync.start_date}...")
+
+    # Remember where the file ended, so a failed run can be rolled back
+    size = os.path.getsize(output_file) if os.path.exists(output_file) else 0
+    metadata = read_csv_metadata(output_file) if size else None
+
+    # Write each page as it arrives instead of holding the whole run
+    written = 0
+    try:
+        async for batch in signin_client.iter_signin_batches(
+            start_date=sync.start_date,
+            end_date=end_date
+        ):
+            new_logs = list(sync.filter(batch, timestamp_key='created_datetime'))
+            if signin_client.write_rows(new_logs, output_file, append=True):
+                written += len(new_logs)
+    except BaseException:
+        # The checkpoint was not moved, so the next run fetches these again
+        if written and not size:
+            os.remove(output_file)
+            if os.path.exists(metadata_path(output_file)):
+                os.remove(metadata_path(output_file))
+        elif written:
+            with open(output_file, 'r+b') as f:
+                f.truncate(size)
+            if metadata:
+                write_csv_metadata(output_file, metadata["columns"], metadata["rows"])
+        raise
+
+    # Only move the checkpoint once the records are safely on disk
+    sync.commit()
+
+    if written:
+        print(f"Appended {written} new sign-in logs to: {output_file}")
+        print(f"File size: {os.path.getsize(output_file)} bytes")
+    else:
+        print("No new sign-in logs since the previous run.")
 
 async def main():
-    """Export sign-in logs for the last 7 days."""
+    """Export sign-in logs for the last N days."""
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Export sign-in logs.')
+    parser.add_argument('--days', type=int, default=7, help='Number of days to look back (default: 7)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only export logs created since the previous incremental run and append them to --output')
+    parser.add_argument('--output', default=os.path.join('exports', 'signin_logs.csv'),
+                        help='Output file for --incremental (default: exports/signin_logs.csv)')
+    args = parser.parse_args()
+
     # Initialize the settings and auth client
     settings = Settings()
     auth_client = AuthClient(settings)
     graph_client = auth_client.get_client()
-    
+
     # Create the sign-in logs client
-    signin_client = SignInLogsClient(graph_client)
-    
-    # Set the date range for the last 7 days
-    end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=7)
-    
+    signin_client = SignInLogsClient(
+        graph_client, prefetch=settings.page_prefetch, list_encoding=settings.list_encoding
+    )
+
     # Create the output directory if it doesn't exist
     os.makedirs('exports', exist_ok=True)
+
+    if args.incremental:
+        await export_incremental(signin_client, settings, args.days, args.output)
+        return
+
+    # Set the date range based on the days argument
+    end_date = datetime.utcnow()
+    start_date = end_date - timedelta(days=args.days)
+
     output_file = os.path.join('exports', f'signin_logs_{start_date.date()}_{end_date.date()}.csv')
-    
+
     print(f"Exporting sign-in logs from {start_date.date()} to {end_date.date()}...")
-    
+
     # Export the logs
     result = await signin_client.export_to_csv(
         output_file=output_file,
         start_date=start_date,
-        end_date=end_date,
-        max_results=1000  # Adjust this number based on your needs
+        end_date=end_date
     )
-    
+
     if result:
         print(f"Successfully exported sign-in logs to: {output_file}")
         print(f"File size: {os.path.getsize(output_file)} bytes")
@@ -40,4 +102,4 @@ async def main():
         print("No sign-in logs found for the specified period.")
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    asyncio.run(main())
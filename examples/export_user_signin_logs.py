@@ -6,9 +6,12 @@ import csv
 from graphreporter.auth.client import AuthClient
 from graphreporter.reports.signin_logs import SignInLogsClient
 from graphreporter.config.settings import Settings
+from graphreporter.export.merge import merge_csv_files, metadata_path, read_csv_metadata
+from graphreporter.sync.dedup import Deduplicator
+from graphreporter.sync.resume import ExportJournal
 
-async def export_chunk(signin_client, output_file, start_date, end_date, user_email, max_results=1000):
-    """Export a chunk of sign-in logs for a specific user within a date range."""
+async def export_chunk(signin_client, output_file, start_date, end_date, user_email, max_results=None, deduplicator=None, journal=None, chunk_id=None, end_inclusive=True):
+    """Export a chunk of sign-in logs for a specific user within a date range, resuming after its last written page."""
     print(f"Exporting chunk from {start_date.date()} to {end_date.date()}...")
     
     result = await signin_client.export_to_csv(
@@ -16,45 +19,15 @@ async def export_chunk(signin_client, output_file, start_date, end_date, user_em
         start_date=start_date,
         end_date=end_date,
         user_principal_name=user_email,
-        max_results=max_results
+        max_results=max_results,
+        deduplicator=deduplicator,
+        journal=journal,
+        chunk_id=chunk_id,
+        end_inclusive=end_inclusive
     )
     
     return result
 
-async def combine_csv_files(file_paths, output_file):
-    """Combine multiple CSV files into one."""
-    if not file_paths:
-        return None
-    
-    if len(file_paths) == 1:
-        return file_paths[0]
-    
-    print(f"Combining {len(file_paths)} CSV files into {output_file}...")
-    
-    # Read headers from the first file
-    with open(file_paths[0], 'r', encoding='utf-8') as f:
-        reader = csv.reader(f)
-        headers = next(reader)
-    
-    # Create a new combined file with the same headers
-    with open(output_file, 'w', newline='', encoding='utf-8') as out_file:
-        writer = csv.writer(out_file)
-        writer.writerow(headers)
-        
-        # Copy data from each file, skipping headers
-        for file_path in file_paths:
-            with open(file_path, 'r', encoding='utf-8') as in_file:
-                reader = csv.reader(in_file)
-                next(reader)  # Skip header
-                for row in reader:
-                    writer.writerow(row)
-    
-    # Delete the individual chunk files
-    for file_path in file_paths:
-        os.remove(file_path)
-    
-    return output_file
-
 async def main():
     """Export sign-in logs for a specific user."""
     # Parse command line arguments
@@ -63,6 +36,9 @@ async def main():
     parser.add_argument('--days', type=int, default=7, help='Number of days to look back (default: 7)')
     parser.add_argument('--chunk-days', type=int, default=3, help='Number of days per chunk to avoid timeouts (default: 3)')
     parser.add_argument('--no-combine', action='store_true', help='Do not combine chunk files into one')
+    parser.add_argument('--parallel', type=int, default=1, help='Number of chunks to export at the same time (default: 1)')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted export, skipping the chunks it already wrote and continuing a partial chunk after its last written page')
+    parser.add_argument('--dedup-capacity', type=int, help='Expected number of records; drops records returned twice in the run, with a Bloom filter of that size')
     args = parser.parse_args()
 
     # Initialize the settings and auth client
@@ -71,11 +47,15 @@ async def main():
     graph_client = auth_client.get_client()
     
     # Create the sign-in logs client
-    signin_client = SignInLogsClient(graph_client)
+    signin_client = SignInLogsClient(
+        graph_client, prefetch=settings.page_prefetch, list_encoding=settings.list_encoding
+    )
     
-    # Set the date range based on the days argument
+    # Set the date range based on the days argument, or reuse the one of the interrupted export
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=args.days)
+    journal = ExportJournal(settings.state_dir, f"user_{args.user_email}")
+    start_date, end_date = journal.start(start_date, end_date, args.resume)
     
     # Create the output directory if it doesn't exist
     os.makedirs('exports', exist_ok=True)
@@ -91,7 +71,7 @@ async def main():
     
     # Split the date range into chunks to avoid timeouts
     chunk_size = timedelta(days=args.chunk_days)
-    chunk_files = []
+    chunks = []
     
     current_start = start_date
     chunk_number = 1
@@ -101,44 +81,77 @@ async def main():
         
         # Create a chunk filename
         chunk_file = os.path.join('exports', f'user_signin_logs_{username}_{current_start.date()}_{current_end.date()}_chunk{chunk_number}.csv')
-        
-        try:
-            # Export the chunk
-            result = await export_chunk(
-                signin_client=signin_client,
-                output_file=chunk_file,
-                start_date=current_start,
-                end_date=current_end,
-                user_email=user_email,
-                max_results=1000
-            )
-            
-            if result:
-                chunk_files.append(result)
-                print(f"Successfully exported chunk {chunk_number} to: {result}")
-                print(f"Chunk file size: {os.path.getsize(result)} bytes")
-        except Exception as e:
-            print(f"Error exporting chunk {chunk_number}: {str(e)}")
+        chunks.append((chunk_number, current_start, current_end, chunk_file))
         
         # Move to the next chunk
         current_start = current_end
         chunk_number += 1
     
+    # Chunks are half-open, so they share no records; the whole-run filter
+    # still drops records returned twice, if a capacity is given
+    deduplicator = Deduplicator(capacity=args.dedup_capacity)
+    
+    # Export up to --parallel chunks at the same time
+    semaphore = asyncio.Semaphore(args.parallel)
+    
+    async def export_bounded(chunk_number, chunk_start, chunk_end, chunk_file):
+        chunk_id = chunk_start.isoformat()
+        if journal.is_complete(chunk_id):
+            print(f"Skipping chunk {chunk_number}, already exported")
+            return journal.chunk(chunk_id)["output"]
+        
+        async with semaphore:
+            try:
+                # Export the chunk
+                result = await export_chunk(
+                    signin_client=signin_client,
+                    output_file=chunk_file,
+                    start_date=chunk_start,
+                    end_date=chunk_end,
+                    user_email=user_email,
+                    deduplicator=deduplicator,
+                    journal=journal,
+                    chunk_id=chunk_id,
+                    end_inclusive=chunk_end == end_date
+                )
+                
+                if result:
+                    print(f"Successfully exported chunk {chunk_number} to: {result}")
+                    print(f"Chunk file size: {os.path.getsize(result)} bytes")
+                    # Empty and failed chunks are left open, so --resume queries them again
+                    journal.complete(chunk_id, read_csv_metadata(result)["rows"], result)
+                return result
+            except Exception as e:
+                print(f"Error exporting chunk {chunk_number}: {str(e)}")
+                return None
+    
+    results = await asyncio.gather(*(export_bounded(*chunk) for chunk in chunks))
+    chunk_files = [result for result in results if result]
+    print(deduplicator.summary())
+    if len(chunk_files) < len(chunks):
+        print(f"{len(chunks) - len(chunk_files)} chunks returned no data. Run again with --resume to retry only those.")
+    
     # Combine chunks if needed
     final_file = base_output_file
     if chunk_files:
         if len(chunk_files) > 1 and not args.no_combine:
-            final_file = await combine_csv_files(chunk_files, base_output_file)
+            print(f"Combining {len(chunk_files)} CSV files into {base_output_file}...")
+            final_file, _ = merge_csv_files(chunk_files, base_output_file, remove_sources=True)
         elif len(chunk_files) == 1:
             final_file = chunk_files[0]
             # Rename the file if it's different from the base output file
             if final_file != base_output_file:
                 os.rename(final_file, base_output_file)
+                if metadata_path(final_file).exists():
+                    os.rename(metadata_path(final_file), metadata_path(base_output_file))
                 final_file = base_output_file
     else:
         print(f"No sign-in logs found for user '{user_email}' in the specified period.")
         return
     
+    if len(chunk_files) == len(chunks):
+        journal.clear()
+    
     print(f"Export completed. Final file: {final_file}")
     print(f"File size: {os.path.getsize(final_file)} bytes")
     
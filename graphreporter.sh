@@ -48,13 +48,22 @@ Common Options:
   --days <number>        Number of days to look back (default: 7)
   --chunk-days <number>  Number of days per chunk to avoid timeouts (default: 5)
   --no-combine          Do not combine multiple CSV files into one
+  --parallel <number>   Number of chunks to export at the same time (default: 1)
+  --resume              Continue an interrupted export, skipping chunks already written
+  --dedup-capacity <n>  Expected number of records; also drop duplicates away from chunk boundaries
   --verbose             Enable verbose output
 
+Sign-in Options:
+  --incremental         Only export logs created since the previous --incremental run
+                        and append them to exports/signin_logs.csv (--days sets the first window)
+
 Examples:
   ./graphreporter.sh setup
   ./graphreporter.sh signin --days 30
+  ./graphreporter.sh signin --incremental
   ./graphreporter.sh app-by-name "Office365 Shell WCSS-Client" --days 14
   ./graphreporter.sh app-by-id 6a08801d-62d2-4770-91d1-cc1887a0e884 --days 90 --chunk-days 10
+  ./graphreporter.sh app-by-id 6a08801d-62d2-4770-91d1-cc1887a0e884 --days 90 --parallel 4
   ./graphreporter.sh user user@example.com --days 7
 
 Environment Setup:
@@ -170,6 +179,7 @@ case "$command" in
         case "$command" in
             signin)
                 days=7
+                incremental=""
                 
                 # Parse options
                 while [[ $# -gt 0 ]]; do
@@ -178,6 +188,10 @@ case "$command" in
                             days="$2"
                             shift 2
                             ;;
+                        --incremental)
+                            incremental="--incremental"
+                            shift
+                            ;;
                         --verbose)
                             VERBOSE=true
                             shift
@@ -190,8 +204,12 @@ case "$command" in
                     esac
                 done
                 
-                log_info "Exporting sign-in logs for the last $days days..."
-                execute_command python "$BASE_DIR/examples/export_signin_logs.py" --days "$days"
+                if [ -n "$incremental" ]; then
+                    log_info "Exporting sign-in logs created since the previous incremental run..."
+                else
+                    log_info "Exporting sign-in logs for the last $days days..."
+                fi
+                execute_command python "$BASE_DIR/examples/export_signin_logs.py" --days "$days" $incremental
                 ;;
                 
             app-by-name)
@@ -206,6 +224,9 @@ case "$command" in
                 days=7
                 chunk_days=5
                 combine=""
+                parallel=""
+                resume=""
+                dedup=""
                 
                 # Parse options
                 while [[ $# -gt 0 ]]; do
@@ -218,6 +239,18 @@ case "$command" in
                             chunk_days="$2"
                             shift 2
                             ;;
+                        --parallel)
+                            parallel="--parallel $2"
+                            shift 2
+                            ;;
+                        --resume)
+                            resume="--resume"
+                            shift
+                            ;;
+                        --dedup-capacity)
+                            dedup="--dedup-capacity $2"
+                            shift 2
+                            ;;
                         --no-combine)
                             combine="--no-combine"
                             shift
@@ -236,7 +269,7 @@ case "$command" in
                 
                 log_info "Exporting sign-in logs for application '$app_name' for the last $days days..."
                 log_info "Using chunk size of $chunk_days days..."
-                execute_command python "$BASE_DIR/examples/export_enterprise_app_logs.py" "$app_name" --days "$days" --chunk-days "$chunk_days" $combine
+                execute_command python "$BASE_DIR/examples/export_enterprise_app_logs.py" "$app_name" --days "$days" --chunk-days "$chunk_days" $combine $parallel $resume $dedup
                 ;;
                 
             app-by-id)
@@ -250,7 +283,10 @@ case "$command" in
                 shift
                 days=90
                 chunk_days=10
-                combine="--combine"
+                combine=""
+                parallel=""
+                resume=""
+                dedup=""
                 
                 # Parse options
                 while [[ $# -gt 0 ]]; do
@@ -263,6 +299,18 @@ case "$command" in
                             chunk_days="$2"
                             shift 2
                             ;;
+                        --parallel)
+                            parallel="--parallel $2"
+                            shift 2
+                            ;;
+                        --resume)
+                            resume="--resume"
+                            shift
+                            ;;
+                        --dedup-capacity)
+                            dedup="--dedup-capacity $2"
+                            shift 2
+                            ;;
                         --no-combine)
                             combine="--no-combine"
                             shift
@@ -281,7 +329,7 @@ case "$command" in
                 
                 log_info "Exporting sign-in logs for application ID '$app_id' for the last $days days..."
                 log_info "Using chunk size of $chunk_days days..."
-                execute_command python "$BASE_DIR/examples/export_app_by_id.py" "$app_id" --days "$days" --chunk-days "$chunk_days" $combine
+                execute_command python "$BASE_DIR/examples/export_app_by_id.py" "$app_id" --days "$days" --chunk-days "$chunk_days" $combine $parallel $resume $dedup
                 ;;
                 
             user)
@@ -294,6 +342,9 @@ case "$command" in
                 user_email="$1"
                 shift
                 days=7
+                parallel=""
+                resume=""
+                dedup=""
                 
                 # Parse options
                 while [[ $# -gt 0 ]]; do
@@ -306,6 +357,18 @@ case "$command" in
                             chunk_days="$2"
                             shift 2
                             ;;
+                        --parallel)
+                            parallel="--parallel $2"
+                            shift 2
+                            ;;
+                        --resume)
+                            resume="--resume"
+                            shift
+                            ;;
+                        --dedup-capacity)
+                            dedup="--dedup-capacity $2"
+                            shift 2
+                            ;;
                         --no-combine)
                             no_combine="--no-combine"
                             shift
@@ -327,7 +390,7 @@ case "$command" in
                 chunk_days=${chunk_days:-3}
                 no_combine=${no_combine:-""}
                 
-                execute_command python "$BASE_DIR/examples/export_user_signin_logs.py" "$user_email" --days "$days" --chunk-days "$chunk_days" $no_combine
+                execute_command python "$BASE_DIR/examples/export_user_signin_logs.py" "$user_email" --days "$days" --chunk-days "$chunk_days" $no_combine $parallel $resume $dedup
                 ;;
         esac
         ;;
@@ -2,73 +2,251 @@
 # -*- coding: utf-8 -*-
 """
 GraphReporter Authentication Client
-Handles authentication with Microsoft Graph API using azure-identity
+Handles authentication with Microsoft Graph API using MSAL
 """
 
+import asyncio
+import functools
 import logging
-from typing import Optional
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-from azure.identity.aio import ClientSecretCredential
-from msgraph import GraphServiceClient
+import msal
 
+from graphreporter.auth.token_cache import EncryptedTokenCache, token_cache_path
 from graphreporter.config.settings import Settings
 
+if TYPE_CHECKING:
+    # The Graph SDK takes a large share of startup time, so it is only
+    # imported once an SDK client is requested
+    from azure.core.credentials import AccessToken
+    from msgraph import GraphServiceClient
+
+# MSAL treats access tokens as expired this many seconds before they expire,
+# so the background refresh starts then
+TOKEN_REFRESH_MARGIN = 300
+
+# Minimum remaining lifetime of a token handed out without refreshing it first
+MIN_TOKEN_LIFETIME = 60
+
+# Delay before retrying a failed background refresh, in seconds
+REFRESH_RETRY_DELAY = 30
+
+
+class CachedCredential:
+    """
+    Async credential for the Graph SDK backed by an AuthClient
+
+    Tokens come from the AuthClient's cache, so the SDK and the raw Graph
+    clients share tokens and the SDK benefits from the on-disk cache
+    """
+
+    def __init__(self, auth_client: "AuthClient"):
+        """
+        Initialize the credential
+
+        Args:
+            auth_client: Authentication client to get tokens from
+        """
+        self.auth_client = auth_client
+
+    async def get_token(self, *scopes: str, claims: Optional[str] = None, **kwargs: Any) -> "AccessToken":
+        """
+        Get an access token for the configured scopes
+
+        Args:
+            scopes: Requested scopes, the configured scopes are always used
+            claims: Claims challenge, which bypasses the cache
+
+        Returns:
+            AccessToken: Token and its expiry as a Unix timestamp
+        """
+        from azure.core.credentials import AccessToken
+
+        if claims:
+            loop = asyncio.get_running_loop()
+            token = await loop.run_in_executor(None, functools.partial(self.auth_client.get_token, claims=claims))
+        else:
+            token = await self.auth_client.get_token_async()
+        return AccessToken(token, int(self.auth_client.expires_on))
+
+    async def close(self) -> None:
+        """Nothing to close, the AuthClient owns the token cache"""
+
+    async def __aenter__(self) -> "CachedCredential":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
 
 class AuthClient:
     """
     Authentication client for Microsoft Graph API using client credentials flow
+
+    Tokens are acquired with MSAL and kept in an encrypted on-disk cache, keyed
+    by tenant and client, so later runs reuse a valid token and the tenant
+    discovery instead of requesting them again. Once a token has been handed
+    out, a background thread refreshes it shortly before it expires.
     """
-    
+
     def __init__(self, settings: Settings):
         """
         Initialize the authentication client
-        
+
         Args:
             settings: Application settings containing credentials
         """
         self.settings = settings
         self.logger = logging.getLogger(__name__)
-        self._credential: Optional[ClientSecretCredential] = None
-        self._client: Optional[GraphServiceClient] = None
-        
+        self._credential: Optional[CachedCredential] = None
+        self._client: Optional["GraphServiceClient"] = None
+        self._app: Optional[msal.ConfidentialClientApplication] = None
+        self._token_cache: Optional[EncryptedTokenCache] = None
+
+        self._token: Optional[str] = None
+        self._auth_header: Dict[str, str] = {}
+        self.expires_on = 0.0
+        self._token_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._stop_refresh = threading.Event()
+
         self.logger.debug("AuthClient initialized")
-    
+
     @property
-    def credential(self) -> ClientSecretCredential:
+    def app(self) -> msal.ConfidentialClientApplication:
         """
-        Get or create the ClientSecretCredential
-        
+        Get or create the MSAL confidential client application
+
         Returns:
-            ClientSecretCredential: The credential object
+            msal.ConfidentialClientApplication: The application object
         """
-        if not self._credential:
-            self.logger.debug("Creating ClientSecretCredential")
-            self._credential = ClientSecretCredential(
-                tenant_id=self.settings.tenant_id,
+        if not self._app:
+            self.logger.debug("Creating ConfidentialClientApplication")
+            if self.settings.token_cache:
+                self._token_cache = EncryptedTokenCache(
+                    token_cache_path(self.settings.state_dir, self.settings.tenant_id, self.settings.client_id),
+                    tenant_id=self.settings.tenant_id,
+                    client_id=self.settings.client_id,
+                    client_secret=self.settings.client_secret,
+                )
+            self._app = msal.ConfidentialClientApplication(
                 client_id=self.settings.client_id,
-                client_secret=self.settings.client_secret
+                client_credential=self.settings.client_secret,
+                authority=self.settings.authority_url,
+                token_cache=self._token_cache,
+                http_cache=self._token_cache.http_cache if self._token_cache else None,
             )
+        return self._app
+
+    @property
+    def credential(self) -> CachedCredential:
+        """
+        Get or create the credential for the Graph SDK
+
+        Returns:
+            CachedCredential: The credential object
+        """
+        if not self._credential:
+            self._credential = CachedCredential(self)
         return self._credential
-    
-    def get_client(self) -> GraphServiceClient:
+
+    def get_client(self) -> "GraphServiceClient":
         """
         Get or create the GraphServiceClient
-        
+
         Returns:
             GraphServiceClient: The client object
         """
         if not self._client:
+            from msgraph import GraphServiceClient
+
             self.logger.debug("Creating GraphServiceClient")
             self._client = GraphServiceClient(
                 credentials=self.credential,
                 scopes=['https://graph.microsoft.com/.default']
             )
         return self._client
-    
+
+    def get_token(self, claims: Optional[str] = None) -> str:
+        """
+        Get an access token for the configured scopes
+
+        A token with at least MIN_TOKEN_LIFETIME seconds left is returned from
+        memory; otherwise MSAL serves it from the token cache or requests a
+        new one
+
+        Args:
+            claims: Claims challenge, which bypasses the cache
+
+        Returns:
+            str: Access token
+
+        Raises:
+            ValueError: If no token can be acquired
+        """
+        with self._token_lock:
+            if claims or self._expires_within(MIN_TOKEN_LIFETIME):
+                self._acquire_token(claims)
+        self._start_refresh()
+        return self._token
+
+    async def get_token_async(self) -> str:
+        """
+        Get an access token without blocking the event loop
+
+        Returns:
+            str: Access token
+
+        Raises:
+            ValueError: If no token can be acquired
+        """
+        if not self._expires_within(MIN_TOKEN_LIFETIME):
+            return self._token
+        return await asyncio.get_running_loop().run_in_executor(None, self.get_token)
+
+    def get_auth_header(self) -> Dict[str, str]:
+        """
+        Get the Authorization header for Graph requests
+
+        The header is built once per token rather than once per request
+
+        Returns:
+            Dict[str, str]: Authorization header
+
+        Raises:
+            ValueError: If no token can be acquired
+        """
+        self.get_token()
+        return self._auth_header
+
+    async def get_auth_header_async(self) -> Dict[str, str]:
+        """
+        Get the Authorization header without blocking the event loop
+
+        Returns:
+            Dict[str, str]: Authorization header
+
+        Raises:
+            ValueError: If no token can be acquired
+        """
+        await self.get_token_async()
+        return self._auth_header
+
+    async def close(self) -> None:
+        """Stop the background refresh and drop the SDK client"""
+        self._stop_refresh.set()
+        if self._refresh_thread:
+            self._refresh_thread.join()
+            self._refresh_thread = None
+        self._credential = None
+        self._client = None
+
     async def test_authentication(self) -> bool:
         """
         Test the authentication by making a simple Graph API call
-        
+
         Returns:
             bool: True if authentication is successful, False otherwise
         """
@@ -79,4 +257,72 @@ class AuthClient:
             return bool(result and result.value)
         except Exception as e:
             self.logger.error(f"Authentication test failed: {e}")
-            return False 
\ No newline at end of file
+            return False
+
+    def _expires_within(self, seconds: float) -> bool:
+        """
+        Check whether the current token is missing or expires soon
+
+        Args:
+            seconds: Remaining lifetime below which the token counts as expiring
+
+        Returns:
+            bool: True if a new token is needed
+        """
+        return self._token is None or self.expires_on - time.time() < seconds
+
+    def _acquire_token(self, claims: Optional[str] = None) -> None:
+        """
+        Acquire a token through MSAL and persist the token cache
+
+        Must be called with the token lock held
+
+        Args:
+            claims: Claims challenge, which bypasses the cache
+
+        Raises:
+            ValueError: If no token can be acquired
+        """
+        result = self.app.acquire_token_for_client(scopes=self.settings.scopes, claims_challenge=claims)
+        if "access_token" not in result:
+            error = result.get("error_description") or result.get("error")
+            self.logger.error(f"Token acquisition failed: {error}")
+            raise ValueError(f"Token acquisition failed: {error}")
+
+        self.logger.debug(f"Acquired token from {result.get('token_source', 'identity provider')}")
+        self._token = result["access_token"]
+        self._auth_header = {"Authorization": f"Bearer {self._token}"}
+        self.expires_on = time.time() + int(result["expires_in"])
+
+        if self._token_cache:
+            try:
+                self._token_cache.save()
+            except OSError as e:
+                self.logger.warning(f"Could not save token cache: {e}")
+
+    def _start_refresh(self) -> None:
+        """Start the background refresh thread, if it is not running"""
+        if self._refresh_thread or self._stop_refresh.is_set():
+            return
+
+        with self._token_lock:
+            if self._refresh_thread is None:
+                self._refresh_thread = threading.Thread(
+                    target=self._refresh_loop, name="graphreporter-token-refresh", daemon=True
+                )
+                self._refresh_thread.start()
+
+    def _refresh_loop(self) -> None:
+        """Refresh the token when it enters MSAL's expiry margin, until stopped"""
+        while True:
+            delay = max(1.0, self.expires_on - TOKEN_REFRESH_MARGIN - time.time())
+            if self._stop_refresh.wait(delay):
+                return
+
+            try:
+                with self._token_lock:
+                    self._acquire_token()
+            except Exception as e:
+                self.logger.warning(f"Background token refresh failed: {e}")
+                if self._stop_refresh.wait(REFRESH_RETRY_DELAY):
+                    return
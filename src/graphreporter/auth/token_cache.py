@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphReporter Token Cache
+Encrypted on-disk MSAL token and HTTP cache shared between runs
+"""
+
+import base64
+import hashlib
+import logging
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Dict, Union
+
+import msal
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from graphreporter.utils.helpers import write_bytes_atomic
+
+
+def token_cache_path(state_dir: Union[str, Path], tenant_id: str, client_id: str) -> Path:
+    """
+    Get the token cache file of an app registration
+
+    Args:
+        state_dir: Directory holding persisted state
+        tenant_id: Azure AD tenant ID
+        client_id: Application (client) ID
+
+    Returns:
+        Path: Cache file, unique per tenant and client
+    """
+    digest = hashlib.sha1(f"{tenant_id}:{client_id}".encode("utf-8")).hexdigest()[:16]
+    return Path(state_dir) / f"token-cache-{digest}.bin"
+
+
+class EncryptedTokenCache(msal.SerializableTokenCache):
+    """
+    MSAL token cache persisted to an encrypted file
+
+    The file also holds MSAL's HTTP cache; passing http_cache to the
+    application lets a new process skip tenant discovery as well.
+
+    The file is encrypted with a key derived from the client secret, salted
+    with tenant and client, so only a process holding the same credentials can
+    read it back, and rotating the secret invalidates the cache. An unreadable
+    file is treated as an empty cache.
+    """
+
+    def __init__(self, path: Union[str, Path], tenant_id: str, client_id: str, client_secret: str):
+        """
+        Initialize the cache and load the file, if it exists
+
+        Args:
+            path: Cache file
+            tenant_id: Azure AD tenant ID
+            client_id: Application (client) ID
+            client_secret: Client secret the encryption key is derived from
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.logger = logging.getLogger(__name__)
+
+        key = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=f"{tenant_id}:{client_id}".encode("utf-8"),
+            info=b"graphreporter token cache",
+        ).derive(client_secret.encode("utf-8"))
+        self._fernet = Fernet(base64.urlsafe_b64encode(key))
+        self._file_lock = threading.Lock()
+        self.http_cache: Dict[str, Any] = {}
+        self._saved_http_cache: Dict[str, Any] = {}
+
+        self.load()
+
+    def load(self) -> None:
+        """Load the cache file, if it exists and can be decrypted"""
+        if not self.path.exists():
+            return
+
+        try:
+            # Decryption authenticates the file, so only data written with the
+            # same credentials is ever unpickled
+            data = pickle.loads(self._fernet.decrypt(self.path.read_bytes()))
+            self.deserialize(data["tokens"])
+            self.http_cache.update(data["http_cache"])
+            self._saved_http_cache = dict(self.http_cache)
+            self.logger.debug(f"Loaded token cache from {self.path}")
+        except (InvalidToken, pickle.UnpicklingError, AttributeError, EOFError, KeyError, ValueError) as e:
+            # Also raised by files of another MSAL version
+            self.logger.warning(f"Ignoring unreadable token cache {self.path}: {type(e).__name__}")
+
+    def save(self) -> None:
+        """Write the cache file, if the cache changed since it was loaded or saved"""
+        with self._file_lock:
+            http_cache = dict(self.http_cache)
+            if not self.has_state_changed and http_cache == self._saved_http_cache:
+                return
+
+            data = pickle.dumps({"tokens": self.serialize(), "http_cache": http_cache})
+            write_bytes_atomic(self.path, self._fernet.encrypt(data), mode=0o600)
+            self.has_state_changed = False
+            self._saved_http_cache = http_cache
+            self.logger.debug(f"Saved token cache to {self.path}")
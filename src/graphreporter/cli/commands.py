@@ -30,6 +30,8 @@ class OutputFormat(str, Enum):
     CSV = "csv"
     EXCEL = "excel"
     JSON = "json"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
 
 
 # Sign-ins commands
@@ -28,10 +28,22 @@ app.add_typer(commands.apps_app, name="list-apps")
 app.add_typer(commands.service_principals_app, name="list-service-principals")
 
 
+def version_callback(version: Optional[bool]) -> None:
+    """
+    Print the version and exit
+    
+    Eager, so it runs before subcommands are required or settings are loaded
+    """
+    if version:
+        console.print(f"GraphReporter Version: {__version__}")
+        raise typer.Exit()
+
+
 @app.callback()
 def callback(
     version: Optional[bool] = typer.Option(
-        None, "--version", "-v", help="Show the application version and exit."
+        None, "--version", "-v", help="Show the application version and exit.",
+        callback=version_callback, is_eager=True,
     ),
 ) -> None:
     """
@@ -39,9 +51,6 @@ def callback(
     
     Retrieve and export data from Microsoft Entra ID (Azure AD) using Microsoft Graph API.
     """
-    if version:
-        console.print(f"GraphReporter Version: {__version__}")
-        raise typer.Exit()
 
 
 def main() -> None:
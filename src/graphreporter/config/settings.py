@@ -5,7 +5,7 @@ GraphReporter Configuration
 Manages application settings and configuration
 """
 
-import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 
@@ -31,10 +31,23 @@ class Settings(BaseSettings):
     authority_url: Optional[str] = Field(None, env="GRAPH_AUTHORITY_URL")
     scopes: List[str] = Field(["https://graph.microsoft.com/.default"], env="GRAPH_SCOPES")
     graph_endpoint: str = Field("https://graph.microsoft.com/v1.0", env="GRAPH_ENDPOINT")
+    token_cache: bool = Field(True, env="GRAPH_TOKEN_CACHE")
+    
+    # Transport settings
+    max_connections: int = Field(10, env="GRAPH_MAX_CONNECTIONS")
+    max_concurrency: int = Field(4, env="GRAPH_MAX_CONCURRENCY")
+    request_timeout: float = Field(60.0, env="GRAPH_REQUEST_TIMEOUT")
+    requests_per_second: float = Field(10.0, env="GRAPH_REQUESTS_PER_SECOND")
+    max_retries: int = Field(5, env="GRAPH_MAX_RETRIES")
+    page_prefetch: int = Field(2, env="GRAPH_PAGE_PREFETCH")
+    stream_pages: bool = Field(False, env="GRAPH_STREAM_PAGES")
     
     # Output settings
     output_format: str = Field("csv", env="GRAPH_OUTPUT_FORMAT")
+    parquet_compression: str = Field("zstd", env="GRAPH_PARQUET_COMPRESSION")
+    list_encoding: str = Field("json", env="GRAPH_LIST_ENCODING")
     output_dir: Path = Field(Path("./output"), env="GRAPH_OUTPUT_DIR")
+    state_dir: Path = Field(Path("./state"), env="GRAPH_STATE_DIR")
     
     # Logging settings
     log_level: str = Field("INFO", env="GRAPH_LOG_LEVEL")
@@ -67,11 +80,15 @@ class Settings(BaseSettings):
 
 
 # Function to get settings instance
+@lru_cache(maxsize=None)
 def get_settings() -> Settings:
     """
     Get application settings
     
+    Settings are loaded once per process and shared by every caller; call
+    get_settings.cache_clear() to load them again
+    
     Returns:
         Settings: Application settings
     """
-    return Settings() 
\ No newline at end of file
+    return Settings()
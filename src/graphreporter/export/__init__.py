@@ -3,13 +3,61 @@ GraphReporter Export Module
 Provides export functionality for different formats
 """
 
+import importlib
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from graphreporter.export.base import BaseExporter
-from graphreporter.export.csv_exporter import CSVExporter
-from graphreporter.export.excel_exporter import ExcelExporter
-from graphreporter.export.json_exporter import JSONExporter
+
+if TYPE_CHECKING:
+    from graphreporter.export.csv_exporter import CSVExporter
+    from graphreporter.export.excel_exporter import ExcelExporter
+    from graphreporter.export.json_exporter import JSONExporter
+    from graphreporter.export.ndjson_exporter import NDJSONExporter
+    from graphreporter.export.parquet_exporter import ParquetExporter
+
+__all__ = ["BaseExporter", "CSVExporter", "ExcelExporter", "JSONExporter", "NDJSONExporter", "ParquetExporter", "get_exporter"]
+
+# Exporter class -> module defining it, imported on first use since the
+# exporters pull in pandas, openpyxl and pyarrow
+_EXPORTERS = {
+    "CSVExporter": "graphreporter.export.csv_exporter",
+    "ExcelExporter": "graphreporter.export.excel_exporter",
+    "JSONExporter": "graphreporter.export.json_exporter",
+    "NDJSONExporter": "graphreporter.export.ndjson_exporter",
+    "ParquetExporter": "graphreporter.export.parquet_exporter",
+}
+
+# Format type -> exporter class
+_FORMATS = {
+    "csv": "CSVExporter",
+    "excel": "ExcelExporter",
+    "json": "JSONExporter",
+    "ndjson": "NDJSONExporter",
+    "parquet": "ParquetExporter",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import exporter classes on first access
+    
+    Args:
+        name: Attribute name
+        
+    Returns:
+        Any: Exporter class
+        
+    Raises:
+        AttributeError: If the module has no such attribute
+    """
+    module = _EXPORTERS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    exporter_class = getattr(importlib.import_module(module), name)
+    globals()[name] = exporter_class
+    return exporter_class
 
 
 def get_exporter(format_type: str, output_dir: Optional[Path] = None) -> BaseExporter:
@@ -17,7 +65,7 @@ def get_exporter(format_type: str, output_dir: Optional[Path] = None) -> BaseExp
     Get an exporter instance based on the format type
     
     Args:
-        format_type: Format type (csv, excel, json)
+        format_type: Format type (csv, excel, json, ndjson, parquet)
         output_dir: Directory to save exported files
         
     Returns:
@@ -28,11 +76,7 @@ def get_exporter(format_type: str, output_dir: Optional[Path] = None) -> BaseExp
     """
     format_type = format_type.lower()
     
-    if format_type == "csv":
-        return CSVExporter(output_dir)
-    elif format_type == "excel":
-        return ExcelExporter(output_dir)
-    elif format_type == "json":
-        return JSONExporter(output_dir)
-    else:
+    if format_type not in _FORMATS:
         raise ValueError(f"Unsupported format type: {format_type}")
+    
+    return __getattr__(_FORMATS[format_type])(output_dir)
@@ -6,22 +6,31 @@ Base class for all exporters
 """
 
 import logging
-import os
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Union, Optional
+from typing import Dict, List, Any, Union, Optional, Iterable, AsyncIterable, Sequence
 
 from graphreporter.config.settings import get_settings
+from graphreporter.schema.batch import RecordBatch
+from graphreporter.utils.helpers import iter_batches, iterate_async
+
+# Records written per batch by streaming exports
+DEFAULT_BATCH_SIZE = 10000
 
 
 class BaseExporter(ABC):
     """
     Base class for all exporters
     
-    Defines the interface that all exporters must implement
+    Defines the interface that all exporters must implement, including the
+    _open_stream, _write_batch and _close_stream hooks used by export_stream
+    to write records incrementally.
     """
     
+    # File extension of the format, without leading dot
+    extension = ""
+    
     def __init__(self, output_dir: Optional[Path] = None):
         """
         Initialize the exporter
@@ -46,7 +55,7 @@ class BaseExporter(ABC):
         Export data to a file
         
         Args:
-            data: Data to export
+            data: Data to export, records or a RecordBatch of flat rows
             filename: Name of the output file (without extension)
             
         Returns:
@@ -54,6 +63,196 @@ class BaseExporter(ABC):
         """
         pass
     
+    def export_stream(
+        self,
+        records: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        filename: str,
+        columns: Optional[Sequence[str]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Path:
+        """
+        Export records to a file as they are produced
+        
+        Records are written in batches of batch_size, so memory use is bounded
+        by the batch rather than by the size of the export. An async iterator
+        is consumed on a background event loop, see iterate_async; use
+        export_stream_async from a running loop instead.
+        
+        Args:
+            records: Iterator or async iterator of flat records
+            filename: Name of the output file (without extension)
+            columns: Output columns in order, taken from the first batch if
+                omitted; keys outside the columns are dropped
+            batch_size: Maximum number of records written at once
+            
+        Returns:
+            Path: Path to the exported file
+            
+        Raises:
+            ValueError: If there are no records to export
+        """
+        if hasattr(records, "__aiter__"):
+            records = iterate_async(records.__aiter__(), max_buffered=batch_size)
+        
+        output_file = self._generate_filename(filename, self.extension)
+        stream = None
+        count = 0
+        try:
+            for batch in iter_batches(records, batch_size):
+                stream = self._stream_batch(stream, output_file, columns, batch)
+                count += len(batch)
+        finally:
+            if stream is not None:
+                self._close_stream(stream)
+        
+        return self._finish_stream(output_file, count)
+    
+    async def export_stream_async(
+        self,
+        records: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        filename: str,
+        columns: Optional[Sequence[str]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Path:
+        """
+        Export records to a file as they are produced, from a running event loop
+        
+        Args:
+            records: Iterator or async iterator of flat records
+            filename: Name of the output file (without extension)
+            columns: Output columns in order, taken from the first batch if
+                omitted; keys outside the columns are dropped
+            batch_size: Maximum number of records written at once
+            
+        Returns:
+            Path: Path to the exported file
+            
+        Raises:
+            ValueError: If there are no records to export
+        """
+        if not hasattr(records, "__aiter__"):
+            return self.export_stream(records, filename, columns, batch_size)
+        
+        output_file = self._generate_filename(filename, self.extension)
+        stream = None
+        count = 0
+        batch: List[Dict[str, Any]] = []
+        try:
+            async for record in records:
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    stream = self._stream_batch(stream, output_file, columns, batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                stream = self._stream_batch(stream, output_file, columns, batch)
+                count += len(batch)
+        finally:
+            if stream is not None:
+                self._close_stream(stream)
+        
+        return self._finish_stream(output_file, count)
+    
+    def _stream_batch(
+        self,
+        stream: Any,
+        output_file: Path,
+        columns: Optional[Sequence[str]],
+        batch: List[Dict[str, Any]],
+    ) -> Any:
+        """
+        Write a batch of a streaming export, opening the file on the first batch
+        
+        The file is only created once there is something to write
+        
+        Args:
+            stream: Stream state, None before the first batch
+            output_file: Path to the output file
+            columns: Output columns, None to take them from the first batch
+            batch: Records to write
+            
+        Returns:
+            Any: Stream state passed to _write_batch and _close_stream
+        """
+        if stream is None:
+            self.logger.info(f"Streaming export to {output_file}")
+            stream = self._open_stream(output_file, self._stream_columns(columns, batch))
+        
+        self._write_batch(stream, batch)
+        return stream
+    
+    def _stream_columns(self, columns: Optional[Sequence[str]], first_batch: List[Dict[str, Any]]) -> Optional[List[str]]:
+        """
+        Get the columns of a streaming export
+        
+        Args:
+            columns: Columns requested by the caller, if any
+            first_batch: First batch of records
+            
+        Returns:
+            Optional[List[str]]: Requested columns, or the keys of the first
+                batch in first-seen order
+        """
+        if columns is not None:
+            return list(columns)
+        return list(dict.fromkeys(key for record in first_batch for key in record))
+    
+    def _finish_stream(self, output_file: Path, count: int) -> Path:
+        """
+        Check and log the outcome of a streaming export
+        
+        Args:
+            output_file: Path to the output file
+            count: Number of records written
+            
+        Returns:
+            Path: Path to the exported file
+            
+        Raises:
+            ValueError: If no records were written
+        """
+        if count == 0:
+            self.logger.warning("No data to export")
+            raise ValueError("No data to export")
+        
+        self.logger.info(f"Exported {count} records to {output_file}")
+        return output_file
+    
+    @abstractmethod
+    def _open_stream(self, output_file: Path, columns: Optional[List[str]]) -> Any:
+        """
+        Open the output file of a streaming export and write its header
+        
+        Args:
+            output_file: Path to the output file
+            columns: Output columns in order, as returned by _stream_columns
+            
+        Returns:
+            Any: Stream state passed to _write_batch and _close_stream
+        """
+        pass
+    
+    @abstractmethod
+    def _write_batch(self, stream: Any, batch: List[Dict[str, Any]]) -> None:
+        """
+        Write a batch of records to a streaming export
+        
+        Args:
+            stream: Stream state returned by _open_stream
+            batch: Records to write
+        """
+        pass
+    
+    @abstractmethod
+    def _close_stream(self, stream: Any) -> None:
+        """
+        Finish a streaming export and close its file
+        
+        Args:
+            stream: Stream state returned by _open_stream
+        """
+        pass
+    
     def _generate_filename(self, base_filename: str, extension: str) -> Path:
         """
         Generate a full file path with timestamp
@@ -71,15 +270,19 @@ class BaseExporter(ABC):
         
         return self.output_dir / filename
     
-    def _normalize_data(self, data: Union[List[Dict[str, Any]], Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _normalize_data(
+        self, data: Union[List[Dict[str, Any]], Dict[str, Any], RecordBatch]
+    ) -> Union[List[Dict[str, Any]], RecordBatch]:
         """
         Normalize data to a list of dictionaries
         
+        A RecordBatch is kept as is, it already behaves as a list of flat rows
+        
         Args:
             data: Data to normalize
             
         Returns:
-            List[Dict[str, Any]]: Normalized data
+            Union[List[Dict[str, Any]], RecordBatch]: Normalized data
         """
         if isinstance(data, dict):
             # If data is a single dictionary, wrap it in a list
@@ -89,7 +292,7 @@ class BaseExporter(ABC):
             else:
                 # If data is a single object
                 return [data]
-        elif isinstance(data, list):
+        elif isinstance(data, (list, RecordBatch)):
             # If data is already a list
             return data
         else:
@@ -5,31 +5,51 @@ GraphReporter CSV Exporter
 Exports data to CSV format
 """
 
+import csv
 import logging
 from pathlib import Path
-from typing import Dict, List, Any, Union, Optional
+from typing import Dict, List, Any, Union, Optional, Sequence, Tuple, TextIO
 
 import pandas as pd
 
 from graphreporter.export.base import BaseExporter
+from graphreporter.export.flatten import flatten_frame, infer_columns
+from graphreporter.schema.batch import RecordBatch
 
 
 class CSVExporter(BaseExporter):
     """
     Exporter for CSV format
     
-    Exports data to CSV files using pandas
+    Exports data to CSV files using pandas, or with the csv module for
+    streaming exports
     """
     
-    def __init__(self, output_dir: Optional[Path] = None):
+    extension = "csv"
+    
+    def __init__(
+        self,
+        output_dir: Optional[Path] = None,
+        columns: Optional[Dict[str, str]] = None,
+        column_types: Optional[Dict[str, str]] = None,
+        list_encoding: Optional[str] = None,
+    ):
         """
         Initialize the CSV exporter
         
         Args:
             output_dir: Directory to save exported files
+            columns: Flat column -> dotted path of the nested value it holds,
+                e.g. SIGNIN_COLUMNS; inferred from the data if omitted
+            column_types: Flat column -> value type, e.g. SIGNIN_COLUMN_TYPES
+            list_encoding: Encoding of list values (json, count or join),
+                GRAPH_LIST_ENCODING by default
         """
         super().__init__(output_dir)
         self.logger = logging.getLogger(__name__)
+        self.columns = columns
+        self.column_types = column_types
+        self.list_encoding = list_encoding
         
         self.logger.debug("CSVExporter initialized")
     
@@ -53,14 +73,15 @@ class CSVExporter(BaseExporter):
             self.logger.warning("No data to export")
             raise ValueError("No data to export")
         
-        # Convert to DataFrame
-        df = pd.DataFrame(normalized_data)
-        
-        # Flatten nested objects if needed
-        df = self._flatten_dataframe(df)
+        # Convert to DataFrame and flatten nested objects; the rows of a
+        # batch are already flat and are only typed
+        if isinstance(normalized_data, RecordBatch):
+            df = self._flatten_dataframe(normalized_data.to_frame(), normalized_data.identity_columns())
+        else:
+            df = self._flatten_dataframe(self._to_frame(normalized_data))
         
         # Generate output file path
-        output_file = self._generate_filename(filename, "csv")
+        output_file = self._generate_filename(filename, self.extension)
         
         # Export to CSV
         df.to_csv(output_file, index=False)
@@ -68,33 +89,93 @@ class CSVExporter(BaseExporter):
         self.logger.info(f"Data exported to {output_file}")
         return output_file
     
-    def _flatten_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _stream_columns(self, columns: Optional[Sequence[str]], first_batch: List[Dict[str, Any]]) -> List[str]:
         """
-        Flatten nested objects in DataFrame
+        Get the columns of a streaming export
         
         Args:
-            df: DataFrame to flatten
+            columns: Columns requested by the caller, if any
+            first_batch: First batch of records
             
         Returns:
-            pd.DataFrame: Flattened DataFrame
+            List[str]: Requested columns, else the exporter's declared columns,
+                else the flat columns export would infer from the first batch
         """
-        # Get a list of columns that contain dictionaries or lists
-        nested_columns = []
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                sample = df[col].dropna().iloc[0] if not df[col].dropna().empty else None
-                if isinstance(sample, (dict, list)):
-                    nested_columns.append(col)
+        if columns is not None:
+            return list(columns)
+        if self.columns is not None:
+            return list(self.columns)
+        return list(infer_columns(self._to_frame(first_batch)))
+    
+    def _open_stream(self, output_file: Path, columns: List[str]) -> Tuple[TextIO, Dict[str, str]]:
+        """
+        Open the CSV file of a streaming export and write its header
         
-        # If no nested columns, return as is
-        if not nested_columns:
-            return df
+        Args:
+            output_file: Path to the output file
+            columns: Output columns in order
+            
+        Returns:
+            Tuple[TextIO, Dict[str, str]]: Open file and the dotted path of
+                each output column in the records
+        """
+        f = open(output_file, "w", newline="", encoding="utf-8")
+        csv.writer(f).writerow(columns)
+        paths = {column: (self.columns or {}).get(column, column) for column in columns}
+        return f, paths
+    
+    def _write_batch(self, stream: Tuple[TextIO, Dict[str, str]], batch: List[Dict[str, Any]]) -> None:
+        """
+        Flatten a batch of records and write it as CSV rows
         
-        # Drop nested columns (we'll convert them to string representation)
-        flat_df = df.drop(columns=nested_columns)
+        Values are flattened, typed and encoded as by export
         
-        # Convert nested columns to string representation
-        for col in nested_columns:
-            flat_df[col] = df[col].apply(lambda x: str(x) if x is not None else None)
+        Args:
+            stream: Open file and column paths
+            batch: Records to write
+        """
+        f, paths = stream
+        self._flatten_dataframe(self._to_frame(batch), paths).to_csv(f, header=False, index=False)
+    
+    def _close_stream(self, stream: Tuple[TextIO, Dict[str, str]]) -> None:
+        """
+        Close the CSV file of a streaming export
         
-        return flat_df 
\ No newline at end of file
+        Args:
+            stream: Open file and column paths
+        """
+        f, _ = stream
+        f.close()
+    
+    def _to_frame(self, records: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Build a DataFrame of records, keeping their values as Python objects
+        
+        Numbers are not widened to float where some records lack them, so a
+        value is written the same whichever batch it is in
+        
+        Args:
+            records: Records to convert
+            
+        Returns:
+            pd.DataFrame: Frame with one record per row
+        """
+        return pd.DataFrame(records, dtype=object)
+    
+    def _flatten_dataframe(self, df: pd.DataFrame, columns: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """
+        Flatten nested objects in DataFrame into typed columns
+        
+        Args:
+            df: DataFrame to flatten
+            columns: Flat column -> dotted path, the exporter's columns by default
+            
+        Returns:
+            pd.DataFrame: Flattened DataFrame
+        """
+        return flatten_frame(
+            df,
+            columns or self.columns,
+            self.column_types,
+            self.list_encoding or self.settings.list_encoding,
+        ) 
\ No newline at end of file
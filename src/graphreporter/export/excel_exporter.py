@@ -7,29 +7,93 @@ Exports data to Excel format
 
 import logging
 from pathlib import Path
-from typing import Dict, List, Any, Union, Optional
+from typing import Dict, List, Any, Union, Optional, Sequence
 
 import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
 
-from graphreporter.export.base import BaseExporter
+from graphreporter.export.base import BaseExporter, DEFAULT_BATCH_SIZE
+from graphreporter.export.flatten import flatten_frame, infer_columns
+from graphreporter.schema.batch import RecordBatch
+
+# Rows of an Excel worksheet, including the header row
+MAX_SHEET_ROWS = 1048576
+
+# Rows sampled from the start of an export to size the columns
+WIDTH_SAMPLE_ROWS = 1000
+
+# Widest column, in characters
+MAX_COLUMN_WIDTH = 50
+
+
+class _WorkbookStream:
+    """
+    State of a streaming Excel export
+    
+    Holds a write-only workbook and the worksheet currently written to
+    """
+    
+    def __init__(self, output_file: Path, columns: List[str], paths: Dict[str, str], max_rows: int):
+        """
+        Initialize the stream state
+        
+        Args:
+            output_file: Path to the output file
+            columns: Output columns in order
+            paths: Output column -> dotted path of its value in the records
+            max_rows: Rows per worksheet, including the header row
+        """
+        self.output_file = output_file
+        self.columns = columns
+        self.paths = paths
+        self.max_rows = max_rows
+        self.workbook = Workbook(write_only=True)
+        self.sheet = None
+        self.sheet_rows = 0
+        self.widths: Optional[List[float]] = None
 
 
 class ExcelExporter(BaseExporter):
     """
     Exporter for Excel format
     
-    Exports data to Excel files using pandas and openpyxl
+    Exports data to Excel files using openpyxl's write-only mode, so rows are
+    written as they arrive rather than held in a workbook in memory. Column
+    widths are sized from the first rows, and rows beyond the Excel limit
+    continue on a new worksheet.
     """
     
-    def __init__(self, output_dir: Optional[Path] = None):
+    extension = "xlsx"
+    
+    def __init__(
+        self,
+        output_dir: Optional[Path] = None,
+        columns: Optional[Dict[str, str]] = None,
+        column_types: Optional[Dict[str, str]] = None,
+        list_encoding: Optional[str] = None,
+        max_sheet_rows: int = MAX_SHEET_ROWS,
+    ):
         """
         Initialize the Excel exporter
         
         Args:
             output_dir: Directory to save exported files
+            columns: Flat column -> dotted path of the nested value it holds,
+                e.g. SIGNIN_COLUMNS; inferred from the data if omitted
+            column_types: Flat column -> value type, e.g. SIGNIN_COLUMN_TYPES
+            list_encoding: Encoding of list values (json, count or join),
+                GRAPH_LIST_ENCODING by default
+            max_sheet_rows: Rows per worksheet, including the header row
         """
         super().__init__(output_dir)
         self.logger = logging.getLogger(__name__)
+        self.columns = columns
+        self.column_types = column_types
+        self.list_encoding = list_encoding
+        self.max_sheet_rows = max_sheet_rows
         
         self.logger.debug("ExcelExporter initialized")
     
@@ -53,80 +117,193 @@ class ExcelExporter(BaseExporter):
             self.logger.warning("No data to export")
             raise ValueError("No data to export")
         
-        # Convert to DataFrame
-        df = pd.DataFrame(normalized_data)
-        
-        # Flatten nested objects if needed
-        df = self._flatten_dataframe(df)
+        # Convert to DataFrame and flatten nested objects; the rows of a
+        # batch are already flat and are only typed
+        if isinstance(normalized_data, RecordBatch):
+            df = self._flatten_dataframe(normalized_data.to_frame(), normalized_data.identity_columns())
+        else:
+            df = self._flatten_dataframe(self._to_frame(normalized_data))
         
         # Generate output file path
-        output_file = self._generate_filename(filename, "xlsx")
+        output_file = self._generate_filename(filename, self.extension)
         
-        # Export to Excel
-        with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
-            df.to_excel(writer, sheet_name="Data", index=False)
-            self._format_worksheet(writer, df)
+        # Export to Excel, the frame is already flat
+        stream = self._open_stream(output_file, list(df.columns))
+        try:
+            for start in range(0, len(df), DEFAULT_BATCH_SIZE):
+                self._write_frame(stream, df.iloc[start:start + DEFAULT_BATCH_SIZE])
+        finally:
+            self._close_stream(stream)
         
         self.logger.info(f"Data exported to {output_file}")
         return output_file
     
-    def _flatten_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _flatten_dataframe(self, df: pd.DataFrame, columns: Optional[Dict[str, str]] = None) -> pd.DataFrame:
         """
-        Flatten nested objects in DataFrame
+        Flatten nested objects in DataFrame into typed columns
         
         Args:
             df: DataFrame to flatten
+            columns: Flat column -> dotted path, the exporter's columns by default
             
         Returns:
             pd.DataFrame: Flattened DataFrame
         """
-        # Get a list of columns that contain dictionaries or lists
-        nested_columns = []
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                sample = df[col].dropna().iloc[0] if not df[col].dropna().empty else None
-                if isinstance(sample, (dict, list)):
-                    nested_columns.append(col)
+        flat_df = flatten_frame(
+            df,
+            columns or self.columns,
+            self.column_types,
+            self.list_encoding or self.settings.list_encoding,
+        )
         
-        # If no nested columns, return as is
-        if not nested_columns:
-            return df
+        # Excel has no time zones, timestamps are written as naive UTC
+        for col in flat_df.select_dtypes("datetimetz").columns:
+            flat_df[col] = flat_df[col].dt.tz_localize(None)
         
-        # Drop nested columns (we'll convert them to string representation)
-        flat_df = df.drop(columns=nested_columns)
+        return flat_df
+    
+    def _to_frame(self, records: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Build a DataFrame of records, keeping their values as Python objects
         
-        # Convert nested columns to string representation
-        for col in nested_columns:
-            flat_df[col] = df[col].apply(lambda x: str(x) if x is not None else None)
+        Numbers are not widened to float where some records lack them, so a
+        value is written the same whichever batch it is in
         
-        return flat_df
+        Args:
+            records: Records to convert
+            
+        Returns:
+            pd.DataFrame: Frame with one record per row
+        """
+        return pd.DataFrame(records, dtype=object)
+    
+    def _stream_columns(self, columns: Optional[Sequence[str]], first_batch: List[Dict[str, Any]]) -> List[str]:
+        """
+        Get the columns of a streaming export
+        
+        Args:
+            columns: Columns requested by the caller, if any
+            first_batch: First batch of records
+            
+        Returns:
+            List[str]: Requested columns, else the exporter's declared columns,
+                else the flat columns export would infer from the first batch
+        """
+        if columns is not None:
+            return list(columns)
+        if self.columns is not None:
+            return list(self.columns)
+        return list(infer_columns(self._to_frame(first_batch)))
+    
+    def _open_stream(self, output_file: Path, columns: List[str]) -> _WorkbookStream:
+        """
+        Start the write-only workbook of a streaming export
+        
+        Worksheets are added by _write_frame, once the first rows are known
+        
+        Args:
+            output_file: Path to the output file
+            columns: Output columns in order
+            
+        Returns:
+            _WorkbookStream: Stream state
+        """
+        paths = {column: (self.columns or {}).get(column, column) for column in columns}
+        return _WorkbookStream(output_file, columns, paths, self.max_sheet_rows)
     
-    def _format_worksheet(self, writer: pd.ExcelWriter, df: pd.DataFrame) -> None:
+    def _write_batch(self, stream: _WorkbookStream, batch: List[Dict[str, Any]]) -> None:
         """
-        Format Excel worksheet
+        Flatten a batch of records and write it as worksheet rows
         
         Args:
-            writer: Excel writer
-            df: DataFrame being exported
+            stream: Stream state
+            batch: Records to write
         """
-        # Get the workbook and worksheet
-        workbook = writer.book
-        worksheet = writer.sheets["Data"]
+        self._write_frame(stream, self._flatten_dataframe(self._to_frame(batch), stream.paths))
+    
+    def _close_stream(self, stream: _WorkbookStream) -> None:
+        """
+        Save the workbook of a streaming export
+        
+        Args:
+            stream: Stream state
+        """
+        if stream.sheet is None:
+            # Nothing was written, keep the file out of the output directory
+            return
+        
+        stream.workbook.save(stream.output_file)
+    
+    def _write_frame(self, stream: _WorkbookStream, df: pd.DataFrame) -> None:
+        """
+        Append the rows of a flat DataFrame, starting new worksheets as needed
+        
+        Args:
+            stream: Stream state
+            df: Flat DataFrame with the stream's columns
+        """
+        if stream.widths is None:
+            stream.widths = self._column_widths(stream.columns, df.head(WIDTH_SAMPLE_ROWS))
+        
+        # openpyxl writes None as an empty cell, but not NaN, NaT or NA
+        rows = df[stream.columns].astype(object).where(df[stream.columns].notna(), None)
+        
+        for row in rows.itertuples(index=False, name=None):
+            if stream.sheet is None or stream.sheet_rows >= stream.max_rows:
+                self._add_sheet(stream)
+            stream.sheet.append(row)
+            stream.sheet_rows += 1
+    
+    def _add_sheet(self, stream: _WorkbookStream) -> None:
+        """
+        Add a worksheet with sized columns and a formatted header row
+        
+        Args:
+            stream: Stream state
+        """
+        number = len(stream.workbook.worksheets) + 1
+        title = "Data" if number == 1 else f"Data {number}"
+        if number > 1:
+            self.logger.info(f"Worksheet row limit reached, continuing on {title}")
+        
+        sheet = stream.workbook.create_sheet(title)
+        
+        # Column widths must be set before the first row of a write-only sheet
+        for i, width in enumerate(stream.widths, start=1):
+            sheet.column_dimensions[get_column_letter(i)].width = width
+        sheet.freeze_panes = "A2"
         
         # Format header row
-        header_format = {
-            "bold": True,
-            "bg_color": "#4472C4",
-            "font_color": "white",
-            "border": 1
-        }
-        
-        # Set column widths
-        for i, column in enumerate(df.columns):
-            # Estimate column width based on header and data
-            max_len = max(
-                len(str(column)),
-                df[column].astype(str).map(len).max() if not df.empty else 0
-            )
-            max_len = min(max_len, 50)  # Cap at 50 characters
-            worksheet.column_dimensions[chr(65 + i)].width = max_len + 2 
\ No newline at end of file
+        header_font = Font(bold=True, color="FFFFFF")
+        header_fill = PatternFill("solid", fgColor="4472C4")
+        side = Side(style="thin")
+        header_border = Border(left=side, right=side, top=side, bottom=side)
+        header = []
+        for column in stream.columns:
+            cell = WriteOnlyCell(sheet, value=column)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.border = header_border
+            header.append(cell)
+        sheet.append(header)
+        
+        stream.sheet = sheet
+        stream.sheet_rows = 1
+    
+    def _column_widths(self, columns: List[str], sample: pd.DataFrame) -> List[float]:
+        """
+        Estimate column widths from the header and a sample of rows
+        
+        Args:
+            columns: Output columns in order
+            sample: First rows of the export
+            
+        Returns:
+            List[float]: Width per column, in characters
+        """
+        widths = []
+        for column in columns:
+            values = sample[column].dropna() if column in sample.columns else []
+            max_len = max([len(str(column))] + [len(str(value)) for value in values])
+            widths.append(min(max_len, MAX_COLUMN_WIDTH) + 2)
+        return widths
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphReporter Flattening
+Expands nested Graph objects of a DataFrame into typed flat columns
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import pandas as pd
+
+from graphreporter.schema.batch import LIST_ENCODINGS, encode_value
+
+
+def infer_columns(df: pd.DataFrame) -> Dict[str, str]:
+    """
+    Derive flat columns from the nested objects found in a DataFrame
+
+    Every value of an object column is inspected, so a column is expanded
+    even if its first values are missing or scalar. Nested keys are named by
+    their dotted path, e.g. status.errorCode.
+
+    Args:
+        df: DataFrame with one nested Graph object per cell
+
+    Returns:
+        Dict[str, str]: Flat column -> dotted path, in column order
+    """
+    columns: Dict[str, str] = {}
+    for col in df.columns:
+        paths: Dict[str, None] = {}
+        if df[col].dtype == object:
+            for value in df[col].tolist():
+                if isinstance(value, dict):
+                    _collect_paths(value, str(col), paths)
+
+        # A key that is empty in some rows and an object in others is
+        # represented by the leaves of the object
+        parents = {path.rsplit(".", 1)[0] for path in paths}
+        leaves = [path for path in paths if path not in parents]
+
+        if leaves:
+            columns.update((path, path) for path in leaves)
+        else:
+            columns[col] = col
+
+    return columns
+
+
+def flatten_frame(
+    df: pd.DataFrame,
+    columns: Optional[Mapping[str, str]] = None,
+    column_types: Optional[Mapping[str, str]] = None,
+    list_encoding: str = "json",
+) -> pd.DataFrame:
+    """
+    Flatten nested objects of a DataFrame into typed columns
+
+    Each dotted path is resolved for the whole column at once, and levels
+    shared by several paths, such as location for location.city and
+    location.geoCoordinates.latitude, are only resolved once.
+
+    Args:
+        df: DataFrame with one nested Graph object per cell
+        columns: Flat column -> dotted path, e.g. SIGNIN_COLUMNS; inferred
+            from the data if omitted
+        column_types: Flat column -> string, int32, int64, float64, bool or
+            timestamp; untyped columns keep their values
+        list_encoding: Encoding of list values, one of LIST_ENCODINGS
+
+    Returns:
+        pd.DataFrame: Frame with one column per flat column
+
+    Raises:
+        ValueError: If the list encoding or a column type is not supported
+    """
+    if list_encoding not in LIST_ENCODINGS:
+        raise ValueError(f"Unsupported list encoding: {list_encoding}")
+
+    if columns is None:
+        columns = infer_columns(df)
+    column_types = column_types or {}
+
+    levels: Dict[Tuple[str, ...], List[Any]] = {}
+    flat = {}
+    for column, path in columns.items():
+        values = _resolve(df, tuple(path.split(".")), levels)
+        flat[column] = _typed_series(values, column_types.get(column), list_encoding, df.index)
+
+    return pd.DataFrame(flat, index=df.index)
+
+
+def _collect_paths(value: Dict[str, Any], prefix: str, paths: Dict[str, None]) -> None:
+    """
+    Add the dotted paths of the leaves of a nested object
+
+    Args:
+        value: Nested object
+        prefix: Dotted path of the object
+        paths: Paths found so far, in first-seen order
+    """
+    for key, item in value.items():
+        path = f"{prefix}.{key}"
+        if isinstance(item, dict) and item:
+            _collect_paths(item, path, paths)
+        else:
+            paths[path] = None
+
+
+def _resolve(df: pd.DataFrame, keys: Tuple[str, ...], levels: Dict[Tuple[str, ...], List[Any]]) -> List[Any]:
+    """
+    Get the values of a dotted path for every row
+
+    Args:
+        df: DataFrame with one nested Graph object per cell
+        keys: Keys of the path
+        levels: Values of the paths resolved so far, extended in place
+
+    Returns:
+        List[Any]: Value per row, None where the path is missing
+    """
+    if keys in levels:
+        return levels[keys]
+
+    dotted = ".".join(keys)
+    if dotted in df.columns:
+        # Already flat, e.g. a column named status.errorCode
+        values = df[dotted].tolist()
+    elif len(keys) == 1:
+        values = [None] * len(df)
+    else:
+        key = keys[-1]
+        values = [
+            value.get(key) if isinstance(value, dict) else None
+            for value in _resolve(df, keys[:-1], levels)
+        ]
+
+    levels[keys] = values
+    return values
+
+
+def _typed_series(values: List[Any], value_type: Optional[str], list_encoding: str, index: pd.Index) -> pd.Series:
+    """
+    Build a typed column from resolved values
+
+    Args:
+        values: Value per row
+        value_type: Column type, None to keep the values
+        list_encoding: Encoding of list values
+        index: Index of the frame
+
+    Returns:
+        pd.Series: Column
+
+    Raises:
+        ValueError: If the column type is not supported
+    """
+    series = pd.Series(values, index=index, dtype=object)
+
+    # Only columns of mixed Python objects can hold lists or objects left
+    if pd.api.types.infer_dtype(series, skipna=True) in ("mixed", "mixed-integer"):
+        if any(isinstance(value, (dict, list)) for value in values):
+            series = pd.Series([encode_value(value, list_encoding) for value in values], index=index, dtype=object)
+
+    if value_type is None or value_type == "string":
+        return series
+    if value_type == "timestamp":
+        return pd.to_datetime(series, utc=True, errors="coerce")
+    if value_type in ("int32", "int64"):
+        return pd.to_numeric(series, errors="coerce").astype("Int32" if value_type == "int32" else "Int64")
+    if value_type == "float64":
+        return pd.to_numeric(series, errors="coerce").astype("float64")
+    if value_type == "bool":
+        return series.astype("boolean")
+    raise ValueError(f"Unsupported column type: {value_type}")
@@ -7,8 +7,9 @@ Exports data to JSON format
 
 import json
 import logging
+import textwrap
 from pathlib import Path
-from typing import Dict, List, Any, Union, Optional
+from typing import Dict, List, Any, Union, Optional, Sequence
 
 from graphreporter.export.base import BaseExporter
 
@@ -17,9 +18,12 @@ class JSONExporter(BaseExporter):
     """
     Exporter for JSON format
     
-    Exports data to JSON files
+    Exports data to JSON files. Streaming exports write the array one
+    batch at a time, in the same layout as export
     """
     
+    extension = "json"
+    
     def __init__(self, output_dir: Optional[Path] = None):
         """
         Initialize the JSON exporter
@@ -53,15 +57,73 @@ class JSONExporter(BaseExporter):
             raise ValueError("No data to export")
         
         # Generate output file path
-        output_file = self._generate_filename(filename, "json")
+        output_file = self._generate_filename(filename, self.extension)
         
-        # Export to JSON
+        # Export to JSON, json only serializes real lists
         with open(output_file, "w", encoding="utf-8") as file:
-            json.dump(normalized_data, file, indent=2, default=self._json_serializer)
+            json.dump(list(normalized_data), file, indent=2, default=self._json_serializer)
         
         self.logger.info(f"Data exported to {output_file}")
         return output_file
     
+    def _stream_columns(self, columns: Optional[Sequence[str]], first_batch: List[Dict[str, Any]]) -> Optional[List[str]]:
+        """
+        Get the columns of a streaming export
+        
+        Args:
+            columns: Columns requested by the caller, if any
+            first_batch: First batch of records
+            
+        Returns:
+            Optional[List[str]]: Requested columns, None to keep whole records
+        """
+        return list(columns) if columns is not None else None
+    
+    def _open_stream(self, output_file: Path, columns: Optional[List[str]]) -> Dict[str, Any]:
+        """
+        Open the JSON file of a streaming export and start its array
+        
+        Args:
+            output_file: Path to the output file
+            columns: Keys to keep in order, None to keep whole records
+            
+        Returns:
+            Dict[str, Any]: Open file, columns and whether a record was written
+        """
+        file = open(output_file, "w", encoding="utf-8")
+        file.write("[")
+        return {"file": file, "columns": columns, "started": False}
+    
+    def _write_batch(self, stream: Dict[str, Any], batch: List[Dict[str, Any]]) -> None:
+        """
+        Append a batch of records to the array
+        
+        Args:
+            stream: Open file, columns and whether a record was written
+            batch: Records to write
+        """
+        columns = stream["columns"]
+        if columns is not None:
+            batch = [{column: record.get(column) for column in columns} for record in batch]
+        
+        items = [
+            textwrap.indent(json.dumps(record, indent=2, default=self._json_serializer), "  ")
+            for record in batch
+        ]
+        separator = ",\n" if stream["started"] else "\n"
+        stream["file"].write(separator + ",\n".join(items))
+        stream["started"] = True
+    
+    def _close_stream(self, stream: Dict[str, Any]) -> None:
+        """
+        Close the array and the JSON file
+        
+        Args:
+            stream: Open file, columns and whether a record was written
+        """
+        stream["file"].write("\n]" if stream["started"] else "]")
+        stream["file"].close()
+    
     def _json_serializer(self, obj: Any) -> Any:
         """
         Custom JSON serializer for handling objects that are not JSON serializable
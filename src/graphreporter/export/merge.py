@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphReporter CSV Merge
+Concatenates chunk CSV files without parsing their rows
+"""
+
+import csv
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence, Tuple, Union
+
+from graphreporter.utils.helpers import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# Suffix of the metadata file written next to an exported CSV file
+METADATA_SUFFIX = ".meta.json"
+
+
+def metadata_path(path: Union[str, Path]) -> Path:
+    """
+    Get the path of the metadata file of a CSV file
+
+    Args:
+        path: Path to the CSV file
+
+    Returns:
+        Path: Path to its metadata file
+    """
+    return Path(f"{path}{METADATA_SUFFIX}")
+
+
+def write_csv_metadata(path: Union[str, Path], columns: Sequence[str], rows: int) -> None:
+    """
+    Record the columns and row count of a CSV file in its metadata file
+
+    Args:
+        path: Path to the CSV file
+        columns: Columns of its header
+        rows: Number of data rows
+    """
+    write_json_atomic(metadata_path(path), {"columns": list(columns), "rows": rows})
+
+
+def read_csv_metadata(path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """
+    Read the metadata file of a CSV file
+
+    Args:
+        path: Path to the CSV file
+
+    Returns:
+        Optional[Dict[str, Any]]: Columns and rows, or None if the file has
+            no readable metadata
+    """
+    try:
+        with open(metadata_path(path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def merge_csv_files(
+    paths: Sequence[Union[str, Path]],
+    output_file: Union[str, Path],
+    remove_sources: bool = False,
+) -> Tuple[Path, Optional[int]]:
+    """
+    Merge CSV files with identical headers into one file
+
+    The header of the first file is written once, then the data of every
+    file is appended byte for byte from the end of its header, copied by the
+    kernel where the platform allows it. Rows are never parsed, so the merge
+    runs at the speed of the disk. The row count is the sum of the counts in
+    the metadata files written at export time.
+
+    Args:
+        paths: CSV files to merge, in order
+        output_file: Path to the merged file, which gets a metadata file too
+        remove_sources: Delete the merged files and their metadata afterwards
+
+    Returns:
+        Tuple[Path, Optional[int]]: Merged file and its number of data rows,
+            None if a file has no metadata
+
+    Raises:
+        ValueError: If there are no files or their headers differ
+    """
+    if not paths:
+        raise ValueError("No files to merge")
+
+    output_file = Path(output_file)
+    header = _read_header(paths[0])
+    rows: Optional[int] = 0
+
+    with open(output_file, "wb") as dst:
+        dst.write(header)
+        for path in paths:
+            with open(path, "rb") as src:
+                file_header = src.readline()
+                if file_header != header:
+                    raise ValueError(f"Header of {path} differs from {paths[0]}")
+
+                size = os.fstat(src.fileno()).st_size
+                _copy_data(src, dst, len(header), size - len(header))
+                if size > len(header) and not _ends_with_newline(src, size):
+                    dst.write(b"\r\n")
+
+            metadata = read_csv_metadata(path)
+            if rows is not None and metadata is not None:
+                rows += metadata["rows"]
+            else:
+                rows = None
+
+    if rows is not None:
+        write_csv_metadata(output_file, _parse_header(header), rows)
+
+    if remove_sources:
+        for path in paths:
+            os.remove(path)
+            metadata_path(path).unlink(missing_ok=True)
+
+    logger.info(f"Merged {len(paths)} files into {output_file}")
+    return output_file, rows
+
+
+def _read_header(path: Union[str, Path]) -> bytes:
+    """
+    Read the header line of a CSV file
+
+    Args:
+        path: Path to the CSV file
+
+    Returns:
+        bytes: Header line including its line terminator
+    """
+    with open(path, "rb") as f:
+        return f.readline()
+
+
+def _parse_header(header: bytes) -> List[str]:
+    """
+    Get the column names of a header line
+
+    Args:
+        header: Header line
+
+    Returns:
+        List[str]: Column names
+    """
+    return next(csv.reader([header.decode("utf-8-sig")]), [])
+
+
+def _ends_with_newline(src: BinaryIO, size: int) -> bool:
+    """
+    Check whether a file ends with a line terminator
+
+    Args:
+        src: File open for reading
+        size: Size of the file
+
+    Returns:
+        bool: True if the last byte is a newline
+    """
+    src.seek(size - 1)
+    return src.read(1) == b"\n"
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    """Copy bytes between files in the kernel, at the current output position"""
+    return os.copy_file_range(src_fd, dst_fd, count, offset)
+
+
+def _sendfile(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    """Copy bytes between files with sendfile, at the current output position"""
+    return os.sendfile(dst_fd, src_fd, offset, count)
+
+
+# Kernel-side copies, in order of preference; copy_file_range is Linux only
+# and sendfile only writes to regular files on Linux
+_KERNEL_COPIES = [
+    copy for name, copy in (("copy_file_range", _copy_file_range), ("sendfile", _sendfile))
+    if hasattr(os, name)
+]
+
+
+def _copy_data(src: BinaryIO, dst: BinaryIO, offset: int, count: int) -> None:
+    """
+    Append a byte range of one file to another
+
+    Args:
+        src: File to copy from, open for reading
+        dst: File to copy to, open for writing
+        offset: Position of the first byte to copy
+        count: Number of bytes to copy
+    """
+    # Kernel copies write at the position of the file descriptor
+    dst.flush()
+
+    end = offset + count
+    for copy in _KERNEL_COPIES:
+        try:
+            while offset < end:
+                copied = copy(src.fileno(), dst.fileno(), offset, end - offset)
+                if copied == 0:
+                    return
+                offset += copied
+            return
+        except OSError as e:
+            logger.debug(f"{copy.__name__} unavailable, falling back: {e}")
+
+    src.seek(offset)
+    shutil.copyfileobj(src, dst)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphReporter NDJSON Exporter
+Exports data as newline-delimited JSON
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Any, Union, Optional, Sequence
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional, faster backend
+    orjson = None
+
+from graphreporter.export.base import BaseExporter, DEFAULT_BATCH_SIZE
+from graphreporter.utils.helpers import iter_batches
+
+
+def dumps_line(record: Dict[str, Any]) -> bytes:
+    """
+    Encode a record as one compact JSON line
+
+    Uses orjson when it is installed and the standard library otherwise.
+    Datetimes are written in ISO 8601 format and other unsupported values
+    as strings by both backends.
+
+    Args:
+        record: Record to encode
+
+    Returns:
+        bytes: UTF-8 encoded JSON followed by a newline
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            record,
+            default=str,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS,
+        )
+
+    line = json.dumps(record, separators=(",", ":"), ensure_ascii=False, default=_json_default)
+    return (line + "\n").encode("utf-8")
+
+
+def _json_default(value: Any) -> str:
+    """
+    Serialize values the json module does not support
+
+    Args:
+        value: Value to serialize
+
+    Returns:
+        str: ISO 8601 string for dates and datetimes, str(value) otherwise
+    """
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class NDJSONExporter(BaseExporter):
+    """
+    Exporter for newline-delimited JSON
+
+    Writes one compact JSON document per record and line, as records arrive.
+    Records keep their nesting and all of their keys unless columns are
+    given. Each batch is encoded into a single buffer, written and flushed, so
+    readers such as log shippers see complete lines batch by batch.
+    """
+
+    extension = "jsonl"
+
+    def __init__(self, output_dir: Optional[Path] = None):
+        """
+        Initialize the NDJSON exporter
+
+        Args:
+            output_dir: Directory to save exported files
+        """
+        super().__init__(output_dir)
+        self.logger = logging.getLogger(__name__)
+        self.logger.debug("NDJSONExporter initialized")
+
+    def export(self, data: Union[List[Dict[str, Any]], Dict[str, Any]], filename: str) -> Path:
+        """
+        Export data to an NDJSON file
+
+        Args:
+            data: Data to export
+            filename: Name of the output file (without extension)
+
+        Returns:
+            Path: Path to the exported file
+        """
+        self.logger.info(f"Exporting data to NDJSON: {filename}")
+
+        return self.export_stream(self._normalize_data(data), filename)
+
+    def write(
+        self,
+        records: Iterable[Dict[str, Any]],
+        output: BinaryIO,
+        columns: Optional[Sequence[str]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        """
+        Write records to an open binary stream without an intermediate file
+
+        Use sys.stdout.buffer to pipe records into another process.
+
+        Args:
+            records: Records to write
+            output: Binary stream to write to, left open
+            columns: Keys to keep in order, all keys if omitted
+            batch_size: Number of records encoded and flushed at a time
+
+        Returns:
+            int: Number of records written
+        """
+        stream = {"file": output, "columns": list(columns) if columns is not None else None}
+
+        count = 0
+        for batch in iter_batches(records, batch_size):
+            self._write_batch(stream, batch)
+            count += len(batch)
+
+        self.logger.debug(f"Wrote {count} records as NDJSON")
+        return count
+
+    def _stream_columns(self, columns: Optional[Sequence[str]], first_batch: List[Dict[str, Any]]) -> Optional[List[str]]:
+        """
+        Get the columns of a streaming export
+
+        Args:
+            columns: Columns requested by the caller, if any
+            first_batch: First batch of records
+
+        Returns:
+            Optional[List[str]]: Requested columns, None to keep whole records
+        """
+        return list(columns) if columns is not None else None
+
+    def _open_stream(self, output_file: Path, columns: Optional[List[str]]) -> Dict[str, Any]:
+        """
+        Open the NDJSON file of a streaming export
+
+        Args:
+            output_file: Path to the output file
+            columns: Keys to keep in order, None to keep whole records
+
+        Returns:
+            Dict[str, Any]: Open file and columns
+        """
+        return {"file": open(output_file, "wb"), "columns": columns}
+
+    def _write_batch(self, stream: Dict[str, Any], batch: List[Dict[str, Any]]) -> None:
+        """
+        Encode a batch of records, write it in one call and flush it
+
+        Args:
+            stream: Open file and columns
+            batch: Records to write
+        """
+        columns = stream["columns"]
+        if columns is not None:
+            batch = [{column: record.get(column) for column in columns} for record in batch]
+
+        stream["file"].write(b"".join(dumps_line(record) for record in batch))
+        stream["file"].flush()
+
+    def _close_stream(self, stream: Dict[str, Any]) -> None:
+        """
+        Close the NDJSON file
+
+        Args:
+            stream: Open file and columns
+        """
+        stream["file"].close()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphReporter Parquet Exporter
+Exports data to Parquet format
+"""
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Union, Optional, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is an optional dependency, see the parquet extra
+    pa = None
+    pq = None
+
+from graphreporter.export.base import BaseExporter
+from graphreporter.schema.signins import SIGNIN_COLUMN_TYPES, SIGNIN_COLUMNS, SIGNIN_DICTIONARY_COLUMNS
+from graphreporter.sync.checkpoint import parse_timestamp
+
+
+class ParquetExporter(BaseExporter):
+    """
+    Exporter for Parquet format
+
+    Exports data to Parquet files using pyarrow. Columns are typed from a
+    fixed schema, by default the sign-in schema, and repetitive string columns
+    are dictionary-encoded. Streaming exports write one row group per batch.
+
+    Records may be flat rows keyed by the schema's columns or raw Graph
+    objects: a property holding schema columns, such as createdDateTime or
+    status, is written as those columns, read from their paths. Values that
+    cannot be converted to their column's type are written as nulls.
+    """
+
+    extension = "parquet"
+
+    def __init__(
+        self,
+        output_dir: Optional[Path] = None,
+        compression: Optional[str] = None,
+        column_types: Optional[Dict[str, str]] = None,
+        dictionary_columns: Optional[Sequence[str]] = None,
+        columns: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Initialize the Parquet exporter
+
+        Args:
+            output_dir: Directory to save exported files
+            compression: Parquet compression codec, GRAPH_PARQUET_COMPRESSION by default
+            column_types: Column name -> string, int32, int64, float64, bool or timestamp,
+                SIGNIN_COLUMN_TYPES by default; other columns are stored as strings
+            dictionary_columns: Columns to dictionary-encode,
+                SIGNIN_DICTIONARY_COLUMNS by default
+            columns: Flat column -> dotted path of its value in a raw Graph
+                object, SIGNIN_COLUMNS by default
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        if pa is None:
+            raise ImportError("Parquet export requires pyarrow, install graphreporter[parquet]")
+
+        super().__init__(output_dir)
+        self.logger = logging.getLogger(__name__)
+        self.compression = compression or self.settings.parquet_compression
+        self.column_types = SIGNIN_COLUMN_TYPES if column_types is None else column_types
+        self.dictionary_columns = set(
+            SIGNIN_DICTIONARY_COLUMNS if dictionary_columns is None else dictionary_columns
+        )
+        self.columns = SIGNIN_COLUMNS if columns is None else columns
+
+        # Top-level property -> flat columns whose values it holds
+        self._columns_by_property: Dict[str, List[str]] = {}
+        for column, path in self.columns.items():
+            self._columns_by_property.setdefault(path.split(".")[0], []).append(column)
+
+        self.logger.debug("ParquetExporter initialized")
+
+    def export(self, data: Union[List[Dict[str, Any]], Dict[str, Any]], filename: str) -> Path:
+        """
+        Export data to a Parquet file
+
+        Args:
+            data: Data to export
+            filename: Name of the output file (without extension)
+
+        Returns:
+            Path: Path to the exported file
+        """
+        self.logger.info(f"Exporting data to Parquet: {filename}")
+
+        return self.export_stream(self._normalize_data(data), filename)
+
+    def _stream_columns(self, columns: Optional[Sequence[str]], first_batch: List[Dict[str, Any]]) -> List[str]:
+        """
+        Get the columns of a streaming export
+
+        Args:
+            columns: Columns requested by the caller, if any
+            first_batch: First batch of records
+
+        Returns:
+            List[str]: Requested columns, or the keys of the first batch in
+                first-seen order, with properties of raw Graph objects
+                replaced by the schema columns they hold
+        """
+        if columns is not None:
+            return list(columns)
+
+        stream_columns: Dict[str, None] = {}
+        for key in dict.fromkeys(key for record in first_batch for key in record):
+            if key in self.columns or key not in self._columns_by_property:
+                stream_columns[key] = None
+            else:
+                stream_columns.update(dict.fromkeys(self._columns_by_property[key]))
+        return list(stream_columns)
+
+    def _open_stream(self, output_file: Path, columns: List[str]) -> "pq.ParquetWriter":
+        """
+        Open the Parquet file of a streaming export
+
+        Args:
+            output_file: Path to the output file
+            columns: Output columns in order
+
+        Returns:
+            pq.ParquetWriter: Writer for the file
+        """
+        schema = pa.schema([
+            (column, self._arrow_type(self.column_types.get(column, "string")))
+            for column in columns
+        ])
+
+        return pq.ParquetWriter(
+            output_file,
+            schema,
+            compression=self.compression,
+            use_dictionary=[column for column in columns if column in self.dictionary_columns],
+        )
+
+    def _write_batch(self, stream: "pq.ParquetWriter", batch: List[Dict[str, Any]]) -> None:
+        """
+        Write a batch of records as a row group
+
+        Args:
+            stream: Writer for the file
+            batch: Records to write
+        """
+        arrays = []
+        for field in stream.schema:
+            value_type = self.column_types.get(field.name, "string")
+            keys = self.columns.get(field.name, field.name).split(".")
+            values = [self._convert(self._lookup(record, field.name, keys), value_type) for record in batch]
+            arrays.append(pa.array(values, type=field.type))
+
+        stream.write_table(pa.Table.from_arrays(arrays, schema=stream.schema))
+
+    def _close_stream(self, stream: "pq.ParquetWriter") -> None:
+        """
+        Write the footer and close the Parquet file
+
+        Args:
+            stream: Writer for the file
+        """
+        stream.close()
+
+    def _lookup(self, record: Dict[str, Any], column: str, keys: List[str]) -> Any:
+        """
+        Get the value of a column from a flat row or a raw Graph object
+
+        Args:
+            record: Record to read
+            column: Flat column
+            keys: Keys of the dotted path of the column
+
+        Returns:
+            Any: Value of the column, or of its path if the record is not
+                flat, None if missing
+        """
+        if column in record:
+            return record[column]
+
+        value: Any = record
+        for key in keys:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+
+    def _arrow_type(self, value_type: str) -> "pa.DataType":
+        """
+        Get the Arrow type of a schema value type
+
+        Args:
+            value_type: string, int32, int64, float64, bool or timestamp
+
+        Returns:
+            pa.DataType: Arrow type
+
+        Raises:
+            ValueError: If the value type is unknown
+        """
+        arrow_types = {
+            "string": pa.string(),
+            "int32": pa.int32(),
+            "int64": pa.int64(),
+            "float64": pa.float64(),
+            "bool": pa.bool_(),
+            "timestamp": pa.timestamp("us", tz="UTC"),
+        }
+        if value_type not in arrow_types:
+            raise ValueError(f"Unsupported column type: {value_type}")
+        return arrow_types[value_type]
+
+    def _convert(self, value: Any, value_type: str) -> Any:
+        """
+        Convert a record value to the Python type Arrow expects for a column
+
+        Args:
+            value: Record value
+            value_type: Schema value type of the column
+
+        Returns:
+            Any: Converted value, None for missing and empty values and for
+                values that do not convert to the column's type
+        """
+        if value is None or value == "":
+            return None
+        try:
+            if value_type == "timestamp":
+                if not isinstance(value, (str, datetime)):
+                    raise TypeError(f"{type(value).__name__} is not a timestamp")
+                return parse_timestamp(value)
+            if value_type in ("int32", "int64"):
+                number = int(value)
+                bits = 31 if value_type == "int32" else 63
+                if not -(1 << bits) <= number < (1 << bits):
+                    raise OverflowError(f"{number} is out of range")
+                return number
+            if value_type == "float64":
+                return float(value)
+        except (TypeError, ValueError, OverflowError):
+            self.logger.debug(f"Writing null for {value!r}, not a valid {value_type}")
+            return None
+        if value_type == "bool":
+            return value if isinstance(value, bool) else str(value).lower() == "true"
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, default=str)
+        return str(value)
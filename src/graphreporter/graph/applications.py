@@ -6,9 +6,11 @@ Client for retrieving app registration information from Microsoft Graph API
 """
 
 import logging
-from typing import Dict, List, Optional, Any, Iterator
+from typing import Dict, List, Optional, Any, Iterator, AsyncIterator, Iterable
 
 from graphreporter.graph.client import GraphClient
+from graphreporter.graph.context import GraphContext
+from graphreporter.sync.delta import DeltaSync
 
 
 class ApplicationsClient(GraphClient):
@@ -18,9 +20,15 @@ class ApplicationsClient(GraphClient):
     Extends the base GraphClient with application-specific functionality
     """
     
-    def __init__(self):
-        """Initialize the applications client"""
-        super().__init__()
+    def __init__(self, context: Optional[GraphContext] = None):
+        """
+        Initialize the applications client
+        
+        Args:
+            context: Context to share resources through, the process-wide
+                context if omitted
+        """
+        super().__init__(context)
         self.logger = logging.getLogger(__name__)
         
         self.logger.debug("ApplicationsClient initialized")
@@ -44,6 +52,149 @@ class ApplicationsClient(GraphClient):
         """
         self.logger.info("Retrieving app registrations")
         
+        params = self._build_params(app_id, max_results)
+        
+        # Get paginated results
+        count = 0
+        for app in self.get_paginated(
+            "applications",
+            params,
+            prefetch=self.settings.page_prefetch,
+            stream=self.settings.stream_pages,
+        ):
+            # Post-filter for permissions if needed
+            if permissions and not self._has_permissions(app, permissions):
+                continue
+                
+            if max_results and count >= max_results:
+                break
+                
+            yield app
+            count += 1
+        
+        self.logger.info(f"Retrieved {count} app registrations")
+    
+    def sync_applications(self, permissions: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Get every app registration from a local snapshot kept current with
+        /applications/delta
+        
+        The first call downloads the whole directory, later calls only fetch
+        the changes since the previous call
+        
+        Args:
+            permissions: Filter by required permission
+            
+        Returns:
+            List[Dict[str, Any]]: Application objects
+        """
+        select = self._build_params(None, None)["$select"]
+        apps = DeltaSync(self, "applications", select, self.settings.state_dir).sync()
+        
+        if permissions:
+            apps = [app for app in apps if self._has_permissions(app, permissions)]
+        return apps
+    
+    def get_application_by_app_id(self, app_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a specific app registration by application ID
+        
+        Args:
+            app_id: Application ID
+            
+        Returns:
+            Optional[Dict[str, Any]]: Application object or None if not found
+        """
+        self.logger.info(f"Retrieving app registration for app ID: {app_id}")
+        
+        try:
+            response = self.submit("applications", self._build_params(app_id, None)).result()
+            return self._first_result(response, app_id)
+        except Exception as e:
+            self.logger.error(f"Error retrieving app registration: {str(e)}")
+            return None
+    
+    def get_applications_by_app_ids(self, app_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get app registrations for many application IDs
+        
+        The lookups are coalesced into $batch requests of up to 20 sub-requests
+        
+        Args:
+            app_ids: Application IDs
+            
+        Returns:
+            Dict[str, Optional[Dict[str, Any]]]: Application object, or None if
+            not found, keyed by application ID
+        """
+        app_ids = list(dict.fromkeys(app_ids))
+        self.logger.info(f"Retrieving app registrations for {len(app_ids)} app IDs")
+        
+        with self.batch() as batcher:
+            futures = {
+                app_id: batcher.submit("applications", self._build_params(app_id, None))
+                for app_id in app_ids
+            }
+        
+        results = {}
+        for app_id, future in futures.items():
+            try:
+                results[app_id] = self._first_result(future.result(), app_id)
+            except Exception as e:
+                self.logger.error(f"Error retrieving app registration: {str(e)}")
+                results[app_id] = None
+        return results
+    
+    async def get_applications_async(
+        self,
+        app_id: Optional[str] = None,
+        permissions: Optional[List[str]] = None,
+        max_results: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Get app registrations from Microsoft Graph API over the async transport
+        
+        Args:
+            app_id: Filter by application ID
+            permissions: Filter by required permission
+            max_results: Maximum number of results to return
+            
+        Yields:
+            Dict[str, Any]: Application objects
+        """
+        self.logger.info("Retrieving app registrations")
+        
+        params = self._build_params(app_id, max_results)
+        
+        count = 0
+        async for app in self.get_paginated_async(
+            "applications",
+            params,
+            prefetch=self.settings.page_prefetch,
+            stream=self.settings.stream_pages,
+        ):
+            if permissions and not self._has_permissions(app, permissions):
+                continue
+                
+            if max_results and count >= max_results:
+                break
+                
+            yield app
+            count += 1
+        
+        self.logger.info(f"Retrieved {count} app registrations")
+    
+    def _build_params(self, app_id: Optional[str], max_results: Optional[int]) -> Dict[str, str]:
+        """
+        Build query parameters for an app registrations request
+        
+        Args:
+            app_id: Filter by application ID
+            max_results: Maximum number of results to return
+            
+        Returns:
+            Dict[str, str]: Query parameters
+        """
         # Build filter string
         filter_parts = []
         
@@ -65,20 +216,27 @@ class ApplicationsClient(GraphClient):
         if max_results:
             params["$top"] = str(max_results)
         
-        # Get paginated results
-        count = 0
-        for app in self.get_paginated("applications", params):
-            # Post-filter for permissions if needed
-            if permissions and not self._has_permissions(app, permissions):
-                continue
-                
-            if max_results and count >= max_results:
-                break
-                
-            yield app
-            count += 1
+        return params
+    
+    def _first_result(self, response: Dict[str, Any], app_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Pick the app registration out of a lookup response
         
-        self.logger.info(f"Retrieved {count} app registrations")
+        Args:
+            response: API response
+            app_id: Application ID that was looked up
+            
+        Returns:
+            Optional[Dict[str, Any]]: Application object or None if not found
+        """
+        results = response.get("value", [])
+        
+        if results:
+            self.logger.debug(f"Found app registration for app ID: {app_id}")
+            return results[0]
+        
+        self.logger.warning(f"No app registration found for app ID: {app_id}")
+        return None
     
     def _has_permissions(self, app: Dict[str, Any], permissions: List[str]) -> bool:
         """
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphReporter Batch Client
+Coalesces small GET requests into Microsoft Graph JSON $batch requests
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Tuple
+from urllib.parse import quote, urlencode
+
+from graphreporter.graph.scheduler import RETRYABLE_STATUS_CODES
+
+if TYPE_CHECKING:
+    from graphreporter.graph.client import GraphClient
+
+
+# Graph rejects $batch requests with more than 20 sub-requests
+MAX_BATCH_SIZE = 20
+
+
+class BatchFuture(Future):
+    """
+    Future for a sub-request of a $batch
+
+    Waiting on a result that has not been sent yet flushes the batcher first,
+    so callers can submit many lookups and then read the results in any order
+    """
+
+    def __init__(self, batcher: "GraphBatcher"):
+        """
+        Initialize the future
+
+        Args:
+            batcher: Batcher the sub-request is queued on
+        """
+        super().__init__()
+        self._batcher = batcher
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """
+        Get the sub-request's response body, flushing the batcher if needed
+
+        Args:
+            timeout: Seconds to wait for a result sent from another thread
+
+        Returns:
+            Any: Response body of the sub-request
+        """
+        if not self.done():
+            self._batcher.flush()
+        return super().result(timeout)
+    
+    async def result_async(self) -> Any:
+        """
+        Await the sub-request's response body, flushing the batcher if needed
+        
+        Other tasks get one turn of the event loop to queue their requests
+        first, so lookups awaited together go out in the same $batch
+        
+        Returns:
+            Any: Response body of the sub-request
+        """
+        if not self.done():
+            await asyncio.sleep(0)
+            if not self.done():
+                await self._batcher.flush_async()
+        return await asyncio.wrap_future(self)
+
+
+class GraphBatcher:
+    """
+    Batcher for Microsoft Graph API GET requests
+
+    Queued requests are sent as $batch requests of up to 20 sub-requests.
+    Throttled sub-requests are reported to the shared scheduler and resent
+    once its pause has expired.
+    """
+
+    def __init__(self, client: "GraphClient", max_batch_size: int = MAX_BATCH_SIZE):
+        """
+        Initialize the batcher
+
+        Args:
+            client: Graph client used to send the $batch requests
+            max_batch_size: Maximum number of sub-requests per $batch
+        """
+        self.client = client
+        self.max_batch_size = min(max_batch_size, MAX_BATCH_SIZE)
+        self.logger = logging.getLogger(__name__)
+
+        self._pending: List[Tuple[str, BatchFuture]] = []
+        self._lock = threading.Lock()
+
+        self.logger.debug("GraphBatcher initialized")
+
+    def __enter__(self) -> "GraphBatcher":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.flush()
+
+    def submit(self, path: str, params: Optional[Dict[str, Any]] = None) -> BatchFuture:
+        """
+        Queue a GET request
+
+        Nothing is sent until the batcher is flushed, either explicitly, on
+        leaving its context, or by waiting on one of its futures
+
+        Args:
+            path: API path relative to graph endpoint
+            params: Query parameters
+
+        Returns:
+            BatchFuture: Future resolving to the response body
+        """
+        url = "/" + path.lstrip("/")
+        if params:
+            url += "?" + urlencode(params, quote_via=quote, safe="$'(),")
+
+        future = BatchFuture(self)
+        with self._lock:
+            self._pending.append((url, future))
+        return future
+
+    def flush(self) -> None:
+        """Send every queued request"""
+        for batch in self._take_batches():
+            self._send(batch)
+
+    async def flush_async(self) -> None:
+        """Send every queued request, with the batches in flight concurrently"""
+        await asyncio.gather(*(self._send_async(batch) for batch in self._take_batches()))
+
+    def _take_batches(self) -> List[List[Tuple[str, BatchFuture]]]:
+        """
+        Take the queued requests, split into batches
+
+        Returns:
+            List[List[Tuple[str, BatchFuture]]]: Batches of (url, future) pairs
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return [pending[i:i + self.max_batch_size] for i in range(0, len(pending), self.max_batch_size)]
+
+    def _send(self, batch: List[Tuple[str, BatchFuture]]) -> None:
+        """
+        Send a batch, retrying throttled sub-requests
+
+        Args:
+            batch: (url, future) pairs
+        """
+        for attempt in range(self.client.settings.max_retries + 1):
+            try:
+                response = self.client.post("$batch", self._build_body(batch))
+            except Exception as e:
+                self._fail(batch, e)
+                return
+
+            batch = self._resolve(batch, response, attempt)
+            if not batch:
+                return
+
+        self._fail(batch, ValueError("Graph API request failed: sub-request still throttled after retries"))
+
+    async def _send_async(self, batch: List[Tuple[str, BatchFuture]]) -> None:
+        """
+        Send a batch over the async transport, retrying throttled sub-requests
+
+        Args:
+            batch: (url, future) pairs
+        """
+        for attempt in range(self.client.settings.max_retries + 1):
+            try:
+                response = await self.client.post_async("$batch", self._build_body(batch))
+            except Exception as e:
+                self._fail(batch, e)
+                return
+
+            batch = self._resolve(batch, response, attempt)
+            if not batch:
+                return
+
+        self._fail(batch, ValueError("Graph API request failed: sub-request still throttled after retries"))
+
+    def _build_body(self, batch: List[Tuple[str, BatchFuture]]) -> Dict[str, Any]:
+        """
+        Build a $batch request body
+
+        Args:
+            batch: (url, future) pairs
+
+        Returns:
+            Dict[str, Any]: JSON request body
+        """
+        return {
+            "requests": [
+                {"id": str(i), "method": "GET", "url": url}
+                for i, (url, _) in enumerate(batch)
+            ]
+        }
+
+    def _resolve(
+        self,
+        batch: List[Tuple[str, BatchFuture]],
+        response: Dict[str, Any],
+        attempt: int,
+    ) -> List[Tuple[str, BatchFuture]]:
+        """
+        Resolve futures from a $batch response
+
+        Args:
+            batch: (url, future) pairs that were sent
+            response: $batch response body
+            attempt: Zero-based retry attempt of the batch
+
+        Returns:
+            List[Tuple[str, BatchFuture]]: Throttled pairs to send again
+        """
+        responses = {item.get("id"): item for item in response.get("responses", [])}
+        retry = []
+        throttle_headers: Optional[Dict[str, str]] = None
+        throttle_status: Optional[int] = None
+
+        for i, (url, future) in enumerate(batch):
+            item = responses.get(str(i))
+            if item is None:
+                future.set_exception(ValueError(f"Graph API request failed: no response for {url}"))
+                continue
+
+            status = item.get("status", 500)
+            if status in RETRYABLE_STATUS_CODES:
+                throttle_headers = {key.title(): value for key, value in (item.get("headers") or {}).items()}
+                # A 429 of any sub-request makes the batch count as rate limited
+                if throttle_status != 429:
+                    throttle_status = status
+                retry.append((url, future))
+            elif 200 <= status < 300:
+                future.set_result(item.get("body"))
+            else:
+                future.set_exception(ValueError(f"Graph API request failed: {item.get('body')}"))
+
+        if retry:
+            # Back off once per batch rather than once per throttled sub-request
+            self.client.scheduler.record_throttle(throttle_headers, attempt, throttle_status)
+            self.logger.debug(f"Retrying {len(retry)} throttled sub-requests")
+        return retry
+
+    def _fail(self, batch: List[Tuple[str, BatchFuture]], error: Exception) -> None:
+        """
+        Fail every future of a batch
+
+        Args:
+            batch: (url, future) pairs
+            error: Exception to set
+        """
+        self.logger.error(f"Batch request failed: {str(error)}")
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
@@ -5,30 +5,53 @@ GraphReporter Graph Client
 Base client for interacting with Microsoft Graph API
 """
 
+import asyncio
 import logging
-import time
-from typing import Dict, List, Optional, Any, Union, Iterator
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Any, Union, Iterator, AsyncIterator, Iterable, Tuple
 
+import httpx
 import requests
 from requests.exceptions import RequestException
 
-from graphreporter.auth.client import AuthClient
-from graphreporter.config.settings import get_settings
+from graphreporter.graph.context import GraphContext, get_context
+from graphreporter.graph.streaming import STREAM_CHUNK_SIZE, PageDecoder, loads
+from graphreporter.utils.helpers import iterate_in_thread
+
+if TYPE_CHECKING:
+    from graphreporter.graph.batch import BatchFuture, GraphBatcher
 
 
 class GraphClient:
     """
     Base client for Microsoft Graph API
     
-    Handles common operations like requests, pagination, and error handling
+    Handles common operations like requests, pagination, and error handling.
+    The blocking methods use a requests session, the *_async methods use a
+    connection-pooled asyncio transport and are the fast path for bulk exports.
+    
+    Settings, credential, session, transport and scheduler come from a
+    GraphContext, which by default is the process-wide one, so clients of the
+    same job share connections and tokens.
     """
     
-    def __init__(self):
-        """Initialize the Graph client"""
-        self.settings = get_settings()
-        self.auth_client = AuthClient()
+    def __init__(self, context: Optional[GraphContext] = None):
+        """
+        Initialize the Graph client
+        
+        Args:
+            context: Context to share resources through, the process-wide
+                context if omitted
+        """
+        self.context = context or get_context()
+        self.settings = self.context.settings
+        self.auth_client = self.context.auth_client
         self.logger = logging.getLogger(__name__)
-        self.session = requests.Session()
+        self.session = self.context.session
+        self.scheduler = self.context.scheduler
+        self.transport = self.context.transport
+        self._batcher: Optional["GraphBatcher"] = None
+        self._batcher_lock = threading.Lock()
         
         self.logger.debug("GraphClient initialized")
     
@@ -46,40 +69,233 @@ class GraphClient:
         Raises:
             ValueError: If API request fails
         """
-        url = f"{self.settings.graph_endpoint}/{path.lstrip('/')}"
-        headers = self.auth_client.get_auth_header()
+        return self._request(self._build_url(path), params)
+    
+    def get_paginated(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        prefetch: int = 0,
+        stream: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Get paginated results from Microsoft Graph API
         
-        self.logger.debug(f"Making GET request to {url}")
+        Yields individual items from the 'value' array in the response,
+        automatically handling pagination via @odata.nextLink
         
-        try:
-            response = self.session.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            return response.json()
-        except RequestException as e:
-            self.logger.error(f"Request to {url} failed: {str(e)}")
-            
-            # Handle rate limiting
-            if response.status_code == 429:
-                self._handle_rate_limiting(response)
-                # Retry the request recursively (with care for stack depth)
-                return self.get(path, params)
-            
-            # Handle authentication errors
-            if response.status_code == 401:
-                self.logger.error("Authentication failed, token might be expired or invalid")
-            
-            # Try to get response content for better error messages
-            error_details = "Unknown error"
+        Args:
+            path: API path relative to graph endpoint
+            params: Query parameters
+            prefetch: Number of pages to fetch ahead on a background thread
+                while the current page is consumed, 0 to fetch on demand
+            stream: Whether to decode each page incrementally as it arrives
+                instead of loading it whole, takes precedence over prefetch
+            
+        Yields:
+            Dict[str, Any]: Individual items from the response
+        """
+        if stream:
+            yield from self.iter_items_streamed(path, params)
+            return
+        
+        if prefetch > 0:
+            def produce(put: Callable[[Dict[str, Any]], bool]) -> None:
+                for page in self.iter_pages(path, params):
+                    if not put(page):
+                        break
+            
+            pages = iterate_in_thread(produce, prefetch)
+        else:
+            pages = self.iter_pages(path, params)
+        
+        for page in pages:
+            # Extract items from the response
+            yield from page.get("value", [])
+    
+    def iter_pages(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        next_link: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Get the raw response pages of a paginated request
+        
+        Args:
+            path: API path relative to graph endpoint
+            params: Query parameters
+            next_link: nextLink of an interrupted run to continue from,
+                instead of requesting the first page
+            
+        Yields:
+            Dict[str, Any]: API response of each page
+        """
+        if next_link:
+            # The nextLink carries the query, so path and params are not needed
+            self.logger.debug(f"Resuming from next link: {next_link}")
+            response = self._request(next_link)
+        else:
+            # First request uses the provided path and params
+            response = self.get(path, params or {})
+        
+        while True:
+            yield response
+            
+            # Get the next link for pagination
+            next_link = response.get("@odata.nextLink")
+            if not next_link:
+                break
+            
+            # Subsequent requests use the nextLink directly
+            self.logger.debug(f"Following next link: {next_link}")
+            response = self._request(next_link)
+    
+    def iter_items_streamed(
+        self, path: str, params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Get the items of a paginated request, decoding each page as it streams in
+        
+        Items are yielded while the rest of the page is still downloading, and
+        only one item at a time is held in memory rather than a whole page
+        
+        Args:
+            path: API path relative to graph endpoint
+            params: Query parameters
+            
+        Yields:
+            Dict[str, Any]: Individual items from the response
+            
+        Raises:
+            ValueError: If API request fails or a page is not valid JSON
+        """
+        url, page_params = self._build_url(path), params or {}
+        
+        while url:
+            response = self._send(url, page_params, stream=True)
+            decoder = PageDecoder()
             try:
-                error_details = response.json()
-            except ValueError:
-                error_details = response.text
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    yield from decoder.feed(chunk)
+                yield from decoder.close()
+            finally:
+                response.close()
             
-            raise ValueError(f"Graph API request failed: {error_details}")
+            # The nextLink carries the query, so later pages take no params
+            url, page_params = decoder.metadata.get("@odata.nextLink"), None
+            if url:
+                self.logger.debug(f"Following next link: {url}")
     
-    def get_paginated(self, path: str, params: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    def post(self, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Get paginated results from Microsoft Graph API
+        Make a POST request to Microsoft Graph API
+        
+        Args:
+            path: API path relative to graph endpoint
+            body: JSON request body
+            
+        Returns:
+            Dict[str, Any]: API response as a dictionary
+            
+        Raises:
+            ValueError: If API request fails
+        """
+        return self._request(self._build_url(path), method="POST", json=body)
+    
+    def batch(self) -> "GraphBatcher":
+        """
+        Create a batcher that coalesces GET requests into $batch requests
+        
+        Returns:
+            GraphBatcher: Batcher bound to this client
+        """
+        from graphreporter.graph.batch import GraphBatcher
+        
+        return GraphBatcher(self)
+    
+    def submit(self, path: str, params: Optional[Dict[str, Any]] = None) -> "BatchFuture":
+        """
+        Queue a GET request on the client's shared batcher
+        
+        Lookups queued from several threads or tasks before one of them waits
+        on its result go out together in one $batch request
+        
+        Args:
+            path: API path relative to graph endpoint
+            params: Query parameters
+            
+        Returns:
+            BatchFuture: Future resolving to the response body, see
+            BatchFuture.result and BatchFuture.result_async
+        """
+        with self._batcher_lock:
+            if self._batcher is None:
+                self._batcher = self.batch()
+        return self._batcher.submit(path, params)
+    
+    def get_many(self, queries: Iterable[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """
+        Make several GET requests concurrently from synchronous code
+        
+        Thin wrapper that runs get_many_async in a private event loop, so it
+        must not be called from inside a running loop
+        
+        Args:
+            queries: Iterable of (path, params) tuples
+            
+        Returns:
+            List[Dict[str, Any]]: API responses in request order
+        """
+        async def _run() -> List[Dict[str, Any]]:
+            try:
+                return await self.get_many_async(queries)
+            finally:
+                await self.transport.aclose()
+        
+        return asyncio.run(_run())
+    
+    async def get_async(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Make an asynchronous GET request to Microsoft Graph API
+        
+        Args:
+            path: API path relative to graph endpoint
+            params: Query parameters
+            
+        Returns:
+            Dict[str, Any]: API response as a dictionary
+            
+        Raises:
+            ValueError: If API request fails
+        """
+        return await self._request_async(self._build_url(path), params)
+    
+    async def post_async(self, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Make an asynchronous POST request to Microsoft Graph API
+        
+        Args:
+            path: API path relative to graph endpoint
+            body: JSON request body
+            
+        Returns:
+            Dict[str, Any]: API response as a dictionary
+            
+        Raises:
+            ValueError: If API request fails
+        """
+        return await self._request_async(self._build_url(path), method="POST", json=body)
+    
+    async def get_paginated_async(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        prefetch: int = 0,
+        stream: bool = False,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Get paginated results from Microsoft Graph API asynchronously
         
         Yields individual items from the 'value' array in the response,
         automatically handling pagination via @odata.nextLink
@@ -87,41 +303,358 @@ class GraphClient:
         Args:
             path: API path relative to graph endpoint
             params: Query parameters
+            prefetch: Number of pages to fetch ahead in a background task
+                while the current page is consumed, 0 to fetch on demand
+            stream: Whether to decode each page incrementally as it arrives
+                instead of loading it whole, takes precedence over prefetch
             
         Yields:
             Dict[str, Any]: Individual items from the response
         """
-        if params is None:
-            params = {}
+        if stream:
+            async for item in self.iter_items_streamed_async(path, params):
+                yield item
+            return
         
-        next_link = None
-        first_request = True
+        pages = self.iter_pages_async(path, params)
+        if prefetch > 0:
+            pages = self._prefetch_async(pages, prefetch)
         
-        while first_request or next_link:
-            if first_request:
-                # First request uses the provided path and params
-                response = self.get(path, params)
-                first_request = False
-            else:
-                # Subsequent requests use the nextLink directly
-                self.logger.debug(f"Following next link: {next_link}")
-                response = self.session.get(next_link, headers=self.auth_client.get_auth_header()).json()
-            
-            # Extract items from the response
-            items = response.get("value", [])
-            for item in items:
+        async for page in pages:
+            for item in page.get("value", []):
                 yield item
+    
+    async def iter_pages_async(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        next_link: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Get the raw response pages of a paginated request asynchronously
+        
+        Args:
+            path: API path relative to graph endpoint
+            params: Query parameters
+            next_link: nextLink of an interrupted run to continue from,
+                instead of requesting the first page
+            
+        Yields:
+            Dict[str, Any]: API response of each page
+        """
+        if next_link:
+            self.logger.debug(f"Resuming from next link: {next_link}")
+            response = await self._request_async(next_link)
+        else:
+            response = await self.get_async(path, params or {})
+        
+        while True:
+            yield response
             
-            # Get the next link for pagination
             next_link = response.get("@odata.nextLink")
+            if not next_link:
+                break
+            
+            self.logger.debug(f"Following next link: {next_link}")
+            response = await self._request_async(next_link)
     
-    def _handle_rate_limiting(self, response: requests.Response) -> None:
+    async def iter_items_streamed_async(
+        self, path: str, params: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Handle rate limiting by Microsoft Graph API
+        Get the items of a paginated request asynchronously, decoding each page
+        as it streams in
         
         Args:
-            response: Response with rate limiting headers
+            path: API path relative to graph endpoint
+            params: Query parameters
+            
+        Yields:
+            Dict[str, Any]: Individual items from the response
+            
+        Raises:
+            ValueError: If API request fails or a page is not valid JSON
+        """
+        url, page_params = self._build_url(path), params or {}
+        
+        while url:
+            response = await self._send_async(url, page_params, stream=True)
+            decoder = PageDecoder()
+            try:
+                async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                    for item in decoder.feed(chunk):
+                        yield item
+                for item in decoder.close():
+                    yield item
+            finally:
+                await response.aclose()
+            
+            url, page_params = decoder.metadata.get("@odata.nextLink"), None
+            if url:
+                self.logger.debug(f"Following next link: {url}")
+    
+    async def get_many_async(
+        self, queries: Iterable[Tuple[str, Optional[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Make several GET requests concurrently
+        
+        Concurrency is bounded by the transport's connection pool and
+        concurrency limit
+        
+        Args:
+            queries: Iterable of (path, params) tuples
+            
+        Returns:
+            List[Dict[str, Any]]: API responses in request order
+        """
+        return list(await asyncio.gather(*(self.get_async(path, params) for path, params in queries)))
+    
+    def close(self) -> None:
+        """Close the blocking session of the client's context, shared with other clients"""
+        self.context.close()
+    
+    async def aclose(self) -> None:
+        """Close the connections and credential of the client's context, shared with other clients"""
+        await self.context.aclose()
+    
+    async def _prefetch_async(
+        self, pages: AsyncIterator[Dict[str, Any]], prefetch: int
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        retry_after = int(response.headers.get("Retry-After", 1))
-        self.logger.warning(f"Rate limited by Microsoft Graph API. Waiting {retry_after} seconds.")
-        time.sleep(retry_after) 
\ No newline at end of file
+        Fetch pages ahead of the consumer in a background task
+        
+        At most prefetch pages are queued ahead of the page being consumed
+        
+        Args:
+            pages: Async iterator of response pages
+            prefetch: Maximum number of queued pages
+            
+        Yields:
+            Dict[str, Any]: API response of each page
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=prefetch)
+        done = object()
+        
+        async def fetch() -> None:
+            try:
+                async for page in pages:
+                    await queue.put(page)
+                await queue.put(done)
+            except Exception as e:
+                await queue.put(e)
+        
+        task = asyncio.ensure_future(fetch())
+        try:
+            while True:
+                page = await queue.get()
+                if page is done:
+                    break
+                if isinstance(page, Exception):
+                    raise page
+                yield page
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    
+    def _build_url(self, path: str) -> str:
+        """
+        Build an absolute URL for an API path
+        
+        Args:
+            path: API path relative to graph endpoint, or an absolute URL
+                such as a nextLink or deltaLink, which is returned unchanged
+            
+        Returns:
+            str: Absolute URL
+        """
+        if path.startswith(("https://", "http://")):
+            return path
+        return f"{self.settings.graph_endpoint}/{path.lstrip('/')}"
+    
+    def _request(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        method: str = "GET",
+        json: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """
+        Make a request to an absolute URL and decode the response
+        
+        Args:
+            url: Absolute request URL
+            params: Query parameters
+            method: HTTP method
+            json: JSON request body
+            
+        Returns:
+            Dict[str, Any]: API response as a dictionary
+            
+        Raises:
+            ValueError: If API request fails
+        """
+        return loads(self._send(url, params, method, json).content)
+    
+    def _send(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        method: str = "GET",
+        json: Optional[Any] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        Send a request to an absolute URL, paced by the shared scheduler
+        
+        Throttled requests are retried in a loop once the scheduler's pause
+        has expired, up to the configured number of retries
+        
+        Args:
+            url: Absolute request URL
+            params: Query parameters
+            method: HTTP method
+            json: JSON request body
+            stream: Whether to leave the response body unread
+            
+        Returns:
+            requests.Response: Successful response
+            
+        Raises:
+            ValueError: If API request fails
+        """
+        self.logger.debug(f"Making {method} request to {url}")
+        
+        for attempt in range(self.settings.max_retries + 1):
+            headers = self.auth_client.get_auth_header()
+            self.scheduler.acquire()
+            try:
+                response = self.session.request(
+                    method, url, headers=headers, params=params, json=json, stream=stream
+                )
+            except RequestException as e:
+                self.scheduler.release()
+                self.logger.error(f"Request to {url} failed: {str(e)}")
+                raise ValueError(f"Graph API request failed: {str(e)}")
+            
+            retry_after = self.scheduler.release(response.status_code, response.headers, attempt)
+            if retry_after is None or attempt == self.settings.max_retries:
+                break
+            response.close()
+        
+        if response.ok:
+            return response
+        
+        self._raise_for_response(url, response)
+    
+    async def _get_auth_header_async(self) -> Dict[str, str]:
+        """
+        Get an authorization header without blocking the event loop
+        
+        Returns:
+            Dict[str, str]: Authorization header
+        """
+        return await self.auth_client.get_auth_header_async()
+    
+    async def _request_async(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        method: str = "GET",
+        json: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """
+        Make an asynchronous request to an absolute URL and decode the response
+        
+        Args:
+            url: Absolute request URL
+            params: Query parameters
+            method: HTTP method
+            json: JSON request body
+            
+        Returns:
+            Dict[str, Any]: API response as a dictionary
+            
+        Raises:
+            ValueError: If API request fails
+        """
+        response = await self._send_async(url, params, method, json)
+        return loads(response.content)
+    
+    async def _send_async(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        method: str = "GET",
+        json: Optional[Any] = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """
+        Send an asynchronous request to an absolute URL, paced by the shared scheduler
+        
+        Args:
+            url: Absolute request URL
+            params: Query parameters
+            method: HTTP method
+            json: JSON request body
+            stream: Whether to leave the response body unread
+            
+        Returns:
+            httpx.Response: Successful response
+            
+        Raises:
+            ValueError: If API request fails
+        """
+        self.logger.debug(f"Making async {method} request to {url}")
+        
+        for attempt in range(self.settings.max_retries + 1):
+            headers = await self._get_auth_header_async()
+            await self.scheduler.acquire_async()
+            try:
+                response = await self.transport.request(
+                    method, url, params=params, headers=headers, json=json, stream=stream
+                )
+            except httpx.HTTPError as e:
+                self.scheduler.release()
+                self.logger.error(f"Request to {url} failed: {str(e)}")
+                raise ValueError(f"Graph API request failed: {str(e)}")
+            
+            retry_after = self.scheduler.release(response.status_code, response.headers, attempt)
+            if retry_after is None or attempt == self.settings.max_retries:
+                break
+            # Only a response that is retried is discarded, the last one
+            # still has to be read for its error details
+            await response.aclose()
+        
+        if response.is_success:
+            return response
+        
+        if stream:
+            await response.aread()
+        self._raise_for_response(url, response)
+    
+    def _raise_for_response(self, url: str, response: Union[requests.Response, httpx.Response]) -> None:
+        """
+        Log a failed response and raise an error with its details
+        
+        Args:
+            url: Request URL
+            response: Failed response
+            
+        Raises:
+            ValueError: Always
+        """
+        self.logger.error(f"Request to {url} failed with status {response.status_code}")
+        
+        # Handle authentication errors
+        if response.status_code == 401:
+            self.logger.error("Authentication failed, token might be expired or invalid")
+        
+        # Try to get response content for better error messages
+        error_details = "Unknown error"
+        try:
+            error_details = response.json()
+        except ValueError:
+            error_details = response.text
+        
+        raise ValueError(f"Graph API request failed: {error_details}")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphReporter Graph Context
+Connections, credential and scheduler shared by Graph clients
+"""
+
+import logging
+import threading
+from typing import Any, Optional
+
+import requests
+
+from graphreporter.auth.client import AuthClient
+from graphreporter.config.settings import Settings, get_settings
+from graphreporter.graph.scheduler import RequestScheduler, get_scheduler
+from graphreporter.graph.transport import AsyncTransport
+
+
+class GraphContext:
+    """
+    Resources shared by the Graph clients of a job
+
+    Holds one settings object, one credential and token cache, one blocking
+    session, one async connection pool and the request scheduler, so clients
+    created on the same context reuse warm connections and tokens instead of
+    opening their own.
+
+    Closing the context closes its connections and credential. It can be used
+    as a context manager, synchronously or asynchronously.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        """
+        Initialize the context
+
+        Args:
+            settings: Application settings, loaded from the environment if omitted
+        """
+        self.settings = settings or get_settings()
+        self.logger = logging.getLogger(__name__)
+        self.auth_client = AuthClient(self.settings)
+        self.session = requests.Session()
+        self.scheduler: RequestScheduler = get_scheduler(self.settings)
+        self.transport = AsyncTransport(
+            max_connections=self.settings.max_connections,
+            max_concurrency=self.settings.max_concurrency,
+            timeout=self.settings.request_timeout,
+        )
+        self.closed = False
+
+        self.logger.debug("GraphContext initialized")
+
+    def __enter__(self) -> "GraphContext":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "GraphContext":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def close(self) -> None:
+        """
+        Close the blocking session
+
+        The async transport and credential are bound to an event loop, so use
+        aclose from async code to release them as well
+        """
+        self.session.close()
+        self.closed = True
+        self.logger.debug("GraphContext closed")
+
+    async def aclose(self) -> None:
+        """Close the blocking session, the async transport and the credential"""
+        self.close()
+        await self.transport.aclose()
+        await self.auth_client.close()
+
+
+_context: Optional[GraphContext] = None
+_context_lock = threading.Lock()
+
+
+def get_context() -> GraphContext:
+    """
+    Get the process-wide Graph context
+
+    A new context is created on first use and after the previous one was closed
+
+    Returns:
+        GraphContext: Shared context
+    """
+    global _context
+    with _context_lock:
+        if _context is None or _context.closed:
+            _context = GraphContext()
+        return _context
+
+
+def close_context() -> None:
+    """Close the process-wide Graph context, if one was created"""
+    global _context
+    with _context_lock:
+        context, _context = _context, None
+    if context is not None:
+        context.close()
+
+
+async def aclose_context() -> None:
+    """Close the process-wide Graph context and its async resources, if one was created"""
+    global _context
+    with _context_lock:
+        context, _context = _context, None
+    if context is not None:
+        await context.aclose()
@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphReporter OData Filters
+Evaluates Graph $filter expressions locally, over records or DataFrames
+"""
+
+import operator
+import re
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from graphreporter.sync.checkpoint import parse_timestamp
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Comparison operators and the functions taking a property and a string
+COMPARISONS: Dict[str, Callable[[Any, Any], Any]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "lt": operator.lt,
+    "le": operator.le,
+}
+FUNCTIONS = ("startswith", "endswith", "contains")
+
+_TOKEN = re.compile(
+    r"\s*(?:"
+    r"(?P<string>'(?:[^']|'')*')"
+    r"|(?P<datetime>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:\d{2})?)"
+    r"|(?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)"
+    r"|(?P<name>[A-Za-z_][\w]*(?:/[A-Za-z_][\w]*)*)"
+    r"|(?P<punct>[(),])"
+    r")"
+)
+
+# Value of a filter node for a DataFrame column, looked up by property path
+ColumnLookup = Callable[[str], "pd.Series"]
+
+
+class ODataFilter:
+    """
+    Compiled OData $filter expression
+
+    Supports the subset the clients send to Graph: eq, ne, gt, ge, lt and
+    le comparisons, in lists, startswith, endswith and contains, combined
+    with and, or, not and parentheses. Property paths use / as in OData,
+    e.g. status/errorCode. As in Graph, string comparisons ignore case, a
+    missing property is null, and datetime literals are compared in UTC.
+    """
+
+    def __init__(self, expression: str):
+        """
+        Parse an expression
+
+        Args:
+            expression: $filter text, e.g. "appId eq '00000003-...' and
+                createdDateTime ge 2024-01-01T00:00:00Z"
+
+        Raises:
+            ValueError: If the expression is malformed or uses an
+                unsupported operator or function
+        """
+        self.expression = expression
+        self._tokens = _tokenize(expression)
+        self._position = 0
+        self._root = self._parse_or()
+        if self._position < len(self._tokens):
+            raise ValueError(f"Unexpected '{self._tokens[self._position][1]}' in filter: {expression}")
+
+        self.paths: List[str] = sorted(self._root.paths())
+
+    @property
+    def properties(self) -> List[str]:
+        """Top-level properties the expression reads, for $select"""
+        return sorted({path.split("/")[0] for path in self.paths})
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        """
+        Evaluate the expression for one record
+
+        Args:
+            record: Nested Graph object, or a flat record keyed by dotted path
+
+        Returns:
+            bool: True if the record satisfies the filter
+        """
+        return self._root.matches(record)
+
+    def filter(self, records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the records satisfying the expression
+
+        Args:
+            records: Nested Graph objects
+
+        Yields:
+            Dict[str, Any]: Matching records
+        """
+        return (record for record in records if self._root.matches(record))
+
+    def mask(self, df: "pd.DataFrame", columns: Optional[Mapping[str, str]] = None) -> "pd.Series":
+        """
+        Evaluate the expression for every row of a DataFrame at once
+
+        A property path is looked up as a column named by its dotted path,
+        then as a flat column of the columns mapping, then inside nested
+        objects of its top-level column. Exported files can therefore be
+        filtered with the same text as a Graph query.
+
+        Args:
+            df: DataFrame of nested Graph objects or of flat columns
+            columns: Flat column -> dotted path of exported files, e.g.
+                SIGNIN_COLUMNS
+
+        Returns:
+            pd.Series: Boolean mask aligned with the frame
+        """
+        flat = {path: column for column, path in (columns or {}).items()}
+        cache: Dict[str, "pd.Series"] = {}
+
+        def lookup(path: str) -> "pd.Series":
+            if path not in cache:
+                cache[path] = _column(df, path.replace("/", "."), flat)
+            return cache[path]
+
+        return self._root.mask(lookup).reindex(df.index, fill_value=False).astype(bool)
+
+    def __repr__(self) -> str:
+        return f"ODataFilter({self.expression!r})"
+
+    def _peek(self) -> Tuple[str, Any]:
+        """Get the next token without consuming it"""
+        if self._position < len(self._tokens):
+            return self._tokens[self._position]
+        return ("end", None)
+
+    def _next(self) -> Tuple[str, Any]:
+        """Consume the next token"""
+        token = self._peek()
+        if token[0] == "end":
+            raise ValueError(f"Unexpected end of filter: {self.expression}")
+        self._position += 1
+        return token
+
+    def _accept(self, keyword: str) -> bool:
+        """Consume the next token if it is the given keyword or punctuation"""
+        kind, value = self._peek()
+        if kind in ("name", "punct") and str(value).lower() == keyword:
+            self._position += 1
+            return True
+        return False
+
+    def _expect(self, keyword: str) -> None:
+        """Consume a required keyword or punctuation"""
+        if not self._accept(keyword):
+            raise ValueError(f"Expected '{keyword}' in filter: {self.expression}")
+
+    def _parse_or(self) -> "_Node":
+        node = self._parse_and()
+        while self._accept("or"):
+            node = _Or(node, self._parse_and())
+        return node
+
+    def _parse_and(self) -> "_Node":
+        node = self._parse_not()
+        while self._accept("and"):
+            node = _And(node, self._parse_not())
+        return node
+
+    def _parse_not(self) -> "_Node":
+        if self._accept("not"):
+            return _Not(self._parse_not())
+        return self._parse_primary()
+
+    def _parse_primary(self) -> "_Node":
+        if self._accept("("):
+            node = self._parse_or()
+            self._expect(")")
+            return node
+
+        kind, name = self._next()
+        if kind != "name":
+            raise ValueError(f"Expected a property in filter: {self.expression}")
+
+        if self._accept("("):
+            if name.lower() not in FUNCTIONS:
+                raise ValueError(f"Unsupported filter function: {name}")
+            path = self._parse_path()
+            self._expect(",")
+            value = self._parse_literal()
+            self._expect(")")
+            if not isinstance(value, str):
+                raise ValueError(f"{name} needs a string argument in filter: {self.expression}")
+            return _Function(name.lower(), path, value)
+
+        kind, op = self._next()
+        op = str(op).lower()
+        if op == "in":
+            self._expect("(")
+            values = [self._parse_literal()]
+            while self._accept(","):
+                values.append(self._parse_literal())
+            self._expect(")")
+            return _In(name, values)
+        if kind != "name" or op not in COMPARISONS:
+            raise ValueError(f"Unsupported filter operator: {op}")
+        return _Compare(name, op, self._parse_literal())
+
+    def _parse_path(self) -> str:
+        kind, path = self._next()
+        if kind != "name":
+            raise ValueError(f"Expected a property in filter: {self.expression}")
+        return path
+
+    def _parse_literal(self) -> Any:
+        kind, value = self._next()
+        if kind == "name":
+            keyword = value.lower()
+            if keyword in ("true", "false"):
+                return keyword == "true"
+            if keyword == "null":
+                return None
+            raise ValueError(f"Expected a value instead of '{value}' in filter: {self.expression}")
+        if kind == "punct":
+            raise ValueError(f"Expected a value instead of '{value}' in filter: {self.expression}")
+        return value
+
+
+def _tokenize(expression: str) -> List[Tuple[str, Any]]:
+    """
+    Split an expression into typed tokens
+
+    Args:
+        expression: $filter text
+
+    Returns:
+        List[Tuple[str, Any]]: Kind and value of each token, literals decoded
+
+    Raises:
+        ValueError: If the expression contains an unknown character
+    """
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Invalid filter near '{expression[position:]}'")
+        position = match.end()
+
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == "string":
+            tokens.append((kind, text[1:-1].replace("''", "'")))
+        elif kind == "datetime":
+            tokens.append((kind, parse_timestamp(text)))
+        elif kind == "number":
+            number = float(text)
+            tokens.append((kind, int(number) if number.is_integer() and "." not in text else number))
+        else:
+            tokens.append((kind, text))
+    return tokens
+
+
+def _column(df: "pd.DataFrame", dotted: str, flat: Dict[str, str]) -> "pd.Series":
+    """
+    Get the values of a property path for every row of a DataFrame
+
+    Args:
+        df: DataFrame of nested Graph objects or of flat columns
+        dotted: Property path with . separators
+        flat: Dotted path -> flat column
+
+    Returns:
+        pd.Series: Value per row, None where the path is missing
+    """
+    import pandas as pd
+
+    if dotted in df.columns:
+        return df[dotted]
+    if flat.get(dotted) in df.columns:
+        return df[flat[dotted]]
+
+    keys = dotted.split(".")
+    if keys[0] not in df.columns:
+        return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+    values = df[keys[0]].tolist()
+    for key in keys[1:]:
+        values = [value.get(key) if isinstance(value, dict) else None for value in values]
+    return pd.Series(values, index=df.index, dtype=object)
+
+
+def _lookup(record: Dict[str, Any], path: str) -> Any:
+    """
+    Get the value of a property path of a record
+
+    Args:
+        record: Nested Graph object, or a flat record keyed by dotted path
+        path: Property path with / separators
+
+    Returns:
+        Any: Value, None if the path is missing
+    """
+    value: Any = record
+    for key in path.split("/"):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    if value is None and "/" in path:
+        return record.get(path.replace("/", "."))
+    return value
+
+
+def _coerce(value: Any, literal: Any) -> Any:
+    """
+    Convert a record value to the type of the literal it is compared with
+
+    Args:
+        value: Value of the record
+        literal: Literal of the expression
+
+    Returns:
+        Any: Comparable value, lowercased for strings; None if the value
+            cannot be converted
+    """
+    if value is None:
+        return None
+    if isinstance(literal, bool):
+        return value if isinstance(value, bool) else None
+    if isinstance(literal, datetime):
+        try:
+            return parse_timestamp(value)
+        except (TypeError, ValueError, AttributeError):
+            return None
+    if isinstance(literal, (int, float)):
+        if isinstance(value, bool):
+            return None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    return str(value).lower()
+
+
+def _series(series: "pd.Series", literal: Any) -> "pd.Series":
+    """
+    Convert a column to the type of the literal it is compared with
+
+    Args:
+        series: Column
+        literal: Literal of the expression, not None
+
+    Returns:
+        pd.Series: Column with missing or unconvertible values as NA
+    """
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(literal, bool):
+        if pd.api.types.is_bool_dtype(series.dtype):
+            return series.astype("boolean")
+        return series.map(lambda value: value if isinstance(value, (bool, np.bool_)) else None).astype("boolean")
+    if isinstance(literal, datetime):
+        return pd.to_datetime(series, utc=True, errors="coerce")
+    if isinstance(literal, (int, float)):
+        return pd.to_numeric(series, errors="coerce")
+    return series.astype("string").str.lower()
+
+
+def _literal(value: Any, kind: Any = None, frame: bool = False) -> Any:
+    """
+    Convert a literal for comparison with converted values
+
+    Args:
+        value: Literal of the expression
+        kind: Literal that decided the type of the values, defaults to value
+        frame: Whether the values are a column from _series rather than
+            record values from _coerce
+
+    Returns:
+        Any: Comparable literal
+    """
+    kind = value if kind is None else kind
+    if isinstance(value, datetime):
+        if frame:
+            import pandas as pd
+
+            return pd.Timestamp(value, tz="UTC")
+        return value
+    if isinstance(value, str):
+        return value.lower()
+    if isinstance(kind, (int, float)) and not isinstance(kind, bool) and isinstance(value, (int, float)):
+        return float(value)
+    return value
+
+
+class _Node(ABC):
+    """Node of a parsed expression"""
+
+    @abstractmethod
+    def paths(self) -> set:
+        """Property paths the node reads"""
+
+    @abstractmethod
+    def matches(self, record: Dict[str, Any]) -> bool:
+        """Evaluate the node for a record"""
+
+    @abstractmethod
+    def mask(self, lookup: ColumnLookup) -> "pd.Series":
+        """Evaluate the node for every row of a DataFrame, as a boolean mask"""
+
+
+class _Compare(_Node):
+    """Comparison of a property with a literal"""
+
+    def __init__(self, path: str, op: str, literal: Any):
+        if literal is None and op not in ("eq", "ne"):
+            raise ValueError(f"Only eq and ne can compare {path} with null")
+        self.path = path
+        self.op = op
+        self.literal = literal
+        self.compare = COMPARISONS[op]
+
+    def paths(self) -> set:
+        return {self.path}
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        value = _lookup(record, self.path)
+        if self.literal is None:
+            return (value is None) == (self.op == "eq")
+
+        value = _coerce(value, self.literal)
+        if value is None:
+            return self.op == "ne"
+        return bool(self.compare(value, _literal(self.literal)))
+
+    def mask(self, lookup: ColumnLookup) -> "pd.Series":
+        series = lookup(self.path)
+        if self.literal is None:
+            return series.isna() if self.op == "eq" else series.notna()
+
+        import pandas as pd
+
+        values = _series(series, self.literal)
+        result = self.compare(values, _literal(self.literal, frame=True))
+        # Missing values only satisfy ne, as in Graph
+        return pd.Series(result, index=series.index).fillna(False).astype(bool) | (values.isna() & (self.op == "ne"))
+
+
+class _In(_Node):
+    """Membership of a property in a list of literals"""
+
+    def __init__(self, path: str, literals: List[Any]):
+        self.path = path
+        self.literals = literals
+        self.kind = next((literal for literal in literals if literal is not None), None)
+
+    def paths(self) -> set:
+        return {self.path}
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        value = _lookup(record, self.path)
+        if value is None:
+            return None in self.literals
+
+        value = _coerce(value, self.kind)
+        return value is not None and value in {_literal(literal, self.kind) for literal in self.literals}
+
+    def mask(self, lookup: ColumnLookup) -> "pd.Series":
+        import pandas as pd
+
+        series = lookup(self.path)
+        result = series.isna() if None in self.literals else pd.Series(False, index=series.index)
+        if self.kind is None:
+            return result
+
+        values = _series(series, self.kind)
+        wanted = [_literal(literal, self.kind, frame=True) for literal in self.literals if literal is not None]
+        return result | values.isin(wanted).fillna(False).astype(bool)
+
+
+class _Function(_Node):
+    """String function of a property and a literal"""
+
+    def __init__(self, name: str, path: str, literal: str):
+        self.name = name
+        self.path = path
+        self.literal = literal.lower()
+
+    def paths(self) -> set:
+        return {self.path}
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        value = _lookup(record, self.path)
+        if value is None:
+            return False
+
+        value = str(value).lower()
+        if self.name == "startswith":
+            return value.startswith(self.literal)
+        if self.name == "endswith":
+            return value.endswith(self.literal)
+        return self.literal in value
+
+    def mask(self, lookup: ColumnLookup) -> "pd.Series":
+        values = lookup(self.path).astype("string").str.lower()
+        if self.name == "startswith":
+            result = values.str.startswith(self.literal)
+        elif self.name == "endswith":
+            result = values.str.endswith(self.literal)
+        else:
+            result = values.str.contains(self.literal, regex=False)
+        return result.fillna(False).astype(bool)
+
+
+class _And(_Node):
+    """Conjunction of two expressions"""
+
+    def __init__(self, left: _Node, right: _Node):
+        self.left = left
+        self.right = right
+
+    def paths(self) -> set:
+        return self.left.paths() | self.right.paths()
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        return self.left.matches(record) and self.right.matches(record)
+
+    def mask(self, lookup: ColumnLookup) -> "pd.Series":
+        return self.left.mask(lookup) & self.right.mask(lookup)
+
+
+class _Or(_And):
+    """Disjunction of two expressions"""
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        return self.left.matches(record) or self.right.matches(record)
+
+    def mask(self, lookup: ColumnLookup) -> "pd.Series":
+        return self.left.mask(lookup) | self.right.mask(lookup)
+
+
+class _Not(_Node):
+    """Negation of an expression"""
+
+    def __init__(self, operand: _Node):
+        self.operand = operand
+
+    def paths(self) -> set:
+        return self.operand.paths()
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        return not self.operand.matches(record)
+
+    def mask(self, lookup: ColumnLookup) -> "pd.Series":
+        return ~self.operand.mask(lookup)
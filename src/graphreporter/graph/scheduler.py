@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphReporter Request Scheduler
+Process-wide, rate-limit-aware pacing of Microsoft Graph API requests
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+from graphreporter.config.settings import Settings
+
+
+# Status codes that Graph documents as transient and safe to retry
+RETRYABLE_STATUS_CODES = (429, 503, 504)
+
+
+class RequestScheduler:
+    """
+    Adaptive token bucket shared by every Graph client in the process
+
+    Requests reserve a token before they are sent, so bursts are paced ahead of
+    time instead of being throttled by Graph. The refill rate and the allowed
+    concurrency grow additively while responses are healthy and are halved when
+    Graph throttles, and a Retry-After pauses every client until it expires.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        max_rate: float = 50.0,
+        min_rate: float = 0.5,
+        burst: int = 10,
+        max_concurrency: int = 4,
+        min_concurrency: int = 1,
+    ):
+        """
+        Initialize the scheduler
+
+        Args:
+            rate: Initial requests per second
+            max_rate: Upper bound for the learned rate
+            min_rate: Lower bound for the learned rate
+            burst: Bucket capacity in requests
+            max_concurrency: Upper bound for requests in flight
+            min_concurrency: Lower bound for requests in flight
+        """
+        self.rate = rate
+        self.max_rate = max(max_rate, rate)
+        self.min_rate = min_rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency = max_concurrency
+        self.logger = logging.getLogger(__name__)
+
+        self.throttled_count = 0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._in_flight = 0
+        self._successes = 0
+        self._lock = threading.Lock()
+        self._slot_available = threading.Condition(self._lock)
+
+        self.logger.debug(f"RequestScheduler initialized at {rate} requests/second")
+
+    def reserve(self) -> float:
+        """
+        Take a token from the bucket
+
+        The bucket may go into debt, which queues later callers behind earlier
+        ones instead of letting them all wake up at the same moment.
+
+        Returns:
+            float: Seconds to wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            wait = max(0.0, self._blocked_until - now)
+            if self._tokens < 1:
+                wait = max(wait, (1 - self._tokens) / self.rate)
+            self._tokens -= 1
+            return wait
+
+    def acquire(self) -> None:
+        """Block until a request may be sent"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+        with self._slot_available:
+            while self._in_flight >= self.concurrency:
+                self._slot_available.wait()
+            self._in_flight += 1
+
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a request may be sent"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        # The counter is shared with threads and other loops, so poll it instead
+        # of binding an asyncio primitive to one loop
+        while True:
+            with self._lock:
+                if self._in_flight < self.concurrency:
+                    self._in_flight += 1
+                    return
+            await asyncio.sleep(0.05)
+
+    def release(
+        self,
+        status_code: Optional[int] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        attempt: int = 0,
+    ) -> Optional[float]:
+        """
+        Release a request slot and learn from the response
+
+        Args:
+            status_code: Response status code, or None if no response arrived
+            headers: Response headers
+            attempt: Zero-based retry attempt of the request
+
+        Returns:
+            Optional[float]: Seconds the caller is paused for if the request
+            should be retried, otherwise None
+        """
+        with self._slot_available:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._slot_available.notify()
+
+        if status_code is None:
+            return None
+
+        headers = headers or {}
+        if status_code in RETRYABLE_STATUS_CODES:
+            return self.record_throttle(headers, attempt, status_code)
+
+        if status_code < 400:
+            self._on_success(headers)
+        return None
+
+    def record_throttle(self, headers: Mapping[str, str], attempt: int = 0, status_code: int = 429) -> float:
+        """
+        Back off after a throttled or unavailable response
+
+        Every retryable response pauses all clients and halves the allowed
+        concurrency, but only a 429 halves the rate: a 503 or 504 reports an
+        overloaded service rather than a request rate above the limit.
+        Also used for throttled sub-requests of a $batch, which do not hold a
+        request slot of their own
+
+        Args:
+            headers: Response headers
+            attempt: Zero-based retry attempt of the request
+            status_code: Status code of the retryable response
+
+        Returns:
+            float: Seconds every client is paused for
+        """
+        retry_after = _parse_retry_after(headers.get("Retry-After"))
+        if retry_after is None:
+            retry_after = min(2.0 ** attempt, 60.0)
+
+        with self._lock:
+            self.throttled_count += 1
+            self._successes = 0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            if status_code == 429:
+                self.rate = max(self.min_rate, self.rate / 2)
+            self.concurrency = max(self.min_concurrency, self.concurrency // 2)
+            self._slot_available.notify_all()
+
+        reason = "Throttled by" if status_code == 429 else f"Status {status_code} from"
+        self.logger.warning(
+            f"{reason} Microsoft Graph API. Pausing {retry_after:.1f} seconds, "
+            f"rate now {self.rate:.2f}/s with concurrency {self.concurrency}."
+        )
+        return retry_after
+
+    def _on_success(self, headers: Mapping[str, str]) -> None:
+        """
+        Speed up after a healthy response, or ease off if Graph reports pressure
+
+        Args:
+            headers: Response headers
+        """
+        limit_percentage = _parse_float(headers.get("x-ms-throttle-limit-percentage"))
+        remaining = _parse_float(headers.get("RateLimit-Remaining"))
+        reset = _parse_float(headers.get("RateLimit-Reset"))
+
+        with self._lock:
+            if limit_percentage is not None and limit_percentage >= 0.8:
+                # Graph sends this header once usage passes 80% of the limit
+                self.rate = max(self.min_rate, self.rate * 0.9)
+                self._successes = 0
+            elif remaining is not None and reset:
+                self.rate = min(self.max_rate, max(self.min_rate, remaining / reset))
+            else:
+                self.rate = min(self.max_rate, self.rate + 0.5)
+                self._successes += 1
+                if self._successes >= 20 and self.concurrency < self.max_concurrency:
+                    self.concurrency += 1
+                    self._successes = 0
+                    self._slot_available.notify()
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given in seconds or as an HTTP date
+
+    Args:
+        value: Header value
+
+    Returns:
+        Optional[float]: Delay in seconds, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_float(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an optional numeric header
+
+    Args:
+        value: Header value
+
+    Returns:
+        Optional[float]: Parsed value, or None if the header is missing or invalid
+    """
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+_scheduler: Optional[RequestScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler(settings: Settings) -> RequestScheduler:
+    """
+    Get the process-wide request scheduler
+
+    The first caller's settings configure the scheduler
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        RequestScheduler: Shared scheduler
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler(
+                rate=settings.requests_per_second,
+                max_concurrency=settings.max_concurrency,
+            )
+        return _scheduler
@@ -7,9 +7,11 @@ Client for retrieving enterprise app (service principal) information from Micros
 
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Iterator
+from typing import Dict, List, Optional, Any, Iterator, AsyncIterator, Iterable
 
 from graphreporter.graph.client import GraphClient
+from graphreporter.graph.context import GraphContext
+from graphreporter.sync.delta import DeltaSync
 
 
 class ServicePrincipalsClient(GraphClient):
@@ -19,9 +21,15 @@ class ServicePrincipalsClient(GraphClient):
     Extends the base GraphClient with service principal-specific functionality
     """
     
-    def __init__(self):
-        """Initialize the service principals client"""
-        super().__init__()
+    def __init__(self, context: Optional[GraphContext] = None):
+        """
+        Initialize the service principals client
+        
+        Args:
+            context: Context to share resources through, the process-wide
+                context if omitted
+        """
+        super().__init__(context)
         self.logger = logging.getLogger(__name__)
         
         self.logger.debug("ServicePrincipalsClient initialized")
@@ -45,6 +53,161 @@ class ServicePrincipalsClient(GraphClient):
         """
         self.logger.info("Retrieving service principals")
         
+        params = self._build_params(app_id, created_after, max_results)
+        
+        # Get paginated results
+        count = 0
+        for sp in self.get_paginated(
+            "servicePrincipals",
+            params,
+            prefetch=self.settings.page_prefetch,
+            stream=self.settings.stream_pages,
+        ):
+            if max_results and count >= max_results:
+                break
+                
+            yield sp
+            count += 1
+        
+        self.logger.info(f"Retrieved {count} service principals")
+    
+    def sync_service_principals(self) -> List[Dict[str, Any]]:
+        """
+        Get every service principal from a local snapshot kept current with
+        /servicePrincipals/delta
+        
+        The first call downloads the whole directory, later calls only fetch
+        the changes since the previous call
+        
+        Returns:
+            List[Dict[str, Any]]: Service principal objects
+        """
+        select = self._build_params(None, None, None)["$select"]
+        return DeltaSync(self, "servicePrincipals", select, self.settings.state_dir).sync()
+    
+    def get_service_principal_by_app_id(self, app_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a specific service principal by application ID
+        
+        Args:
+            app_id: Application ID
+            
+        Returns:
+            Optional[Dict[str, Any]]: Service principal object or None if not found
+        """
+        self.logger.info(f"Retrieving service principal for app ID: {app_id}")
+        
+        try:
+            response = self.submit("servicePrincipals", self._build_lookup_params(app_id)).result()
+            return self._first_result(response, app_id)
+        except Exception as e:
+            self.logger.error(f"Error retrieving service principal: {str(e)}")
+            return None
+    
+    def get_service_principals_by_app_ids(self, app_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get service principals for many application IDs
+        
+        The lookups are coalesced into $batch requests of up to 20 sub-requests
+        
+        Args:
+            app_ids: Application IDs
+            
+        Returns:
+            Dict[str, Optional[Dict[str, Any]]]: Service principal object, or None
+            if not found, keyed by application ID
+        """
+        app_ids = list(dict.fromkeys(app_ids))
+        self.logger.info(f"Retrieving service principals for {len(app_ids)} app IDs")
+        
+        with self.batch() as batcher:
+            futures = {
+                app_id: batcher.submit("servicePrincipals", self._build_lookup_params(app_id))
+                for app_id in app_ids
+            }
+        
+        results = {}
+        for app_id, future in futures.items():
+            try:
+                results[app_id] = self._first_result(future.result(), app_id)
+            except Exception as e:
+                self.logger.error(f"Error retrieving service principal: {str(e)}")
+                results[app_id] = None
+        return results
+    
+    async def get_service_principals_async(
+        self,
+        app_id: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        max_results: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Get service principals (enterprise apps) over the async transport
+        
+        Args:
+            app_id: Filter by application ID
+            created_after: Filter by creation date
+            max_results: Maximum number of results to return
+            
+        Yields:
+            Dict[str, Any]: Service principal objects
+        """
+        self.logger.info("Retrieving service principals")
+        
+        params = self._build_params(app_id, created_after, max_results)
+        
+        count = 0
+        async for sp in self.get_paginated_async(
+            "servicePrincipals",
+            params,
+            prefetch=self.settings.page_prefetch,
+            stream=self.settings.stream_pages,
+        ):
+            if max_results and count >= max_results:
+                break
+                
+            yield sp
+            count += 1
+        
+        self.logger.info(f"Retrieved {count} service principals")
+    
+    async def get_service_principal_by_app_id_async(self, app_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a specific service principal by application ID over the async transport
+        
+        Args:
+            app_id: Application ID
+            
+        Returns:
+            Optional[Dict[str, Any]]: Service principal object or None if not found
+        """
+        self.logger.info(f"Retrieving service principal for app ID: {app_id}")
+        
+        try:
+            future = self.submit("servicePrincipals", self._build_lookup_params(app_id))
+            response = await future.result_async()
+            return self._first_result(response, app_id)
+        except Exception as e:
+            self.logger.error(f"Error retrieving service principal: {str(e)}")
+            return None
+    
+    def _build_params(
+        self,
+        app_id: Optional[str],
+        created_after: Optional[datetime],
+        max_results: Optional[int],
+    ) -> Dict[str, str]:
+        """
+        Build query parameters for a service principals request
+        
+        Args:
+            app_id: Filter by application ID
+            created_after: Filter by creation date
+            max_results: Maximum number of results to return
+            
+        Returns:
+            Dict[str, str]: Query parameters
+        """
         # Build filter string
         filter_parts = []
         
@@ -71,46 +234,39 @@ class ServicePrincipalsClient(GraphClient):
         if max_results:
             params["$top"] = str(max_results)
         
-        # Get paginated results
-        count = 0
-        for sp in self.get_paginated("servicePrincipals", params):
-            if max_results and count >= max_results:
-                break
-                
-            yield sp
-            count += 1
-        
-        self.logger.info(f"Retrieved {count} service principals")
+        return params
     
-    def get_service_principal_by_app_id(self, app_id: str) -> Optional[Dict[str, Any]]:
+    def _build_lookup_params(self, app_id: str) -> Dict[str, str]:
         """
-        Get a specific service principal by application ID
+        Build query parameters for a service principal lookup by application ID
         
         Args:
             app_id: Application ID
             
         Returns:
-            Optional[Dict[str, Any]]: Service principal object or None if not found
+            Dict[str, str]: Query parameters
         """
-        self.logger.info(f"Retrieving service principal for app ID: {app_id}")
-        
-        # Query parameters
-        params = {
+        return {
             "$filter": f"appId eq '{app_id}'",
             "$select": "id,appId,displayName,appOwnerOrganizationId,createdDateTime,servicePrincipalType,oauth2PermissionScopes"
         }
+    
+    def _first_result(self, response: Dict[str, Any], app_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Pick the service principal out of a lookup response
         
-        # Get results
-        try:
-            response = self.get("servicePrincipals", params)
-            results = response.get("value", [])
+        Args:
+            response: API response
+            app_id: Application ID that was looked up
             
-            if results:
-                self.logger.debug(f"Found service principal for app ID: {app_id}")
-                return results[0]
-            else:
-                self.logger.warning(f"No service principal found for app ID: {app_id}")
-                return None
-        except Exception as e:
-            self.logger.error(f"Error retrieving service principal: {str(e)}")
-            return None 
\ No newline at end of file
+        Returns:
+            Optional[Dict[str, Any]]: Service principal object or None if not found
+        """
+        results = response.get("value", [])
+        
+        if results:
+            self.logger.debug(f"Found service principal for app ID: {app_id}")
+            return results[0]
+        
+        self.logger.warning(f"No service principal found for app ID: {app_id}")
+        return None 
\ No newline at end of file
@@ -5,11 +5,19 @@ GraphReporter Sign-In Logs Client
 Client for retrieving sign-in logs from Microsoft Graph API
 """
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Iterator
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterator, AsyncIterator, Iterable, Tuple
 
 from graphreporter.graph.client import GraphClient
+from graphreporter.graph.context import GraphContext
+from graphreporter.graph.odata import ODataFilter
+from graphreporter.schema.signins import build_select
+from graphreporter.sync.checkpoint import DEFAULT_SETTLE_TIME, CheckpointStore, IncrementalSync
+from graphreporter.sync.store import SIGNIN_STORE_FILE, SignInStore
+from graphreporter.utils.helpers import iterate_async
 
 
 class SignInClient(GraphClient):
@@ -19,9 +27,15 @@ class SignInClient(GraphClient):
     Extends the base GraphClient with sign-in specific functionality
     """
     
-    def __init__(self):
-        """Initialize the sign-in logs client"""
-        super().__init__()
+    def __init__(self, context: Optional[GraphContext] = None):
+        """
+        Initialize the sign-in logs client
+        
+        Args:
+            context: Context to share resources through, the process-wide
+                context if omitted
+        """
+        super().__init__(context)
         self.logger = logging.getLogger(__name__)
         
         self.logger.debug("SignInClient initialized")
@@ -33,6 +47,8 @@ class SignInClient(GraphClient):
         user_id: Optional[str] = None,
         app_id: Optional[str] = None,
         max_results: Optional[int] = None,
+        slices: int = 1,
+        columns: Optional[Iterable[str]] = None,
     ) -> Iterator[Dict[str, Any]]:
         """
         Get sign-in logs from Microsoft Graph API
@@ -43,52 +59,82 @@ class SignInClient(GraphClient):
             user_id: Filter by user ID or userPrincipalName
             app_id: Filter by application ID
             max_results: Maximum number of results to return
+            slices: Number of sub-windows to fetch concurrently, see
+                get_signins_parallel_async
+            columns: Output columns or signIn property paths to fetch, sent
+                as $select; None fetches every property
             
         Returns:
             Iterator[Dict[str, Any]]: Iterator of sign-in log entries
         """
-        self.logger.info(f"Retrieving sign-in logs")
-        
-        # Set default dates if not provided
-        if not end_date:
-            end_date = datetime.now()
-        if not start_date:
-            start_date = end_date - timedelta(days=7)
-        
-        # Build filter string
-        filter_parts = []
+        if slices > 1:
+            async def run() -> AsyncIterator[Dict[str, Any]]:
+                try:
+                    async for signin in self.get_signins_parallel_async(
+                        start_date, end_date, user_id, app_id, max_results, slices, columns=columns
+                    ):
+                        yield signin
+                finally:
+                    await self.transport.aclose()
+            
+            yield from iterate_async(run())
+            return
         
-        # Date range filter
-        start_str = start_date.isoformat() + "Z"
-        end_str = end_date.isoformat() + "Z"
-        filter_parts.append(f"createdDateTime ge {start_str} and createdDateTime le {end_str}")
+        self.logger.info(f"Retrieving sign-in logs")
         
-        # User filter
-        if user_id:
-            filter_parts.append(f"userPrincipalName eq '{user_id}' or userId eq '{user_id}'")
+        params = self._build_params(start_date, end_date, user_id, app_id, max_results, columns=columns)
         
-        # App filter
-        if app_id:
-            filter_parts.append(f"appId eq '{app_id}'")
-        
-        # Combine filters
-        filter_str = " and ".join(f"({part})" for part in filter_parts)
+        # Get paginated results
+        count = 0
+        for signin in self.get_paginated(
+            "auditLogs/signIns",
+            params,
+            prefetch=self.settings.page_prefetch,
+            stream=self.settings.stream_pages,
+        ):
+            if max_results and count >= max_results:
+                break
+            
+            yield signin
+            count += 1
         
-        # Query parameters
-        params = {
-            "$filter": filter_str,
-            "$orderby": "createdDateTime desc",
-        }
+        self.logger.info(f"Retrieved {count} sign-in logs")
+    
+    async def get_signins_async(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        app_id: Optional[str] = None,
+        max_results: Optional[int] = None,
+        columns: Optional[Iterable[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Get sign-in logs from Microsoft Graph API over the async transport
         
-        # Add top parameter if max_results is specified
-        if max_results:
-            params["$top"] = str(max_results)
+        Args:
+            start_date: Start date for filtering logs
+            end_date: End date for filtering logs
+            user_id: Filter by user ID or userPrincipalName
+            app_id: Filter by application ID
+            max_results: Maximum number of results to return
+            columns: Output columns or signIn property paths to fetch, sent
+                as $select; None fetches every property
+            
+        Yields:
+            Dict[str, Any]: Sign-in log entries
+        """
+        self.logger.info("Retrieving sign-in logs")
         
-        self.logger.debug(f"Filter: {filter_str}")
+        params = self._build_params(start_date, end_date, user_id, app_id, max_results, columns=columns)
         
-        # Get paginated results
         count = 0
-        for signin in self.get_paginated("auditLogs/signIns", params):
+        async for signin in self.get_paginated_async(
+            "auditLogs/signIns",
+            params,
+            prefetch=self.settings.page_prefetch,
+            stream=self.settings.stream_pages,
+        ):
             if max_results and count >= max_results:
                 break
             
@@ -97,12 +143,98 @@ class SignInClient(GraphClient):
         
         self.logger.info(f"Retrieved {count} sign-in logs")
     
+    async def get_signins_parallel_async(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        app_id: Optional[str] = None,
+        max_results: Optional[int] = None,
+        slices: Optional[int] = None,
+        buffer_size: int = 2000,
+        columns: Optional[Iterable[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Get sign-in logs by fetching sub-windows of the date range concurrently
+        
+        The range is split into non-overlapping sub-windows that are paged
+        through at the same time. Each sub-window is already sorted by
+        createdDateTime desc, so entries are yielded newest sub-window first,
+        and older sub-windows are held in a reorder buffer of at most
+        buffer_size entries each until their turn comes.
+        
+        Args:
+            start_date: Start date for filtering logs
+            end_date: End date for filtering logs
+            user_id: Filter by user ID or userPrincipalName
+            app_id: Filter by application ID
+            max_results: Maximum number of results to return
+            slices: Number of sub-windows, defaults to the configured concurrency
+            buffer_size: Maximum number of buffered entries per sub-window
+            columns: Output columns or signIn property paths to fetch, sent
+                as $select; None fetches every property
+            
+        Yields:
+            Dict[str, Any]: Sign-in log entries in createdDateTime desc order
+        """
+        if not end_date:
+            end_date = datetime.now()
+        if not start_date:
+            start_date = end_date - timedelta(days=7)
+        
+        if columns is not None:
+            columns = list(columns)
+        
+        windows = self._split_window(start_date, end_date, slices or self.settings.max_concurrency)
+        self.logger.info(f"Retrieving sign-in logs in {len(windows)} parallel windows")
+        
+        buffers = [asyncio.Queue(maxsize=buffer_size) for _ in windows]
+        done = object()
+        
+        async def fetch(window: Tuple[datetime, datetime, bool], buffer: asyncio.Queue) -> None:
+            window_start, window_end, end_inclusive = window
+            params = self._build_params(
+                window_start, window_end, user_id, app_id, None, end_inclusive, columns
+            )
+            try:
+                async for signin in self.get_paginated_async(
+                    "auditLogs/signIns", params, stream=self.settings.stream_pages
+                ):
+                    await buffer.put(signin)
+                await buffer.put(done)
+            except Exception as e:
+                await buffer.put(e)
+        
+        tasks = [asyncio.ensure_future(fetch(window, buffer)) for window, buffer in zip(windows, buffers)]
+        
+        count = 0
+        try:
+            for buffer in buffers:
+                while True:
+                    signin = await buffer.get()
+                    if signin is done:
+                        break
+                    if isinstance(signin, Exception):
+                        raise signin
+                    if max_results and count >= max_results:
+                        return
+                    
+                    yield signin
+                    count += 1
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.logger.info(f"Retrieved {count} sign-in logs")
+    
     def get_signins_by_days(
         self,
         days: int,
         user_id: Optional[str] = None,
         app_id: Optional[str] = None,
         max_results: Optional[int] = None,
+        slices: int = 1,
+        columns: Optional[Iterable[str]] = None,
     ) -> Iterator[Dict[str, Any]]:
         """
         Get sign-in logs for the last N days
@@ -112,6 +244,9 @@ class SignInClient(GraphClient):
             user_id: Filter by user ID or userPrincipalName
             app_id: Filter by application ID
             max_results: Maximum number of results to return
+            slices: Number of sub-windows to fetch concurrently
+            columns: Output columns or signIn property paths to fetch, sent
+                as $select; None fetches every property
             
         Returns:
             Iterator[Dict[str, Any]]: Iterator of sign-in log entries
@@ -127,4 +262,211 @@ class SignInClient(GraphClient):
             user_id=user_id,
             app_id=app_id,
             max_results=max_results,
-        ) 
\ No newline at end of file
+            slices=slices,
+            columns=columns,
+        ) 
+    
+    def get_signins_incremental(
+        self,
+        days: int = 7,
+        user_id: Optional[str] = None,
+        app_id: Optional[str] = None,
+        slices: int = 1,
+        store: Optional[CheckpointStore] = None,
+        columns: Optional[Iterable[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Get only the sign-in logs created since the previous incremental run
+        
+        Each combination of filters keeps its own checkpoint, which is saved
+        once the iterator is exhausted. A run that is stopped early leaves the
+        checkpoint unchanged, so its records are fetched again next time.
+        
+        Args:
+            days: Number of days to look back on the first run
+            user_id: Filter by user ID or userPrincipalName
+            app_id: Filter by application ID
+            slices: Number of sub-windows to fetch concurrently
+            store: Checkpoint store, defaults to the configured state directory
+            columns: Output columns or signIn property paths to fetch, sent
+                as $select; None fetches every property
+            
+        Returns:
+            Iterator[Dict[str, Any]]: Iterator of new sign-in log entries
+        """
+        store = store or CheckpointStore(self.settings.state_dir)
+        sync = IncrementalSync(
+            store,
+            store.key("signins", user_id=user_id, app_id=app_id),
+            timedelta(days=days),
+        )
+        
+        self.logger.info(f"Retrieving sign-in logs since {sync.start_date.isoformat()}Z")
+        
+        signins = self.get_signins(
+            start_date=sync.start_date,
+            end_date=datetime.utcnow(),
+            user_id=user_id,
+            app_id=app_id,
+            slices=slices,
+            columns=columns,
+        )
+        yield from sync.filter(signins)
+        sync.commit()
+
+    def get_signins_cached(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        app_id: Optional[str] = None,
+        slices: int = 1,
+        columns: Optional[Iterable[str]] = None,
+        store: Optional[SignInStore] = None,
+        settle: timedelta = DEFAULT_SETTLE_TIME,
+        odata_filter: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Get sign-in logs, fetching from Graph only what the local store lacks
+
+        The parts of the range that no earlier query covered are fetched with
+        every property and saved, then the whole range is read from the store.
+        Sign-ins can reach Graph some time after they happen, so the last
+        settle of the range is stored but not marked as covered, and is
+        fetched again by the next query.
+
+        Args:
+            start_date: Start date for filtering logs, defaults to 7 days ago
+            end_date: End date for filtering logs, defaults to now
+            user_id: Filter by user ID or userPrincipalName
+            app_id: Filter by application ID
+            slices: Number of sub-windows to fetch concurrently
+            columns: Output columns or signIn property paths to return; the
+                store always keeps every property
+            store: Sign-in store, defaults to the configured state directory
+            settle: Age below which sign-ins may still be missing from Graph
+            odata_filter: Further $filter expression evaluated on the local
+                copy, see ODataFilter
+
+        Returns:
+            Iterator[Dict[str, Any]]: Iterator of sign-in log entries
+        """
+        # Reject a malformed filter before fetching anything
+        where = ODataFilter(odata_filter) if odata_filter else None
+        # A store opened here is closed here, also if the caller stops early
+        owns_store = store is None
+        if owns_store:
+            store = SignInStore(Path(self.settings.state_dir) / SIGNIN_STORE_FILE)
+        now = datetime.utcnow()
+        end_date = end_date or now
+        start_date = start_date or end_date - timedelta(days=7)
+
+        try:
+            gaps = store.missing(start_date, end_date, user_id, app_id)
+            self.logger.info(f"Fetching {len(gaps)} uncovered ranges, reading the rest from the local store")
+
+            for gap_start, gap_end in gaps:
+                signins = self.get_signins(
+                    start_date=gap_start,
+                    end_date=gap_end,
+                    user_id=user_id,
+                    app_id=app_id,
+                    slices=slices,
+                )
+                store.save(signins, gap_start, min(gap_end, now - settle), user_id, app_id)
+
+            yield from store.query(start_date, end_date, user_id, app_id, columns, where)
+        finally:
+            if owns_store:
+                store.close()
+
+    def _build_params(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        user_id: Optional[str],
+        app_id: Optional[str],
+        max_results: Optional[int],
+        end_inclusive: bool = True,
+        columns: Optional[Iterable[str]] = None,
+    ) -> Dict[str, str]:
+        """
+        Build query parameters for a sign-in logs request
+        
+        Args:
+            start_date: Start date for filtering logs
+            end_date: End date for filtering logs
+            user_id: Filter by user ID or userPrincipalName
+            app_id: Filter by application ID
+            max_results: Maximum number of results to return
+            end_inclusive: Whether entries at exactly end_date are included
+            columns: Output columns or signIn property paths to select
+            
+        Returns:
+            Dict[str, str]: Query parameters
+        """
+        # Set default dates if not provided
+        if not end_date:
+            end_date = datetime.now()
+        if not start_date:
+            start_date = end_date - timedelta(days=7)
+        
+        # Build filter string
+        filter_parts = []
+        
+        # Date range filter
+        start_str = start_date.isoformat() + "Z"
+        end_str = end_date.isoformat() + "Z"
+        end_operator = "le" if end_inclusive else "lt"
+        filter_parts.append(f"createdDateTime ge {start_str} and createdDateTime {end_operator} {end_str}")
+        
+        # User filter
+        if user_id:
+            filter_parts.append(f"userPrincipalName eq '{user_id}' or userId eq '{user_id}'")
+        
+        # App filter
+        if app_id:
+            filter_parts.append(f"appId eq '{app_id}'")
+        
+        # Combine filters
+        filter_str = " and ".join(f"({part})" for part in filter_parts)
+        
+        # Query parameters
+        params = {
+            "$filter": filter_str,
+            "$orderby": "createdDateTime desc",
+        }
+        
+        # Only fetch the properties behind the requested columns
+        if columns is not None:
+            params["$select"] = build_select(columns)
+        
+        # Add top parameter if max_results is specified
+        if max_results:
+            params["$top"] = str(max_results)
+        
+        self.logger.debug(f"Filter: {filter_str}")
+        
+        return params
+    
+    def _split_window(
+        self, start_date: datetime, end_date: datetime, slices: int
+    ) -> List[Tuple[datetime, datetime, bool]]:
+        """
+        Split a date range into non-overlapping sub-windows, newest first
+        
+        Args:
+            start_date: Start of the range
+            end_date: End of the range
+            slices: Number of sub-windows
+            
+        Returns:
+            List[Tuple[datetime, datetime, bool]]: (start, end, end_inclusive)
+            tuples, where only the newest sub-window includes its end
+        """
+        slices = max(1, slices)
+        step = (end_date - start_date) / slices
+        bounds = [start_date + step * i for i in range(slices)] + [end_date]
+        
+        windows = [(bounds[i], bounds[i + 1], i == slices - 1) for i in range(slices)]
+        return list(reversed(windows))
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphReporter Streaming Decoder
+Incremental JSON decoding of Microsoft Graph collection pages
+"""
+
+import codecs
+import json
+from typing import Any, Dict, List, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional, faster backend
+    orjson = None
+
+
+# Bytes read from the response body at a time when streaming a page
+STREAM_CHUNK_SIZE = 65536
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode a complete JSON document
+
+    Uses orjson when it is installed and the standard library otherwise
+
+    Args:
+        data: JSON document
+
+    Returns:
+        Any: Decoded document
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Decoder states
+_START = 0
+_KEY = 1
+_COLON = 2
+_VALUE = 3
+_ITEMS = 4
+_DONE = 5
+
+
+class PageDecoder:
+    """
+    Incremental decoder for a Graph collection page
+
+    Bytes are fed in as they arrive from the response stream and the items of
+    the page's value array are returned as soon as each one is complete, so a
+    page never has to be held in memory as a whole. Every other top-level
+    property, such as @odata.nextLink, is collected in metadata.
+    """
+
+    def __init__(self, items_key: str = "value"):
+        """
+        Initialize the decoder
+
+        Args:
+            items_key: Top-level property holding the collection
+        """
+        self.items_key = items_key
+        self.metadata: Dict[str, Any] = {}
+
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _START
+        self._key = ""
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Feed a chunk of the response body
+
+        Args:
+            chunk: Raw bytes
+
+        Returns:
+            List[Any]: Items completed by this chunk
+        """
+        self._buffer = self._buffer[self._pos:] + self._text.decode(chunk)
+        self._pos = 0
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        """
+        Signal the end of the response body
+
+        Returns:
+            List[Any]: Items completed by the remaining data
+
+        Raises:
+            ValueError: If the body is not a complete JSON object
+        """
+        self._buffer = self._buffer[self._pos:] + self._text.decode(b"", final=True)
+        self._pos = 0
+        items = self._parse(final=True)
+        if self._state != _DONE:
+            raise ValueError("Incomplete JSON page in response stream")
+        return items
+
+    def _skip_whitespace(self) -> bool:
+        """
+        Advance past whitespace
+
+        Returns:
+            bool: True if there is a character to look at
+        """
+        buffer, pos = self._buffer, self._pos
+        while pos < len(buffer) and buffer[pos] in " \t\r\n":
+            pos += 1
+        self._pos = pos
+        return pos < len(buffer)
+
+    def _decode_value(self, final: bool) -> Any:
+        """
+        Decode the JSON value at the current position
+
+        A value that ends exactly at the end of the buffer might be a truncated
+        number, so it is only accepted once more data or the end has arrived
+
+        Args:
+            final: Whether the whole body has been fed
+
+        Returns:
+            Any: Decoded value
+
+        Raises:
+            EOFError: If more data is needed
+        """
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise ValueError(f"Invalid JSON in response stream at offset {self._pos}")
+            raise EOFError
+        if end == len(self._buffer) and not final:
+            raise EOFError
+        self._pos = end
+        return value
+
+    def _parse(self, final: bool) -> List[Any]:
+        """
+        Advance the state machine as far as the buffered data allows
+
+        Args:
+            final: Whether the whole body has been fed
+
+        Returns:
+            List[Any]: Items completed
+        """
+        items = []
+        try:
+            while self._state != _DONE and self._skip_whitespace():
+                char = self._buffer[self._pos]
+
+                if self._state == _START:
+                    if char != "{":
+                        raise ValueError("Expected a JSON object in response stream")
+                    self._pos += 1
+                    self._state = _KEY
+
+                elif self._state == _KEY:
+                    if char == "}":
+                        self._pos += 1
+                        self._state = _DONE
+                    elif char == ",":
+                        self._pos += 1
+                    else:
+                        self._key = self._decode_value(final)
+                        self._state = _COLON
+
+                elif self._state == _COLON:
+                    if char != ":":
+                        raise ValueError("Expected ':' in response stream")
+                    self._pos += 1
+                    self._state = _VALUE
+
+                elif self._state == _VALUE:
+                    if self._key == self.items_key and char == "[":
+                        self._pos += 1
+                        self._state = _ITEMS
+                    else:
+                        self.metadata[self._key] = self._decode_value(final)
+                        self._state = _KEY
+
+                elif self._state == _ITEMS:
+                    if char == "]":
+                        self._pos += 1
+                        self._state = _KEY
+                    elif char == ",":
+                        self._pos += 1
+                    else:
+                        items.append(self._decode_value(final))
+        except EOFError:
+            pass
+        return items
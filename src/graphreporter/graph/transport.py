@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphReporter Async Transport
+Connection-pooled asynchronous HTTP transport for Microsoft Graph API
+"""
+
+import asyncio
+import logging
+from typing import Dict, Optional, Any
+
+import httpx
+
+
+class AsyncTransport:
+    """
+    Asynchronous HTTP transport for Microsoft Graph API
+
+    Wraps an httpx.AsyncClient with a bounded connection pool and caps the
+    number of requests in flight with a semaphore
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 10,
+        max_concurrency: int = 4,
+        timeout: float = 60.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize the transport
+
+        Args:
+            max_connections: Maximum number of pooled connections
+            max_concurrency: Maximum number of requests in flight at once
+            timeout: Request timeout in seconds
+            transport: Optional httpx transport to send requests through
+        """
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.logger.debug(
+            f"AsyncTransport initialized with {max_connections} connections "
+            f"and concurrency {max_concurrency}"
+        )
+
+    async def _ensure_client(self) -> httpx.AsyncClient:
+        """
+        Get or create the httpx client for the running event loop
+
+        Connection pools and semaphores are bound to the loop that created them,
+        so a new client is created when the transport is used from another loop,
+        and the client of the previous loop is closed
+
+        Returns:
+            httpx.AsyncClient: The client object
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._loop is not loop:
+            await self._close_stale_client(self._client, self._loop)
+            self._client = None
+
+        if self._client is None:
+            self.logger.debug("Creating httpx.AsyncClient")
+            limits = httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            )
+            self._client = httpx.AsyncClient(
+                limits=limits,
+                timeout=self.timeout,
+                transport=self._transport,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._client
+
+    async def _close_stale_client(self, client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """
+        Close the client of an event loop the transport is no longer used from
+
+        A loop still running in another thread closes its own client. Otherwise
+        the client is closed from the running loop; connections whose sockets
+        belonged to a closed loop can then fail to shut down cleanly, which is
+        logged rather than raised.
+
+        Args:
+            client: Client created on the previous loop
+            loop: Loop the client was created on
+        """
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+
+        try:
+            await client.aclose()
+            self.logger.debug("httpx.AsyncClient of a previous event loop closed")
+        except Exception as e:
+            self.logger.debug(f"Closing the httpx.AsyncClient of a previous event loop failed: {e}")
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        json: Optional[Any] = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """
+        Send a request through the pooled client
+
+        A streamed response holds its connection until the caller closes it,
+        but releases its concurrency slot as soon as the headers arrive
+
+        Args:
+            method: HTTP method
+            url: Absolute request URL
+            params: Query parameters
+            headers: Request headers
+            json: JSON request body
+            stream: Whether to leave the response body unread
+
+        Returns:
+            httpx.Response: The response object
+        """
+        client = await self._ensure_client()
+        request = client.build_request(method, url, params=params, headers=headers, json=json)
+        async with self._semaphore:
+            return await client.send(request, stream=stream)
+
+    async def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        """
+        Send a GET request through the pooled client
+
+        Args:
+            url: Absolute request URL
+            params: Query parameters
+            headers: Request headers
+
+        Returns:
+            httpx.Response: The response object
+        """
+        return await self.request("GET", url, params=params, headers=headers)
+
+    async def aclose(self) -> None:
+        """Close the pooled client and release its connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self.logger.debug("httpx.AsyncClient closed")
+        self._client = None
+        self._semaphore = None
+        self._loop = None
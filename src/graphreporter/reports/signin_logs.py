@@ -1,20 +1,214 @@
+import asyncio
+import csv
+import itertools
+import os
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, AsyncIterator, Iterable, List, Optional, TextIO, Tuple, Union
 
 from msgraph import GraphServiceClient
 from msgraph.generated.audit_logs.sign_ins.sign_ins_request_builder import SignInsRequestBuilder
+from msgraph.generated.models.o_data_errors.o_data_error import ODataError
 from kiota_abstractions.base_request_configuration import RequestConfiguration
 
+from graphreporter.export.merge import read_csv_metadata, write_csv_metadata
+from graphreporter.graph.streaming import loads
+from graphreporter.schema.batch import RecordBatch, encode_value
+from graphreporter.schema.signins import SIGNIN_CSV_COLUMNS, column_paths, select_properties
+from graphreporter.sync.checkpoint import parse_timestamp
+from graphreporter.sync.dedup import Deduplicator
+from graphreporter.sync.resume import ExportJournal
+
+# Largest page Graph serves for sign-in logs
+MAX_PAGE_SIZE = 1000
+
 class SignInLogsClient:
     """Client for retrieving and processing sign-in logs from Microsoft Graph."""
 
-    def __init__(self, graph_client: GraphServiceClient):
+    def __init__(self, graph_client: GraphServiceClient, prefetch: int = 2, list_encoding: str = "json"):
         """Initialize the SignInLogsClient.
-        
+
         Args:
             graph_client: An authenticated GraphServiceClient instance
+            prefetch: Number of pages fetched ahead while the current page is
+                consumed, 0 to fetch on demand
+            list_encoding: Encoding of list values written to CSV files,
+                such as applied_conditional_access_policies (json, count or join)
         """
         self.graph_client = graph_client
+        self.prefetch = prefetch
+        self.list_encoding = list_encoding
+
+    async def iter_signin_logs(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        app_id: Optional[str] = None,
+        app_display_name: Optional[str] = None,
+        user_principal_name: Optional[str] = None,
+        max_results: Optional[int] = None
+    ) -> AsyncIterator[dict]:
+        """Stream sign-in logs based on specified filters, following every page.
+
+        Args:
+            start_date: Optional start date for filtering logs
+            end_date: Optional end date for filtering logs
+            app_id: Optional application ID to filter logs
+            app_display_name: Optional application display name to filter logs
+            user_principal_name: Optional user email to filter logs
+            max_results: Optional maximum number of results to return
+
+        Yields:
+            Sign-in log entries
+        """
+        request_configuration = self._build_request_configuration(
+            start_date, end_date, app_id, app_display_name, user_principal_name, max_results
+        )
+
+        count = 0
+        pages = self._iter_pages(self._fetch_pages(request_configuration))
+        try:
+            async for page in pages:
+                for log in page:
+                    if max_results and count >= max_results:
+                        return
+                    yield self._to_dict(log)
+                    count += 1
+        finally:
+            # Stop the prefetch task as soon as the caller is done
+            await pages.aclose()
+
+    async def iter_signin_rows(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        app_id: Optional[str] = None,
+        app_display_name: Optional[str] = None,
+        user_principal_name: Optional[str] = None,
+        max_results: Optional[int] = None,
+        columns: Optional[Iterable[str]] = None
+    ) -> AsyncIterator[dict]:
+        """Stream sign-in logs as flat CSV rows, following every page.
+
+        Rows are read from the batches of iter_signin_batches.
+
+        Args:
+            start_date: Optional start date for filtering logs
+            end_date: Optional end date for filtering logs
+            app_id: Optional application ID to filter logs
+            app_display_name: Optional application display name to filter logs
+            user_principal_name: Optional user email to filter logs
+            max_results: Optional maximum number of results to return
+            columns: Optional flat columns to return, SIGNIN_CSV_COLUMNS by default
+
+        Yields:
+            Rows keyed by the flat output columns
+        """
+        batches = self.iter_signin_batches(
+            start_date, end_date, app_id, app_display_name, user_principal_name, max_results, columns
+        )
+        try:
+            async for batch in batches:
+                for row in batch:
+                    yield row
+        finally:
+            await batches.aclose()
+
+    async def iter_signin_batches(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        app_id: Optional[str] = None,
+        app_display_name: Optional[str] = None,
+        user_principal_name: Optional[str] = None,
+        max_results: Optional[int] = None,
+        columns: Optional[Iterable[str]] = None
+    ) -> AsyncIterator[RecordBatch]:
+        """Stream sign-in logs as one column batch per page.
+
+        Fast path for exports: pages are fetched as raw bytes through the SDK
+        request adapter and mapped straight from JSON into the columns of a
+        RecordBatch, without building SignIn models or row dicts.
+
+        Args:
+            start_date: Optional start date for filtering logs
+            end_date: Optional end date for filtering logs
+            app_id: Optional application ID to filter logs
+            app_display_name: Optional application display name to filter logs
+            user_principal_name: Optional user email to filter logs
+            max_results: Optional maximum number of results to return
+            columns: Optional flat columns to return, SIGNIN_CSV_COLUMNS by default
+
+        Yields:
+            The rows of each non-empty page
+        """
+        columns = list(SIGNIN_CSV_COLUMNS if columns is None else columns)
+        paths = column_paths(columns)
+
+        request_configuration = self._build_request_configuration(
+            start_date, end_date, app_id, app_display_name, user_principal_name, max_results, columns
+        )
+
+        count = 0
+        pages = self._iter_pages(self._fetch_raw_pages(request_configuration))
+        try:
+            async for page, _ in pages:
+                batch = RecordBatch.from_records(page, paths)
+                if max_results and count + len(batch) > max_results:
+                    batch.truncate(max_results - count)
+                if batch:
+                    yield batch
+                    count += len(batch)
+                if max_results and count >= max_results:
+                    return
+        finally:
+            await pages.aclose()
+
+    async def get_signin_batch(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        app_id: Optional[str] = None,
+        app_display_name: Optional[str] = None,
+        user_principal_name: Optional[str] = None,
+        max_results: Optional[int] = None,
+        columns: Optional[Iterable[str]] = None
+    ) -> RecordBatch:
+        """Retrieve sign-in logs as flat rows held column-wise.
+
+        Compact alternative to get_signin_logs for large ranges: every page is
+        added to a single RecordBatch, which the exporters accept like a list
+        of rows.
+
+        Args:
+            start_date: Optional start date for filtering logs
+            end_date: Optional end date for filtering logs
+            app_id: Optional application ID to filter logs
+            app_display_name: Optional application display name to filter logs
+            user_principal_name: Optional user email to filter logs
+            max_results: Optional maximum number of results to return
+            columns: Optional flat columns to return, SIGNIN_CSV_COLUMNS by default
+
+        Returns:
+            Batch of every matching sign-in log
+        """
+        columns = list(SIGNIN_CSV_COLUMNS if columns is None else columns)
+        batch = RecordBatch(column_paths(columns))
+
+        request_configuration = self._build_request_configuration(
+            start_date, end_date, app_id, app_display_name, user_principal_name, max_results, columns
+        )
+
+        pages = self._iter_pages(self._fetch_raw_pages(request_configuration))
+        try:
+            async for page, _ in pages:
+                batch.extend(page)
+                if max_results and len(batch) >= max_results:
+                    batch.truncate(max_results)
+                    break
+        finally:
+            await pages.aclose()
+
+        return batch
 
     async def get_signin_logs(
         self,
@@ -26,7 +220,9 @@ class SignInLogsClient:
         max_results: Optional[int] = None
     ) -> List[dict]:
         """Retrieve sign-in logs based on specified filters.
-        
+
+        Collects every page of iter_signin_logs; prefer streaming for large ranges.
+
         Args:
             start_date: Optional start date for filtering logs
             end_date: Optional end date for filtering logs
@@ -34,19 +230,238 @@ class SignInLogsClient:
             app_display_name: Optional application display name to filter logs
             user_principal_name: Optional user email to filter logs
             max_results: Optional maximum number of results to return
-            
+
         Returns:
             List of sign-in log entries
         """
+        return [
+            log async for log in self.iter_signin_logs(
+                start_date=start_date,
+                end_date=end_date,
+                app_id=app_id,
+                app_display_name=app_display_name,
+                user_principal_name=user_principal_name,
+                max_results=max_results
+            )
+        ]
+
+    async def export_to_csv(
+        self,
+        output_file: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        app_id: Optional[str] = None,
+        app_display_name: Optional[str] = None,
+        user_principal_name: Optional[str] = None,
+        max_results: Optional[int] = None,
+        append: bool = False,
+        deduplicator: Optional[Deduplicator] = None,
+        journal: Optional[ExportJournal] = None,
+        chunk_id: Optional[str] = None,
+        end_inclusive: bool = True
+    ) -> str:
+        """Export sign-in logs to a CSV file.
+
+        Rows are written as their pages arrive, so memory use does not grow
+        with the size of the export. Uses the raw-JSON path of iter_signin_batches,
+        so rows are written from their columns without building a dict per row.
+
+        With a journal, every written page is committed with its nextLink and
+        the size of the file after it. A chunk interrupted midway is resumed
+        from its last committed page, after truncating the file to that page,
+        so rows written after the commit are not written twice.
+
+        Args:
+            output_file: Path to the output CSV file
+            start_date: Optional start date for filtering logs
+            end_date: Optional end date for filtering logs
+            app_id: Optional application ID to filter logs
+            app_display_name: Optional application display name to filter logs
+            user_principal_name: Optional user email to filter logs
+            max_results: Optional maximum number of results to return
+            append: Append to an existing file instead of replacing it
+            deduplicator: Optional stage shared by the chunks of a run, dropping
+                logs another chunk already wrote
+            journal: Optional journal to commit pages to and resume from
+            chunk_id: Chunk of the journal this export writes
+            end_inclusive: Whether logs at exactly end_date are included;
+                chunks of a range are half-open except the last, so
+                neighbouring chunks share no logs
+
+        Returns:
+            Path to the created CSV file, or None if no logs were found
+        """
+        f = None
+        count = 0
+        next_link = None
+        paths = column_paths(SIGNIN_CSV_COLUMNS)
+        fieldnames = list(paths)
+        if journal is not None:
+            next_link, count = self._resume_csv(output_file, journal.chunk(chunk_id))
+            if count:
+                # Continue the truncated file of the interrupted run
+                previous = 0
+                f, writer = self._open_csv(output_file, fieldnames, append=True)
+
+        request_configuration = self._build_request_configuration(
+            start_date, end_date, app_id, app_display_name, user_principal_name, max_results, fieldnames,
+            end_inclusive
+        )
+        pages = self._iter_pages(self._fetch_raw_pages(request_configuration, next_link))
+        try:
+            async for page, page_link in pages:
+                batch = RecordBatch.from_records(page, paths)
+                if max_results and count + len(batch) > max_results:
+                    batch.truncate(max_results - count)
+                rows = batch.rows(self.list_encoding)
+                written = len(batch)
+                if deduplicator is not None:
+                    keep = [
+                        deduplicator.is_new(record_id, parse_timestamp(created))
+                        for record_id, created in zip(batch.column('id'), batch.column('created_datetime'))
+                    ]
+                    rows = itertools.compress(rows, keep)
+                    written = sum(keep)
+                if written and f is None:
+                    # Only create the file once there is something to write
+                    previous = self._previous_rows(output_file, append)
+                    f, writer = self._open_csv(output_file, fieldnames, append)
+                if written:
+                    writer.writerows(rows)
+                    count += written
+                if journal is not None and page_link:
+                    # A resumed run continues after this page, from this size
+                    offset = None
+                    if f is not None:
+                        f.flush()
+                        offset = f.tell()
+                    journal.commit_page(chunk_id, page_link, count, output_file if f else None, offset)
+                if max_results and count >= max_results:
+                    break
+        finally:
+            await pages.aclose()
+            if f is not None:
+                f.close()
+
+        if f is None:
+            return None
+
+        self._write_metadata(output_file, fieldnames, previous, count)
+        return output_file
+
+    def _resume_csv(self, output_file: str, progress: dict) -> Tuple[Optional[str], int]:
+        """Prepare the CSV file of an interrupted chunk for resuming.
+
+        Args:
+            output_file: Path to the output CSV file
+            progress: Progress of the chunk, as returned by ExportJournal.chunk
+
+        Returns:
+            The nextLink to continue from and the rows kept in the file, or
+            (None, 0) if the chunk starts over
+        """
+        next_link = progress.get("next_link")
+        if not next_link or progress.get("complete"):
+            return None, 0
+
+        written = progress.get("written", 0)
+        if not written:
+            # The committed pages left no rows, so there is nothing to keep
+            return next_link, 0
+
+        offset = progress.get("offset")
+        if offset is None or not os.path.exists(output_file) or os.path.getsize(output_file) < offset:
+            return None, 0
+
+        # Drop the rows written after the last committed page
+        with open(output_file, 'r+b') as f:
+            f.truncate(offset)
+        return next_link, written
+
+    def write_csv(self, logs: List[dict], output_file: str, append: bool = False) -> Optional[str]:
+        """Write sign-in log entries to a CSV file.
+
+        Args:
+            logs: Entries as returned by get_signin_logs
+            output_file: Path to the output CSV file
+            append: Append to an existing file instead of replacing it; the
+                header is only written when the file is new or empty
+
+        Returns:
+            Path to the CSV file, or None if there was nothing to write
+        """
+        return self.write_rows([self._flatten(log) for log in logs], output_file, append)
+
+    def write_rows(self, rows: Union[List[dict], RecordBatch], output_file: str, append: bool = False) -> Optional[str]:
+        """Write flat sign-in rows to a CSV file.
+
+        Args:
+            rows: Rows as returned by iter_signin_rows, or a batch as returned
+                by get_signin_batch
+            output_file: Path to the output CSV file
+            append: Append to an existing file instead of replacing it; the
+                header is only written when the file is new or empty
+
+        Returns:
+            Path to the CSV file, or None if there was nothing to write
+        """
+        if not rows:
+            return None
+
+        if isinstance(rows, RecordBatch):
+            fieldnames = rows.columns
+            values = rows.rows(self.list_encoding)
+        else:
+            fieldnames = list(rows[0].keys())
+            values = (
+                [encode_value(row.get(column), self.list_encoding) for column in fieldnames]
+                for row in rows
+            )
+
+        previous = self._previous_rows(output_file, append)
+        f, writer = self._open_csv(output_file, fieldnames, append)
+        with f:
+            writer.writerows(values)
+
+        self._write_metadata(output_file, fieldnames, previous, len(rows))
+        return output_file
+
+    def _build_request_configuration(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        app_id: Optional[str],
+        app_display_name: Optional[str],
+        user_principal_name: Optional[str],
+        max_results: Optional[int],
+        columns: Optional[Iterable[str]] = None,
+        end_inclusive: bool = True
+    ) -> RequestConfiguration:
+        """Build the configuration of the first request of a sign-in query.
+
+        Args:
+            start_date: Optional start date for filtering logs
+            end_date: Optional end date for filtering logs
+            app_id: Optional application ID to filter logs
+            app_display_name: Optional application display name to filter logs
+            user_principal_name: Optional user email to filter logs
+            max_results: Optional maximum number of results to return
+            columns: Optional flat columns the results are mapped to
+            end_inclusive: Whether logs at exactly end_date are included
+
+        Returns:
+            Request configuration with the filter, $select and page size
+        """
         filter_conditions = []
-        
+
         if start_date:
             filter_conditions.append(
                 f"createdDateTime ge {start_date.isoformat()}Z"
             )
         if end_date:
+            end_operator = "le" if end_inclusive else "lt"
             filter_conditions.append(
-                f"createdDateTime le {end_date.isoformat()}Z"
+                f"createdDateTime {end_operator} {end_date.isoformat()}Z"
             )
         if app_id:
             filter_conditions.append(f"appId eq '{app_id}'")
@@ -57,120 +472,220 @@ class SignInLogsClient:
 
         filter_string = " and ".join(filter_conditions) if filter_conditions else None
 
+        # Only download the properties the results are built from
         query_params = SignInsRequestBuilder.SignInsRequestBuilderGetQueryParameters(
             filter=filter_string,
-            top=max_results
+            select=select_properties(columns),
+            top=min(max_results, MAX_PAGE_SIZE) if max_results else MAX_PAGE_SIZE
         )
 
-        request_configuration = RequestConfiguration(
+        return RequestConfiguration(
             query_parameters=query_params
         )
 
-        result = await self.graph_client.audit_logs.sign_ins.get(
-            request_configuration=request_configuration
-        )
+    async def _iter_pages(self, pages: AsyncIterator[list]) -> AsyncIterator[list]:
+        """Iterate over the pages of a sign-in query, with bounded prefetch.
 
-        # Convert to list of dicts for easier processing
-        logs = []
-        if result and hasattr(result, 'value'):
-            for log in result.value:
-                log_dict = {
-                    'id': log.id,
-                    'created_datetime': log.created_date_time,
-                    'user_display_name': log.user_display_name,
-                    'user_principal_name': log.user_principal_name,
-                    'user_id': log.user_id,
-                    'app_id': log.app_id,
-                    'app_display_name': log.app_display_name,
-                    'ip_address': log.ip_address,
-                    'client_app_used': log.client_app_used,
-                    'status': {
-                        'error_code': log.status.error_code if log.status else None,
-                        'failure_reason': log.status.failure_reason if log.status else None
-                    },
-                    'location': {
-                        'city': log.location.city if log.location else None,
-                        'state': log.location.state if log.location else None,
-                        'country_or_region': log.location.country_or_region if log.location else None
-                    },
-                    'device_detail': {
-                        'browser': log.device_detail.browser if log.device_detail else None,
-                        'operating_system': log.device_detail.operating_system if log.device_detail else None
-                    }
-                }
-                logs.append(log_dict)
-
-        return logs
+        Up to self.prefetch pages are fetched ahead in a background task while
+        the current page is consumed.
 
-    async def export_to_csv(
+        Args:
+            pages: Page source, as returned by _fetch_pages or _fetch_raw_pages
+
+        Yields:
+            The records of each page
+        """
+        if self.prefetch <= 0:
+            async for page in pages:
+                yield page
+            return
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.prefetch)
+        done = object()
+
+        async def produce() -> None:
+            try:
+                async for page in pages:
+                    await queue.put(page)
+                await queue.put(done)
+            except Exception as e:
+                await queue.put(e)
+
+        task = asyncio.ensure_future(produce())
+        try:
+            while True:
+                page = await queue.get()
+                if page is done:
+                    break
+                if isinstance(page, Exception):
+                    raise page
+                yield page
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _fetch_pages(self, request_configuration: RequestConfiguration) -> AsyncIterator[list]:
+        """Fetch the pages of a sign-in query one after another, following odata_next_link.
+
+        Args:
+            request_configuration: Configuration of the first request
+
+        Yields:
+            The SignIn models of each page
+        """
+        sign_ins = self.graph_client.audit_logs.sign_ins
+        result = await sign_ins.get(request_configuration=request_configuration)
+
+        while result is not None:
+            yield result.value or []
+            if not result.odata_next_link:
+                break
+            # The next link carries the query, so it is requested as is
+            result = await sign_ins.with_url(result.odata_next_link).get()
+
+    async def _fetch_raw_pages(
         self,
-        output_file: str,
-        start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None,
-        app_id: Optional[str] = None,
-        app_display_name: Optional[str] = None,
-        user_principal_name: Optional[str] = None,
-        max_results: Optional[int] = None
-    ) -> str:
-        """Export sign-in logs to a CSV file.
-        
+        request_configuration: RequestConfiguration,
+        next_link: Optional[str] = None
+    ) -> AsyncIterator[Tuple[list, Optional[str]]]:
+        """Fetch the pages of a sign-in query as decoded JSON, following @odata.nextLink.
+
+        Requests go through the SDK request adapter, so authentication, retries
+        and throttling are handled as for the model path, but the body is
+        returned as bytes instead of being parsed into SignIn models.
+
+        Args:
+            request_configuration: Configuration of the first request
+            next_link: Optional nextLink of an interrupted query to continue
+                from instead of sending the first request
+
+        Yields:
+            The signIn objects of each page, as dicts, and the page's nextLink
+        """
+        sign_ins = self.graph_client.audit_logs.sign_ins
+        request_adapter = self.graph_client.request_adapter
+        error_mapping = {"XXX": ODataError}
+        if next_link:
+            request_info = sign_ins.with_url(next_link).to_get_request_information()
+        else:
+            request_info = sign_ins.to_get_request_information(request_configuration)
+
+        while request_info is not None:
+            content = await request_adapter.send_primitive_async(request_info, "bytes", error_mapping)
+            if not content:
+                break
+            body = loads(content)
+            next_link = body.get("@odata.nextLink")
+            yield body.get("value", []), next_link
+
+            request_info = sign_ins.with_url(next_link).to_get_request_information() if next_link else None
+
+    def _open_csv(self, output_file: str, fieldnames: Iterable[str], append: bool) -> Tuple[TextIO, Any]:
+        """Open a CSV file for writing sign-in rows.
+
         Args:
             output_file: Path to the output CSV file
-            start_date: Optional start date for filtering logs
-            end_date: Optional end date for filtering logs
-            app_id: Optional application ID to filter logs
-            app_display_name: Optional application display name to filter logs
-            user_principal_name: Optional user email to filter logs
-            max_results: Optional maximum number of results to return
-            
+            fieldnames: Column names
+            append: Append to an existing file instead of replacing it; the
+                header is only written when the file is new or empty
+
         Returns:
-            Path to the created CSV file
-        """
-        import csv
-        import json
-
-        logs = await self.get_signin_logs(
-            start_date=start_date,
-            end_date=end_date,
-            app_id=app_id,
-            app_display_name=app_display_name,
-            user_principal_name=user_principal_name,
-            max_results=max_results
-        )
+            The open file and a csv writer for rows in column order
+        """
+        write_header = not (append and os.path.exists(output_file) and os.path.getsize(output_file) > 0)
 
-        if not logs:
-            return None
+        f = open(output_file, 'a' if append else 'w', newline='', encoding='utf-8')
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(list(fieldnames))
+        return f, writer
+
+    def _previous_rows(self, output_file: str, append: bool) -> Optional[int]:
+        """Get the number of rows a CSV file holds before it is written to.
+
+        Args:
+            output_file: Path to the output CSV file
+            append: Whether rows are appended to an existing file
+
+        Returns:
+            Number of data rows, or None if the file has rows but no metadata
+        """
+        if not (append and os.path.exists(output_file) and os.path.getsize(output_file) > 0):
+            return 0
+
+        metadata = read_csv_metadata(output_file)
+        return metadata["rows"] if metadata else None
+
+    def _write_metadata(self, output_file: str, fieldnames: Iterable[str], previous: Optional[int], written: int) -> None:
+        """Record the row count of a CSV file next to it, for merge_csv_files.
+
+        Args:
+            output_file: Path to the output CSV file
+            fieldnames: Column names
+            previous: Rows the file held before, None if unknown
+            written: Rows just written
+        """
+        if previous is not None:
+            write_csv_metadata(output_file, list(fieldnames), previous + written)
+
+    def _to_dict(self, log) -> dict:
+        """Convert a SignIn model to a sign-in log entry.
 
-        # Flatten nested dictionaries for CSV export
-        flattened_logs = []
-        for log in logs:
-            flat_log = {
-                'id': log['id'],
-                'created_datetime': log['created_datetime'],
-                'user_display_name': log['user_display_name'],
-                'user_principal_name': log['user_principal_name'],
-                'user_id': log['user_id'],
-                'app_id': log['app_id'],
-                'app_display_name': log['app_display_name'],
-                'ip_address': log['ip_address'],
-                'client_app_used': log['client_app_used'],
-                'status_error_code': log['status']['error_code'],
-                'status_failure_reason': log['status']['failure_reason'],
-                'location_city': log['location']['city'],
-                'location_state': log['location']['state'],
-                'location_country_or_region': log['location']['country_or_region'],
-                'device_browser': log['device_detail']['browser'],
-                'device_operating_system': log['device_detail']['operating_system']
+        Args:
+            log: SignIn model
+
+        Returns:
+            Sign-in log entry
+        """
+        return {
+            'id': log.id,
+            'created_datetime': log.created_date_time,
+            'user_display_name': log.user_display_name,
+            'user_principal_name': log.user_principal_name,
+            'user_id': log.user_id,
+            'app_id': log.app_id,
+            'app_display_name': log.app_display_name,
+            'ip_address': log.ip_address,
+            'client_app_used': log.client_app_used,
+            'status': {
+                'error_code': log.status.error_code if log.status else None,
+                'failure_reason': log.status.failure_reason if log.status else None
+            },
+            'location': {
+                'city': log.location.city if log.location else None,
+                'state': log.location.state if log.location else None,
+                'country_or_region': log.location.country_or_region if log.location else None
+            },
+            'device_detail': {
+                'browser': log.device_detail.browser if log.device_detail else None,
+                'operating_system': log.device_detail.operating_system if log.device_detail else None
             }
-            flattened_logs.append(flat_log)
-
-        # Write to CSV
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            if not flattened_logs:
-                return None
-                
-            writer = csv.DictWriter(f, fieldnames=flattened_logs[0].keys())
-            writer.writeheader()
-            writer.writerows(flattened_logs)
-
-        return output_file 
\ No newline at end of file
+        }
+
+    def _flatten(self, log: dict) -> dict:
+        """Flatten a sign-in log entry into a CSV row.
+
+        Args:
+            log: Sign-in log entry
+
+        Returns:
+            Row keyed by the flat output columns
+        """
+        return {
+            'id': log['id'],
+            'created_datetime': log['created_datetime'],
+            'user_display_name': log['user_display_name'],
+            'user_principal_name': log['user_principal_name'],
+            'user_id': log['user_id'],
+            'app_id': log['app_id'],
+            'app_display_name': log['app_display_name'],
+            'ip_address': log['ip_address'],
+            'client_app_used': log['client_app_used'],
+            'status_error_code': log['status']['error_code'],
+            'status_failure_reason': log['status']['failure_reason'],
+            'location_city': log['location']['city'],
+            'location_state': log['location']['state'],
+            'location_country_or_region': log['location']['country_or_region'],
+            'device_browser': log['device_detail']['browser'],
+            'device_operating_system': log['device_detail']['operating_system']
+        }
@@ -0,0 +1,4 @@
+"""
+GraphReporter Schema Module
+Output column definitions shared by the Graph clients and the exporters
+"""
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphReporter Record Batch
+Column-oriented buffer of flat records, filled straight from Graph JSON
+"""
+
+import json
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional, faster backend
+    orjson = None
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Distinct strings shared per column; past this a column is treated as
+# unique values such as ids and timestamps, and its strings are kept as is
+POOL_LIMIT = 4096
+
+# How list values such as appliedConditionalAccessPolicies are written:
+# json (compact JSON text), count (number of items) or join (items
+# separated by "; ", objects as JSON)
+LIST_ENCODINGS = ("json", "count", "join")
+
+
+def encode_value(value: Any, list_encoding: str = "json") -> Any:
+    """
+    Encode a list or object for a flat output cell
+
+    Args:
+        value: Value of a cell
+        list_encoding: Encoding of list values, one of LIST_ENCODINGS
+
+    Returns:
+        Any: Encoded list or object, other values unchanged
+    """
+    if isinstance(value, list):
+        if list_encoding == "count":
+            return len(value)
+        if list_encoding == "join":
+            return "; ".join(encode_value(item) if isinstance(item, (dict, list)) else str(item) for item in value)
+    elif not isinstance(value, dict):
+        return value
+
+    if orjson is not None:
+        return orjson.dumps(value, default=str).decode("utf-8")
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class RecordBatch(Sequence):
+    """
+    Flat records stored as one list per column
+
+    A record costs one reference per column instead of a dict of its own,
+    and strings repeated across records, such as application names,
+    cities or browsers, are stored once per column. Exporters accept a
+    batch wherever they accept a list of records; reading an item builds
+    its row dict on demand.
+    """
+
+    def __init__(self, columns: Mapping[str, str]):
+        """
+        Initialize an empty batch
+
+        Args:
+            columns: Flat column -> dotted path of the value it holds in a
+                raw Graph object, e.g. SIGNIN_COLUMNS
+        """
+        self.columns: List[str] = list(columns)
+        self.paths: Dict[str, str] = dict(columns)
+        self._keys: List[Tuple[str, ...]] = [tuple(path.split(".")) for path in columns.values()]
+        self._values: List[List[Any]] = [[] for _ in self.columns]
+        self._pools: List[Optional[Dict[str, str]]] = [{} for _ in self.columns]
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], columns: Mapping[str, str]) -> "RecordBatch":
+        """
+        Build a batch from raw Graph objects
+
+        Args:
+            records: Objects as decoded from the Graph JSON response
+            columns: Flat column -> dotted path
+
+        Returns:
+            RecordBatch: Batch holding the records
+        """
+        batch = cls(columns)
+        batch.extend(records)
+        return batch
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Add a raw Graph object
+
+        Args:
+            record: Object as decoded from the Graph JSON response
+        """
+        for i, keys in enumerate(self._keys):
+            value: Any = record
+            for key in keys:
+                value = value.get(key) if isinstance(value, dict) else None
+            if isinstance(value, str):
+                value = self._pooled(i, value)
+            self._values[i].append(value)
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Add raw Graph objects
+
+        Args:
+            records: Objects as decoded from the Graph JSON response
+        """
+        for record in records:
+            self.append(record)
+
+    def truncate(self, size: int) -> None:
+        """
+        Drop the records after the first size
+
+        Args:
+            size: Number of records to keep
+        """
+        for values in self._values:
+            del values[size:]
+
+    def column(self, name: str) -> List[Any]:
+        """
+        Get the values of a column
+
+        Args:
+            name: Flat column
+
+        Returns:
+            List[Any]: Value per record, shared with the batch
+        """
+        return self._values[self.columns.index(name)]
+
+    def identity_columns(self) -> Dict[str, str]:
+        """
+        Get the columns of the batch as a mapping onto themselves
+
+        Flattening a frame of the batch with this mapping keeps its flat
+        columns, see flatten_frame
+
+        Returns:
+            Dict[str, str]: Column -> column
+        """
+        return {column: column for column in self.columns}
+
+    def rows(self, list_encoding: Optional[str] = None) -> Iterator[Tuple[Any, ...]]:
+        """
+        Iterate over the records as tuples in column order
+
+        Args:
+            list_encoding: Encoding of list and object values, one of
+                LIST_ENCODINGS, for writers of flat text such as csv; None
+                keeps them as they are
+
+        Yields:
+            Tuple[Any, ...]: Values of a record
+        """
+        if list_encoding is None:
+            return zip(*self._values)
+
+        columns = [
+            [encode_value(value, list_encoding) for value in values]
+            if any(isinstance(value, (dict, list)) for value in values) else values
+            for values in self._values
+        ]
+        return zip(*columns)
+
+    def to_frame(self) -> "pd.DataFrame":
+        """
+        Build a DataFrame with one column per batch column
+
+        Returns:
+            pd.DataFrame: Frame built column-wise, without row dicts
+        """
+        import pandas as pd
+
+        return pd.DataFrame(dict(zip(self.columns, self._values)), columns=self.columns)
+
+    def __len__(self) -> int:
+        return len(self._values[0]) if self._values else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            batch = RecordBatch(self.paths)
+            batch._values = [values[index] for values in self._values]
+            return batch
+        return {column: values[index] for column, values in zip(self.columns, self._values)}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        columns = self.columns
+        return (dict(zip(columns, row)) for row in zip(*self._values))
+
+    def __repr__(self) -> str:
+        return f"RecordBatch({len(self)} records, {len(self.columns)} columns)"
+
+    def _pooled(self, i: int, value: str) -> str:
+        """
+        Get the shared copy of a string of a column
+
+        Args:
+            i: Column position
+            value: String read from a record
+
+        Returns:
+            str: Equal string already stored in the column, or value
+        """
+        pool = self._pools[i]
+        if pool is None:
+            return value
+
+        shared = pool.setdefault(value, value)
+        if len(pool) > POOL_LIMIT:
+            # Mostly distinct values gain nothing from sharing
+            self._pools[i] = None
+        return shared
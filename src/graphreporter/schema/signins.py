@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphReporter Sign-In Schema
+Flat output columns of sign-in exports and the Graph properties they come from
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+
+# Flat output column -> dotted path of the Graph signIn property it holds
+SIGNIN_COLUMNS: Dict[str, str] = {
+    "id": "id",
+    "created_datetime": "createdDateTime",
+    "user_display_name": "userDisplayName",
+    "user_principal_name": "userPrincipalName",
+    "user_id": "userId",
+    "app_id": "appId",
+    "app_display_name": "appDisplayName",
+    "ip_address": "ipAddress",
+    "client_app_used": "clientAppUsed",
+    "conditional_access_status": "conditionalAccessStatus",
+    "status_error_code": "status.errorCode",
+    "status_failure_reason": "status.failureReason",
+    "location_city": "location.city",
+    "location_state": "location.state",
+    "location_country_or_region": "location.countryOrRegion",
+    "location_latitude": "location.geoCoordinates.latitude",
+    "location_longitude": "location.geoCoordinates.longitude",
+    "device_browser": "deviceDetail.browser",
+    "device_operating_system": "deviceDetail.operatingSystem",
+    "applied_conditional_access_policies": "appliedConditionalAccessPolicies",
+}
+
+# Columns of the sign-in CSV files written by SignInLogsClient by default.
+# They are the columns those files had before the schema grew, so chunk
+# files of earlier runs still merge with new ones; list columns stay out.
+SIGNIN_CSV_COLUMNS = (
+    "id",
+    "created_datetime",
+    "user_display_name",
+    "user_principal_name",
+    "user_id",
+    "app_id",
+    "app_display_name",
+    "ip_address",
+    "client_app_used",
+    "status_error_code",
+    "status_failure_reason",
+    "location_city",
+    "location_state",
+    "location_country_or_region",
+    "device_browser",
+    "device_operating_system",
+)
+
+# Value types of the flat columns, for output formats that store types:
+# string, int32, float64 or timestamp (UTC). List values such as
+# applied_conditional_access_policies are stored as encoded strings
+SIGNIN_COLUMN_TYPES: Dict[str, str] = {
+    "id": "string",
+    "created_datetime": "timestamp",
+    "user_display_name": "string",
+    "user_principal_name": "string",
+    "user_id": "string",
+    "app_id": "string",
+    "app_display_name": "string",
+    "ip_address": "string",
+    "client_app_used": "string",
+    "conditional_access_status": "string",
+    "status_error_code": "int32",
+    "status_failure_reason": "string",
+    "location_city": "string",
+    "location_state": "string",
+    "location_country_or_region": "string",
+    "location_latitude": "float64",
+    "location_longitude": "float64",
+    "device_browser": "string",
+    "device_operating_system": "string",
+    "applied_conditional_access_policies": "string",
+}
+
+# Columns repeating a small set of values across many sign-ins, which
+# columnar formats store dictionary-encoded
+SIGNIN_DICTIONARY_COLUMNS = (
+    "user_display_name",
+    "user_principal_name",
+    "user_id",
+    "app_id",
+    "app_display_name",
+    "ip_address",
+    "client_app_used",
+    "conditional_access_status",
+    "status_failure_reason",
+    "location_city",
+    "location_state",
+    "location_country_or_region",
+    "device_browser",
+    "device_operating_system",
+)
+
+# Top-level properties of the Graph v1.0 signIn resource
+SIGNIN_PROPERTIES = (
+    "id",
+    "createdDateTime",
+    "userDisplayName",
+    "userPrincipalName",
+    "userId",
+    "appId",
+    "appDisplayName",
+    "ipAddress",
+    "clientAppUsed",
+    "correlationId",
+    "conditionalAccessStatus",
+    "isInteractive",
+    "riskDetail",
+    "riskLevelAggregated",
+    "riskLevelDuringSignIn",
+    "riskState",
+    "riskEventTypes",
+    "riskEventTypes_v2",
+    "resourceDisplayName",
+    "resourceId",
+    "status",
+    "deviceDetail",
+    "location",
+    "appliedConditionalAccessPolicies",
+)
+
+# Always fetched, since ordering, paging and incremental sync rely on them
+REQUIRED_PROPERTIES = ("id", "createdDateTime")
+
+
+def select_properties(columns: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Get the top-level signIn properties needed for a set of output columns
+
+    Graph only selects top-level properties of sign-ins, so a nested column
+    such as status_error_code selects its parent, status
+
+    Args:
+        columns: Flat output columns or dotted Graph property paths, None for
+            every column of SIGNIN_COLUMNS
+
+    Returns:
+        List[str]: Property names in first-use order
+
+    Raises:
+        ValueError: If a column is not part of the sign-in schema
+    """
+    if columns is None:
+        columns = SIGNIN_COLUMNS
+
+    properties = list(REQUIRED_PROPERTIES)
+    for column in columns:
+        path = SIGNIN_COLUMNS.get(column, column)
+        prop = path.split(".", 1)[0]
+        if prop not in SIGNIN_PROPERTIES:
+            raise ValueError(f"Unknown sign-in column: {column}")
+        if prop not in properties:
+            properties.append(prop)
+
+    return properties
+
+
+def build_select(columns: Optional[Iterable[str]] = None) -> str:
+    """
+    Build the $select query option for a set of output columns
+
+    Args:
+        columns: Flat output columns or dotted Graph property paths, None for
+            every column of SIGNIN_COLUMNS
+
+    Returns:
+        str: Comma-separated property names
+
+    Raises:
+        ValueError: If a column is not part of the sign-in schema
+    """
+    return ",".join(select_properties(columns))
+
+
+def column_paths(columns: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """
+    Get the Graph property paths of a set of output columns
+
+    Args:
+        columns: Flat output columns or dotted Graph property paths, None for
+            every column of SIGNIN_COLUMNS
+
+    Returns:
+        Dict[str, str]: Column -> dotted path, in column order
+    """
+    if columns is None:
+        return dict(SIGNIN_COLUMNS)
+    return {column: SIGNIN_COLUMNS.get(column, column) for column in columns}
+
+
+def flatten_signin(record: Dict[str, Any], columns: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Map a raw Graph signIn object to a flat output row
+
+    Args:
+        record: signIn object as decoded from the Graph JSON response
+        columns: Flat output columns or dotted Graph property paths, None for
+            every column of SIGNIN_COLUMNS
+
+    Returns:
+        Dict[str, Any]: Row keyed by column, None where a property is missing
+    """
+    if columns is None:
+        columns = SIGNIN_COLUMNS
+
+    row = {}
+    for column in columns:
+        value: Any = record
+        for key in SIGNIN_COLUMNS.get(column, column).split("."):
+            value = value.get(key) if isinstance(value, dict) else None
+        row[column] = value
+
+    return row
@@ -0,0 +1,4 @@
+"""
+GraphReporter Sync Module
+Tracks what previous runs have already exported so later runs fetch only new data
+"""
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphReporter Checkpoints
+Persisted high-water marks for incremental exports
+"""
+
+import hashlib
+import json
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Union
+
+from graphreporter.utils.helpers import write_json_atomic
+
+# Sign-ins younger than this may not have reached Graph yet, so incremental
+# runs and cached queries fetch this much before what they already hold
+DEFAULT_SETTLE_TIME = timedelta(hours=1)
+
+
+def parse_timestamp(value: Union[str, datetime]) -> datetime:
+    """
+    Parse a Graph timestamp into a naive UTC datetime
+
+    Graph returns up to seven fractional digits and a trailing Z, which
+    datetime.fromisoformat only accepts from Python 3.11
+
+    Args:
+        value: ISO 8601 string or datetime
+
+    Returns:
+        datetime: Naive datetime in UTC
+    """
+    if isinstance(value, str):
+        text = value.strip()
+        if text.endswith(("Z", "z")):
+            text = text[:-1] + "+00:00"
+        # Trim the fraction to microseconds
+        text = re.sub(r"(\.\d{6})\d+", r"\1", text)
+        value = datetime.fromisoformat(text)
+
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class Checkpoint:
+    """
+    High-water mark of an incremental export
+
+    Holds the newest timestamp exported so far and the ids of the records
+    exported since window_start, which trails the mark by the settle time.
+    The next run queries again from window_start, so sign-ins that reach
+    Graph after newer ones were already exported are still picked up, and
+    the ids drop the records that an earlier run exported
+    """
+
+    def __init__(
+        self,
+        high_water_mark: datetime,
+        recent_ids: Optional[Dict[str, datetime]] = None,
+        window_start: Optional[datetime] = None,
+    ):
+        """
+        Initialize the checkpoint
+
+        Args:
+            high_water_mark: Newest timestamp exported, as naive UTC
+            recent_ids: Timestamp of every record exported since
+                window_start, by id
+            window_start: Time from which recent_ids is complete, the
+                high-water mark if omitted
+        """
+        self.high_water_mark = high_water_mark
+        self.recent_ids: Dict[str, datetime] = dict(recent_ids or {})
+        self.window_start = window_start or high_water_mark
+
+    @property
+    def boundary_ids(self) -> Set[str]:
+        """Ids of the records at the high-water mark"""
+        return {record_id for record_id, timestamp in self.recent_ids.items() if timestamp == self.high_water_mark}
+
+    def is_new(self, timestamp: datetime, record_id: str) -> bool:
+        """
+        Check whether a record was not exported yet
+
+        Args:
+            timestamp: Record timestamp, as naive UTC
+            record_id: Record id
+
+        Returns:
+            bool: True if the record is inside the window and its id was not exported
+        """
+        return timestamp >= self.window_start and record_id not in self.recent_ids
+
+    def advance(self, timestamp: datetime, record_id: str) -> None:
+        """
+        Record an exported record, moving the high-water mark past it
+
+        Args:
+            timestamp: Record timestamp, as naive UTC
+            record_id: Record id
+        """
+        self.recent_ids[record_id] = timestamp
+        if timestamp > self.high_water_mark:
+            self.high_water_mark = timestamp
+
+    def settle(self, settle_time: timedelta) -> None:
+        """
+        Move the window up to the settle time before the high-water mark
+
+        Forgets the ids of the records before the new window, which the next
+        run does not query again
+
+        Args:
+            settle_time: Time sign-ins may take to reach Graph
+        """
+        self.window_start = min(self.high_water_mark, max(self.window_start, self.high_water_mark - settle_time))
+        self.recent_ids = {
+            record_id: timestamp
+            for record_id, timestamp in self.recent_ids.items()
+            if timestamp >= self.window_start
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the checkpoint
+
+        Returns:
+            Dict[str, Any]: JSON-compatible representation
+        """
+        return {
+            "high_water_mark": self.high_water_mark.isoformat() + "Z",
+            "window_start": self.window_start.isoformat() + "Z",
+            "recent_ids": {
+                record_id: timestamp.isoformat() + "Z"
+                for record_id, timestamp in sorted(self.recent_ids.items())
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Checkpoint":
+        """
+        Deserialize a checkpoint
+
+        Checkpoints saved before the settle window only hold the ids at the
+        high-water mark, so their window starts at the mark
+
+        Args:
+            data: Representation created by to_dict
+
+        Returns:
+            Checkpoint: The checkpoint
+        """
+        high_water_mark = parse_timestamp(data["high_water_mark"])
+        if "recent_ids" not in data:
+            return cls(high_water_mark, dict.fromkeys(data.get("boundary_ids", ()), high_water_mark))
+
+        return cls(
+            high_water_mark,
+            {record_id: parse_timestamp(timestamp) for record_id, timestamp in data["recent_ids"].items()},
+            parse_timestamp(data["window_start"]),
+        )
+
+
+class CheckpointStore:
+    """
+    Directory of checkpoint files, one per query
+
+    Files are replaced atomically, so an interrupted run leaves the previous
+    checkpoint intact
+    """
+
+    def __init__(self, state_dir: Path):
+        """
+        Initialize the store
+
+        Args:
+            state_dir: Directory holding the checkpoint files
+        """
+        self.state_dir = Path(state_dir)
+        self.logger = logging.getLogger(__name__)
+
+    def key(self, name: str, **query: Optional[str]) -> str:
+        """
+        Build the key of a query
+
+        Args:
+            name: Kind of export, e.g. "signins"
+            **query: Filters that identify the query, None values are ignored
+
+        Returns:
+            str: Key usable as a file name
+        """
+        parts = {field: value for field, value in sorted(query.items()) if value is not None}
+        if not parts:
+            return name
+        digest = hashlib.sha1(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+        return f"{name}-{digest[:12]}"
+
+    def load(self, key: str) -> Optional[Checkpoint]:
+        """
+        Load the checkpoint of a query
+
+        Args:
+            key: Query key
+
+        Returns:
+            Optional[Checkpoint]: The checkpoint, or None on the first run
+        """
+        path = self._path(key)
+        if not path.exists():
+            return None
+
+        with open(path, "r", encoding="utf-8") as f:
+            checkpoint = Checkpoint.from_dict(json.load(f))
+
+        self.logger.debug(f"Loaded checkpoint {key} at {checkpoint.high_water_mark.isoformat()}Z")
+        return checkpoint
+
+    def save(self, key: str, checkpoint: Checkpoint) -> None:
+        """
+        Save the checkpoint of a query
+
+        Args:
+            key: Query key
+            checkpoint: Checkpoint to save
+        """
+        write_json_atomic(self._path(key), checkpoint.to_dict())
+        self.logger.debug(f"Saved checkpoint {key} at {checkpoint.high_water_mark.isoformat()}Z")
+
+    def _path(self, key: str) -> Path:
+        """
+        Get the file path of a query key
+
+        Args:
+            key: Query key
+
+        Returns:
+            Path: Checkpoint file path
+        """
+        return self.state_dir / f"{key}.json"
+
+
+class IncrementalSync:
+    """
+    One incremental run of a query
+
+    Provides the start of the window to fetch, which trails the previous
+    high-water mark by the settle time, drops records that an earlier run
+    already exported and saves the advanced checkpoint once the caller has
+    processed every record
+    """
+
+    def __init__(
+        self,
+        store: CheckpointStore,
+        key: str,
+        lookback: timedelta,
+        settle_time: timedelta = DEFAULT_SETTLE_TIME,
+    ):
+        """
+        Initialize the run
+
+        Args:
+            store: Checkpoint store
+            key: Query key
+            lookback: Window to fetch when the query has no checkpoint yet
+            settle_time: Time sign-ins may take to reach Graph; records this
+                much older than the newest exported one are fetched again
+        """
+        self.store = store
+        self.key = key
+        self.settle_time = settle_time
+        self.logger = logging.getLogger(__name__)
+
+        self.previous = store.load(key)
+        self.start_date = (
+            self.previous.window_start if self.previous else datetime.utcnow() - lookback
+        )
+        self.checkpoint: Optional[Checkpoint] = None
+        if self.previous:
+            self.checkpoint = Checkpoint(
+                self.previous.high_water_mark,
+                self.previous.recent_ids,
+                self.previous.window_start,
+            )
+        self.new_count = 0
+
+    def filter(
+        self,
+        records: Iterable[Dict[str, Any]],
+        timestamp_key: str = "createdDateTime",
+        id_key: str = "id",
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield only the records newer than the previous checkpoint
+
+        Args:
+            records: Records fetched from start_date onwards
+            timestamp_key: Key of the record timestamp
+            id_key: Key of the record id
+
+        Yields:
+            Dict[str, Any]: New records
+        """
+        for record in records:
+            timestamp = parse_timestamp(record[timestamp_key])
+            record_id = str(record[id_key])
+
+            if self.previous and not self.previous.is_new(timestamp, record_id):
+                continue
+
+            if self.checkpoint is None:
+                self.checkpoint = Checkpoint(timestamp, window_start=self.start_date)
+            self.checkpoint.advance(timestamp, record_id)
+
+            self.new_count += 1
+            yield record
+
+    def commit(self) -> None:
+        """Save the advanced checkpoint"""
+        if self.checkpoint is None:
+            self.logger.info(f"No records for {self.key} yet, nothing to checkpoint")
+            return
+
+        self.checkpoint.settle(self.settle_time)
+        self.store.save(self.key, self.checkpoint)
+        self.logger.info(
+            f"{self.new_count} new records for {self.key}, "
+            f"high-water mark now {self.checkpoint.high_water_mark.isoformat()}Z"
+        )
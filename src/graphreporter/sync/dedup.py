@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphReporter Deduplication
+Drops records fetched twice by overlapping, parallel or retried chunk queries
+"""
+
+import bisect
+import hashlib
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from graphreporter.sync.checkpoint import parse_timestamp
+
+# Records this close to a chunk boundary are checked against an exact set of ids
+DEFAULT_BOUNDARY_MARGIN = timedelta(minutes=1)
+
+# False positive rate of the whole-run filter: the share of unique records
+# far from any boundary that would be dropped as duplicates
+DEFAULT_ERROR_RATE = 1e-6
+
+
+class BloomFilter:
+    """
+    Fixed-size probabilistic set of strings
+
+    Never misses a string that was added, and reports a string that was not
+    added with a probability of about error_rate once capacity strings were
+    added
+    """
+
+    def __init__(self, capacity: int, error_rate: float = DEFAULT_ERROR_RATE):
+        """
+        Initialize the filter
+
+        Args:
+            capacity: Expected number of strings
+            error_rate: False positive rate at capacity
+
+        Raises:
+            ValueError: If capacity or error_rate is out of range
+        """
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("Bloom filter needs a positive capacity and an error rate between 0 and 1")
+
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, key: str) -> bool:
+        """
+        Add a string
+
+        Args:
+            key: String to add
+
+        Returns:
+            bool: True if the string was probably added before
+        """
+        present = True
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                present = False
+                self.bits[byte] |= 1 << bit
+        return present
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Check whether a string was probably added
+
+        Args:
+            key: String to check
+
+        Returns:
+            bool: False if the string was certainly not added
+        """
+        return all(self.bits[position // 8] & (1 << position % 8) for position in self._positions(key))
+
+    def _positions(self, key: str) -> Iterator[int]:
+        """
+        Get the bit positions of a string, by double hashing
+
+        Args:
+            key: String to hash
+
+        Yields:
+            int: Bit position
+        """
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+
+class Deduplicator:
+    """
+    Deduplication stage keyed on record id
+
+    Chunked queries filter both ends inclusively, so records exactly at a
+    chunk boundary are returned by both neighbouring chunks. Records within
+    margin of a boundary are checked against an exact set of ids, which only
+    grows with the records near boundaries. Duplicates anywhere in the run,
+    from retried or overlapping chunks, are caught by an optional Bloom
+    filter, at the cost of dropping about error_rate of the other records.
+    """
+
+    def __init__(
+        self,
+        boundaries: Iterable[datetime] = (),
+        margin: timedelta = DEFAULT_BOUNDARY_MARGIN,
+        capacity: Optional[int] = None,
+        error_rate: float = DEFAULT_ERROR_RATE,
+    ):
+        """
+        Initialize the stage
+
+        Args:
+            boundaries: Chunk boundaries, as naive UTC
+            margin: Distance from a boundary within which ids are kept exactly
+            capacity: Expected records of the run, enables the whole-run
+                Bloom filter if given
+            error_rate: False positive rate of the Bloom filter
+        """
+        self.boundaries: List[datetime] = sorted(set(boundaries))
+        self.margin = margin
+        self.bloom = BloomFilter(capacity, error_rate) if capacity else None
+
+        self.boundary_ids: Set[str] = set()
+        self.seen = 0
+        self.boundary_duplicates = 0
+        self.probable_duplicates = 0
+
+    @property
+    def duplicates(self) -> int:
+        """Number of records dropped as duplicates"""
+        return self.boundary_duplicates + self.probable_duplicates
+
+    @property
+    def unique(self) -> int:
+        """Number of records passed on"""
+        return self.seen - self.duplicates
+
+    def is_new(self, record_id: str, timestamp: datetime) -> bool:
+        """
+        Check a record and remember it
+
+        Args:
+            record_id: Record id
+            timestamp: Record timestamp, as naive UTC
+
+        Returns:
+            bool: True if the record was not seen before
+        """
+        self.seen += 1
+
+        if self._near_boundary(timestamp):
+            if record_id in self.boundary_ids:
+                self.boundary_duplicates += 1
+                return False
+            self.boundary_ids.add(record_id)
+        elif self.bloom is not None and self.bloom.add(record_id):
+            self.probable_duplicates += 1
+            return False
+
+        return True
+
+    def filter(
+        self,
+        records: Iterable[Dict[str, Any]],
+        timestamp_key: str = "createdDateTime",
+        id_key: str = "id",
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield only the records not seen before
+
+        Args:
+            records: Records of any chunk of the run
+            timestamp_key: Key of the record timestamp
+            id_key: Key of the record id
+
+        Yields:
+            Dict[str, Any]: New records
+        """
+        for record in records:
+            if self.is_new_record(record, timestamp_key, id_key):
+                yield record
+
+    def is_new_record(
+        self,
+        record: Dict[str, Any],
+        timestamp_key: str = "createdDateTime",
+        id_key: str = "id",
+    ) -> bool:
+        """
+        Check a record given as a dictionary and remember it
+
+        Args:
+            record: Record with an id and a timestamp
+            timestamp_key: Key of the record timestamp
+            id_key: Key of the record id
+
+        Returns:
+            bool: True if the record was not seen before
+        """
+        return self.is_new(str(record[id_key]), parse_timestamp(record[timestamp_key]))
+
+    def counters(self) -> Dict[str, int]:
+        """
+        Get the counters of the stage
+
+        Returns:
+            Dict[str, int]: Records seen, unique and dropped, by cause
+        """
+        return {
+            "seen": self.seen,
+            "unique": self.unique,
+            "duplicates": self.duplicates,
+            "boundary_duplicates": self.boundary_duplicates,
+            "probable_duplicates": self.probable_duplicates,
+            "boundary_ids": len(self.boundary_ids),
+        }
+
+    def summary(self) -> str:
+        """
+        Describe the counters for an export summary
+
+        Returns:
+            str: One-line summary
+        """
+        text = (
+            f"Duplicates dropped: {self.duplicates} of {self.seen} records "
+            f"({self.boundary_duplicates} at chunk boundaries"
+        )
+        if self.bloom is not None:
+            text += f", {self.probable_duplicates} by the whole-run filter"
+        return text + ")"
+
+    def _near_boundary(self, timestamp: datetime) -> bool:
+        """
+        Check whether a timestamp is within margin of a chunk boundary
+
+        Args:
+            timestamp: Record timestamp, as naive UTC
+
+        Returns:
+            bool: True if the record may be returned by two chunks
+        """
+        i = bisect.bisect_left(self.boundaries, timestamp - self.margin)
+        return i < len(self.boundaries) and self.boundaries[i] <= timestamp + self.margin
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphReporter Delta Sync
+Keeps a local snapshot of a directory collection up to date with Graph delta queries
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from graphreporter.utils.helpers import write_json_atomic
+
+if TYPE_CHECKING:
+    from graphreporter.graph.client import GraphClient
+
+
+# Error codes Graph returns when a deltaLink can no longer be used
+RESYNC_ERROR_CODES = ("resyncRequired", "syncStateNotFound", "syncStateInvalid")
+
+
+class DeltaSync:
+    """
+    Delta sync of a directory collection such as applications
+
+    The first sync walks /<resource>/delta in full and saves every object
+    together with the @odata.deltaLink of the last page. Later syncs follow
+    the deltaLink and apply only the objects added, changed or removed since,
+    so a sync with no changes costs a single request.
+    """
+
+    def __init__(self, client: "GraphClient", resource: str, select: str, state_dir: Path):
+        """
+        Initialize the delta sync
+
+        Args:
+            client: Graph client used to send the requests
+            resource: Collection path, e.g. "applications"
+            select: Comma-separated properties to keep in the snapshot
+            state_dir: Directory holding the snapshot file
+        """
+        self.client = client
+        self.resource = resource
+        self.select = select
+        self.path = Path(state_dir) / f"{resource}-delta.json"
+        self.logger = logging.getLogger(__name__)
+
+        self.added = 0
+        self.updated = 0
+        self.removed = 0
+
+    def sync(self) -> List[Dict[str, Any]]:
+        """
+        Bring the snapshot up to date
+
+        Falls back to a full sync when there is no snapshot yet, the selected
+        properties changed, or Graph no longer accepts the saved deltaLink
+
+        Returns:
+            List[Dict[str, Any]]: Every object currently in the collection
+
+        Raises:
+            ValueError: If API request fails
+        """
+        state = self._load()
+
+        if state:
+            try:
+                return self._apply(state["objects"], state["delta_link"])
+            except ValueError as e:
+                if not any(code in str(e) for code in RESYNC_ERROR_CODES):
+                    raise
+                self.logger.warning(f"Delta token for {self.resource} expired, running a full sync")
+
+        self.logger.info(f"Running full delta sync of {self.resource}")
+        return self._apply({}, f"{self.resource}/delta", {"$select": self.select})
+
+    def _apply(
+        self,
+        objects: Dict[str, Dict[str, Any]],
+        url: str,
+        params: Optional[Dict[str, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Walk a delta round and apply its changes to the snapshot
+
+        The snapshot is only saved once the round's deltaLink has arrived, so
+        an interrupted round is repeated in full from the previous deltaLink
+
+        Args:
+            objects: Snapshot objects by id, updated in place
+            url: Delta path or deltaLink
+            params: Query parameters of the first request
+
+        Returns:
+            List[Dict[str, Any]]: Every object in the updated snapshot
+        """
+        self.added = self.updated = self.removed = 0
+        delta_link = None
+
+        for page in self.client.iter_pages(url, params):
+            for item in page.get("value", []):
+                self._apply_item(objects, item)
+            delta_link = page.get("@odata.deltaLink", delta_link)
+
+        if not delta_link:
+            raise ValueError(f"Graph API request failed: no deltaLink returned for {self.resource}")
+
+        write_json_atomic(self.path, {
+            "resource": self.resource,
+            "select": self.select,
+            "delta_link": delta_link,
+            "objects": objects,
+        })
+
+        self.logger.info(
+            f"Synced {self.resource}: {self.added} added, {self.updated} updated, "
+            f"{self.removed} removed, {len(objects)} total"
+        )
+        return list(objects.values())
+
+    def _apply_item(self, objects: Dict[str, Dict[str, Any]], item: Dict[str, Any]) -> None:
+        """
+        Apply one delta item to the snapshot
+
+        Changed objects may carry only the properties that changed, so they are
+        merged into the existing object rather than replacing it
+
+        Args:
+            objects: Snapshot objects by id
+            item: Delta item
+        """
+        object_id = item.get("id")
+        if object_id is None:
+            return
+
+        if "@removed" in item:
+            if objects.pop(object_id, None) is not None:
+                self.removed += 1
+            return
+
+        item = {key: value for key, value in item.items() if not key.startswith("@")}
+        if object_id in objects:
+            objects[object_id].update(item)
+            self.updated += 1
+        else:
+            objects[object_id] = item
+            self.added += 1
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the saved snapshot
+
+        Returns:
+            Optional[Dict[str, Any]]: Saved state, or None if there is no usable snapshot
+        """
+        if not self.path.exists():
+            return None
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+
+        if state.get("select") != self.select:
+            self.logger.info(f"Selected properties of {self.resource} changed, discarding snapshot")
+            return None
+        return state
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphReporter Resumable Exports
+On-disk progress of long exports, so an interrupted run can continue where it stopped
+"""
+
+import json
+import logging
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple
+
+from graphreporter.utils.helpers import write_json_atomic
+
+if TYPE_CHECKING:
+    from graphreporter.graph.client import GraphClient
+
+
+class ExportJournal:
+    """
+    Progress journal of an export split into chunks
+
+    Records the export's date window and, per chunk, the nextLink of the last
+    page committed to the output, the number of records written so far, the
+    output file, its size after the last committed page and whether the chunk
+    is complete. Every commit rewrites the journal atomically.
+    """
+
+    def __init__(self, state_dir: Path, key: str):
+        """
+        Initialize the journal
+
+        Args:
+            state_dir: Directory holding the journal file
+            key: Name of the export, unique per query; characters that are
+                not safe in file names are replaced
+        """
+        safe_key = re.sub(r"[^\w.-]+", "_", key)
+        self.path = Path(state_dir) / f"{safe_key}-resume.json"
+        self.logger = logging.getLogger(__name__)
+
+        self._state: Dict[str, Any] = {"window": None, "chunks": {}}
+        self._lock = threading.Lock()
+
+    def start(self, start_date: datetime, end_date: datetime, resume: bool = False) -> Tuple[datetime, datetime]:
+        """
+        Start or resume the export
+
+        A resumed export keeps the window of the interrupted run, so its chunks
+        line up with the ones already written
+
+        Args:
+            start_date: Start of the window of a new export
+            end_date: End of the window of a new export
+            resume: Whether to continue a previous run instead of starting over
+
+        Returns:
+            Tuple[datetime, datetime]: Window to export
+        """
+        if resume and self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._state = json.load(f)
+            start, end = self._state["window"]
+            done = sum(1 for chunk in self._state["chunks"].values() if chunk.get("complete"))
+            self.logger.info(f"Resuming export from {self.path} with {done} completed chunks")
+            return datetime.fromisoformat(start), datetime.fromisoformat(end)
+
+        if resume:
+            self.logger.info(f"Nothing to resume in {self.path}, starting a new export")
+
+        self._state = {"window": [start_date.isoformat(), end_date.isoformat()], "chunks": {}}
+        self._save()
+        return start_date, end_date
+
+    def chunk(self, chunk_id: str) -> Dict[str, Any]:
+        """
+        Get the progress of a chunk
+
+        Args:
+            chunk_id: Chunk identifier
+
+        Returns:
+            Dict[str, Any]: next_link, written, output, offset and complete,
+            empty if the chunk has not started
+        """
+        with self._lock:
+            return dict(self._state["chunks"].get(chunk_id, {}))
+
+    def is_complete(self, chunk_id: str) -> bool:
+        """
+        Check whether a chunk was fully written to an output that still exists
+
+        Args:
+            chunk_id: Chunk identifier
+
+        Returns:
+            bool: True if the chunk can be skipped
+        """
+        chunk = self.chunk(chunk_id)
+        if not chunk.get("complete"):
+            return False
+        return chunk.get("output") is None or Path(chunk["output"]).exists()
+
+    def commit_page(
+        self,
+        chunk_id: str,
+        next_link: Optional[str],
+        written: int,
+        output: Optional[str] = None,
+        offset: Optional[int] = None,
+    ) -> None:
+        """
+        Record that a page has been written to the output
+
+        Args:
+            chunk_id: Chunk identifier
+            next_link: nextLink of the page, where the chunk continues
+            written: Records of the chunk written so far
+            output: Output file of the chunk
+            offset: Size of the output file in bytes after the page, which
+                a resumed run truncates the file to before writing again
+        """
+        self._update(chunk_id, next_link=next_link, written=written, output=output, offset=offset, complete=False)
+
+    def complete(self, chunk_id: str, written: int, output: Optional[str] = None) -> None:
+        """
+        Record that a chunk has been fully written
+
+        Args:
+            chunk_id: Chunk identifier
+            written: Records of the chunk written
+            output: Output file of the chunk, or None if it had no records
+        """
+        self._update(chunk_id, next_link=None, written=written, output=output, offset=None, complete=True)
+
+    def clear(self) -> None:
+        """Remove the journal once the export has finished"""
+        if self.path.exists():
+            self.path.unlink()
+
+    def _update(self, chunk_id: str, **progress: Any) -> None:
+        """
+        Update the progress of a chunk and save the journal
+
+        Args:
+            chunk_id: Chunk identifier
+            **progress: Progress fields
+        """
+        with self._lock:
+            self._state["chunks"][chunk_id] = progress
+            self._save()
+
+    def _save(self) -> None:
+        """Write the journal to disk"""
+        write_json_atomic(self.path, self._state)
+
+
+def iter_resumable_pages(
+    client: "GraphClient",
+    journal: ExportJournal,
+    chunk_id: str,
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    output: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Get the pages of a chunk, continuing after its last committed page
+
+    A page is committed when the next one is requested, so the caller must
+    have written each page to its output before iterating further. A complete
+    chunk yields nothing.
+
+    Args:
+        client: Graph client used to send the requests
+        journal: Journal of the export
+        chunk_id: Chunk identifier
+        path: API path relative to graph endpoint
+        params: Query parameters
+        output: Output file of the chunk, recorded in the journal
+
+    Yields:
+        Dict[str, Any]: API response of each page not yet committed
+    """
+    progress = journal.chunk(chunk_id)
+    if progress.get("complete"):
+        return
+
+    written = progress.get("written", 0)
+    next_link = progress.get("next_link")
+    if next_link:
+        logging.getLogger(__name__).info(f"Resuming chunk {chunk_id} after {written} records")
+    elif written:
+        # Progress without a nextLink cannot be resumed mid-chunk
+        written = 0
+
+    for page in client.iter_pages(path, params, next_link=next_link):
+        yield page
+
+        written += len(page.get("value", []))
+        if page.get("@odata.nextLink"):
+            journal.commit_page(chunk_id, page["@odata.nextLink"], written, output)
+
+    journal.complete(chunk_id, written, output)
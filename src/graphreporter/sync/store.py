@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GraphReporter Sign-In Store
+Local SQLite copy of fetched sign-ins with an index of the time ranges it covers
+"""
+
+import itertools
+import json
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from graphreporter.graph.odata import ODataFilter
+from graphreporter.graph.streaming import loads
+from graphreporter.schema.signins import select_properties
+from graphreporter.sync.checkpoint import parse_timestamp
+
+# File name of the store in the state directory
+SIGNIN_STORE_FILE = "signins.sqlite3"
+
+# Rows inserted per statement
+INSERT_BATCH_SIZE = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signins (
+    id TEXT PRIMARY KEY,
+    created TEXT NOT NULL,
+    user_id TEXT,
+    user_principal_name TEXT COLLATE NOCASE,
+    app_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS signins_created ON signins (created);
+CREATE INDEX IF NOT EXISTS signins_user ON signins (user_principal_name, created);
+CREATE INDEX IF NOT EXISTS signins_user_id ON signins (user_id, created);
+CREATE INDEX IF NOT EXISTS signins_app ON signins (app_id, created);
+CREATE TABLE IF NOT EXISTS coverage (
+    filter TEXT NOT NULL,
+    start TEXT NOT NULL,
+    end TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS coverage_filter ON coverage (filter, start);
+"""
+
+
+def _timestamp(value: datetime) -> str:
+    """
+    Format a naive UTC datetime so that text order is time order
+
+    Args:
+        value: Naive UTC datetime
+
+    Returns:
+        str: Fixed-width ISO 8601 text
+    """
+    return value.strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+class SignInStore:
+    """
+    Local store of sign-ins fetched from Graph
+
+    Keeps every fetched sign-in once, keyed by id, along with the closed time
+    ranges for which all sign-ins matching a filter are stored. A range
+    covered for a filter also covers any narrower filter: sign-ins fetched
+    without filters answer queries for a single user or application.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open or create the store
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+
+        self._db = sqlite3.connect(str(self.path))
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database"""
+        self._db.close()
+
+    def missing(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        user_id: Optional[str] = None,
+        app_id: Optional[str] = None,
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        Get the parts of a query range that are not covered yet
+
+        Args:
+            start_date: Start of the range, as naive UTC
+            end_date: End of the range, as naive UTC
+            user_id: Filter by user ID or userPrincipalName
+            app_id: Filter by application ID
+
+        Returns:
+            List[Tuple[datetime, datetime]]: Ranges to fetch from Graph, oldest first
+        """
+        gaps = []
+        cursor = start_date
+        for covered_start, covered_end in self._covered(start_date, end_date, user_id, app_id):
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+        if cursor < end_date:
+            gaps.append((cursor, end_date))
+        return gaps
+
+    def save(
+        self,
+        records: Iterable[Dict[str, Any]],
+        start_date: datetime,
+        end_date: datetime,
+        user_id: Optional[str] = None,
+        app_id: Optional[str] = None,
+    ) -> int:
+        """
+        Store the sign-ins fetched for a range and mark the range as covered
+
+        Records and coverage are committed together, so a fetch that fails
+        midway leaves its range uncovered.
+
+        Args:
+            records: Every sign-in matching the filters in the range
+            start_date: Start of the range, as naive UTC
+            end_date: End of the range up to which the records are complete;
+                nothing is marked if it is not after start_date
+            user_id: Filter the records were fetched with
+            app_id: Filter the records were fetched with
+
+        Returns:
+            int: Number of records stored
+        """
+        count = 0
+        with self._db:
+            records = iter(records)
+            while True:
+                batch = list(itertools.islice(records, INSERT_BATCH_SIZE))
+                if not batch:
+                    break
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO signins VALUES (?, ?, ?, ?, ?, ?)",
+                    [self._row(record) for record in batch],
+                )
+                count += len(batch)
+
+            if end_date > start_date:
+                self._mark_covered(self._filter_key(user_id, app_id), start_date, end_date)
+
+        self.logger.debug(f"Stored {count} sign-ins for {start_date.isoformat()}Z to {end_date.isoformat()}Z")
+        return count
+
+    def query(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        user_id: Optional[str] = None,
+        app_id: Optional[str] = None,
+        columns: Optional[Iterable[str]] = None,
+        odata_filter: Optional[Union[str, ODataFilter]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Get stored sign-ins, as Graph would return them
+
+        Args:
+            start_date: Start of the range, as naive UTC, inclusive
+            end_date: End of the range, as naive UTC, inclusive
+            user_id: Filter by user ID or userPrincipalName
+            app_id: Filter by application ID
+            columns: Output columns or signIn property paths; only their
+                top-level properties are returned, like $select
+            odata_filter: Further $filter expression evaluated locally,
+                including filters Graph rejects for sign-ins such as
+                contains(appDisplayName, 'portal')
+
+        Yields:
+            Dict[str, Any]: Sign-ins in createdDateTime desc order
+        """
+        properties = select_properties(columns) if columns is not None else None
+        where = ODataFilter(odata_filter) if isinstance(odata_filter, str) else odata_filter
+
+        sql = "SELECT data FROM signins WHERE created >= ? AND created <= ?"
+        params: List[Any] = [_timestamp(start_date), _timestamp(end_date)]
+        if user_id:
+            sql += " AND (user_principal_name = ? OR user_id = ?)"
+            params += [user_id, user_id]
+        if app_id:
+            sql += " AND app_id = ?"
+            params.append(app_id)
+        sql += " ORDER BY created DESC"
+
+        for (data,) in self._db.execute(sql, params):
+            record = loads(data)
+            if where is not None and not where.matches(record):
+                continue
+            if properties is not None:
+                record = {prop: record.get(prop) for prop in properties}
+            yield record
+
+    def _covered(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        user_id: Optional[str],
+        app_id: Optional[str],
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        Get the covered ranges overlapping a query range
+
+        Args:
+            start_date: Start of the range, as naive UTC
+            end_date: End of the range, as naive UTC
+            user_id: Filter by user ID or userPrincipalName
+            app_id: Filter by application ID
+
+        Returns:
+            List[Tuple[datetime, datetime]]: Covered ranges of the filter and
+                of every broader filter, by start
+        """
+        filters = {"user_id": user_id, "app_id": app_id}
+        active = [name for name, value in filters.items() if value]
+        keys = [
+            self._filter_key(**{name: filters[name] for name in subset})
+            for size in range(len(active) + 1)
+            for subset in itertools.combinations(active, size)
+        ]
+
+        placeholders = ",".join("?" * len(keys))
+        rows = self._db.execute(
+            f"SELECT start, end FROM coverage WHERE filter IN ({placeholders}) AND end >= ? AND start <= ? ORDER BY start",
+            keys + [_timestamp(start_date), _timestamp(end_date)],
+        )
+        return [(datetime.fromisoformat(start), datetime.fromisoformat(end)) for start, end in rows]
+
+    def _mark_covered(self, key: str, start_date: datetime, end_date: datetime) -> None:
+        """
+        Add a covered range, merging it with the ranges it overlaps or touches
+
+        Args:
+            key: Filter key
+            start_date: Start of the range
+            end_date: End of the range
+        """
+        start, end = _timestamp(start_date), _timestamp(end_date)
+        overlapping = self._db.execute(
+            "SELECT rowid, start, end FROM coverage WHERE filter = ? AND end >= ? AND start <= ?",
+            (key, start, end),
+        ).fetchall()
+
+        for rowid, other_start, other_end in overlapping:
+            start, end = min(start, other_start), max(end, other_end)
+            self._db.execute("DELETE FROM coverage WHERE rowid = ?", (rowid,))
+
+        self._db.execute("INSERT INTO coverage VALUES (?, ?, ?)", (key, start, end))
+
+    def _filter_key(self, user_id: Optional[str] = None, app_id: Optional[str] = None) -> str:
+        """
+        Build the coverage key of a combination of filters
+
+        Args:
+            user_id: Filter by user ID or userPrincipalName
+            app_id: Filter by application ID
+
+        Returns:
+            str: Key, "{}" for no filters
+        """
+        filters = {"user_id": user_id.lower() if user_id else None, "app_id": app_id}
+        return json.dumps({name: value for name, value in filters.items() if value}, sort_keys=True)
+
+    def _row(self, record: Dict[str, Any]) -> Tuple[Any, ...]:
+        """
+        Get the table row of a sign-in
+
+        Args:
+            record: signIn object as decoded from the Graph JSON response
+
+        Returns:
+            Tuple[Any, ...]: Values of the signins table
+        """
+        return (
+            record["id"],
+            _timestamp(parse_timestamp(record["createdDateTime"])),
+            record.get("userId"),
+            record.get("userPrincipalName"),
+            record.get("appId"),
+            json.dumps(record, separators=(",", ":")),
+        )
@@ -3,9 +3,17 @@ GraphReporter Utility Functions
 Helper functions for the GraphReporter application
 """
 
+import asyncio
+import itertools
+import json
 import logging
+import os
+import queue
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
 
 
 def setup_logging(log_level: str = "INFO", log_file: Optional[Path] = None) -> None:
@@ -59,4 +67,137 @@ def format_file_size(size_bytes: int) -> str:
             break
         size_bytes /= 1024.0
     
-    return f"{size_bytes:.2f} {unit}" 
\ No newline at end of file
+    return f"{size_bytes:.2f} {unit}" 
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """
+    Write a JSON file so that readers see either the old or the new content
+    
+    The data is written to a temporary file next to the target, which then
+    replaces it, so an interrupted write never leaves a truncated file behind
+    
+    Args:
+        path: Target file path
+        data: JSON-compatible data
+    """
+    write_bytes_atomic(path, json.dumps(data).encode("utf-8"))
+
+
+def write_bytes_atomic(path: Path, data: bytes, mode: int = 0o666) -> None:
+    """
+    Write a file so that readers see either the old or the new content
+    
+    Args:
+        path: Target file path
+        data: File content
+        mode: Permissions of a newly created file, before the umask is applied
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(path.name + ".tmp")
+    
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def iterate_in_thread(produce: Callable[[Callable[[T], bool]], None], max_buffered: int = 1000) -> Iterator[T]:
+    """
+    Run a producer on a background thread and consume its items
+    
+    The producer is called with a put function and hands items over through a
+    bounded queue, so a slow consumer applies backpressure instead of letting
+    the buffer grow. put returns False once the consumer has stopped reading,
+    and the producer should return when it does. Exceptions raised by the
+    producer are re-raised in the consumer.
+    
+    Args:
+        produce: Callable that passes every item to put
+        max_buffered: Maximum number of items buffered between the threads
+        
+    Yields:
+        T: Items handed over by the producer
+    """
+    items: "queue.Queue" = queue.Queue(maxsize=max(1, max_buffered))
+    stop = threading.Event()
+    done = object()
+    
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def run() -> None:
+        error = None
+        try:
+            produce(put)
+        except BaseException as e:
+            error = e
+        put((done, error))
+    
+    thread = threading.Thread(target=run, name="iterate-in-thread", daemon=True)
+    thread.start()
+    
+    try:
+        while True:
+            item = items.get()
+            if isinstance(item, tuple) and len(item) == 2 and item[0] is done:
+                if item[1] is not None:
+                    raise item[1]
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def iterate_async(aiterator: AsyncIterator[T], max_buffered: int = 1000) -> Iterator[T]:
+    """
+    Consume an async iterator from synchronous code
+    
+    The async iterator runs in its own event loop on a background thread, see
+    iterate_in_thread
+    
+    Args:
+        aiterator: Async iterator to consume
+        max_buffered: Maximum number of items buffered between the threads
+        
+    Yields:
+        T: Items of the async iterator
+    """
+    async def pump(put: Callable[[T], bool]) -> None:
+        try:
+            async for item in aiterator:
+                if not put(item):
+                    break
+        finally:
+            aclose = getattr(aiterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+    
+    return iterate_in_thread(lambda put: asyncio.run(pump(put)), max_buffered)
+
+
+def iter_batches(items: Iterable[T], batch_size: int) -> Iterator[List[T]]:
+    """
+    Split an iterable into lists of at most batch_size items
+    
+    Args:
+        items: Items to split
+        batch_size: Maximum number of items per batch
+        
+    Yields:
+        List[T]: Consecutive batches, only the last one may be shorter
+    """
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
@@ -4,13 +4,14 @@
 Test for the authentication client
 """
 
+import time
+
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 
-from azure.identity.aio import ClientSecretCredential
 from msgraph import GraphServiceClient
 
-from graphreporter.auth.client import AuthClient
+from graphreporter.auth.client import AuthClient, CachedCredential
 from graphreporter.config.settings import Settings
 
 
@@ -24,64 +25,87 @@ class TestAuthClient:
         self.settings.tenant_id = "test-tenant-id"
         self.settings.client_id = "test-client-id"
         self.settings.client_secret = "test-client-secret"
+        self.settings.scopes = ["https://graph.microsoft.com/.default"]
+        self.settings.token_cache = False
         
         # Create auth client
         self.auth_client = AuthClient(self.settings)
     
+    def teardown_method(self):
+        """Stop the background refresh"""
+        self.auth_client._stop_refresh.set()
+    
+    def _mock_app(self, *tokens):
+        """Serve the given access tokens from a mocked MSAL application"""
+        app = MagicMock()
+        app.acquire_token_for_client.side_effect = [
+            {"access_token": token, "expires_in": 3600} for token in tokens
+        ]
+        self.auth_client._app = app
+        return app
+    
     def test_credential_creation(self):
-        """Test credential creation with correct parameters"""
-        # Set up mock
-        with patch('azure.identity.aio.ClientSecretCredential') as mock_credential:
-            mock_credential_instance = MagicMock(spec=ClientSecretCredential)
-            mock_credential.return_value = mock_credential_instance
-            
-            # Get credential property
-            credential = self.auth_client.credential
-            
-            # Check credential creation with correct parameters
-            mock_credential.assert_called_once_with(
-                tenant_id="test-tenant-id",
-                client_id="test-client-id",
-                client_secret="test-client-secret"
-            )
-            
-            # Check credential property returns the credential
-            assert credential == mock_credential_instance
+        """Test that the SDK credential is a CachedCredential bound to the client"""
+        credential = self.auth_client.credential
+        
+        assert isinstance(credential, CachedCredential)
+        assert credential.auth_client is self.auth_client
+        assert self.auth_client.credential is credential
     
     def test_client_creation(self):
         """Test Graph client creation"""
-        # Set up mocks
-        with patch('azure.identity.aio.ClientSecretCredential') as mock_credential, \
-             patch('msgraph.GraphServiceClient') as mock_graph_client:
-            
-            mock_credential_instance = MagicMock(spec=ClientSecretCredential)
-            mock_credential.return_value = mock_credential_instance
-            
+        with patch('msgraph.GraphServiceClient') as mock_graph_client:
             mock_client_instance = MagicMock(spec=GraphServiceClient)
             mock_graph_client.return_value = mock_client_instance
             
             # Get client
             client = self.auth_client.get_client()
             
-            # Check client creation with correct parameters
+            # Check client creation with the cached credential
             mock_graph_client.assert_called_once_with(
-                credentials=mock_credential_instance,
+                credentials=self.auth_client.credential,
                 scopes=['https://graph.microsoft.com/.default']
             )
             
             # Check client is returned correctly
             assert client == mock_client_instance
     
+    @pytest.mark.asyncio
+    async def test_credential_refreshes_expiring_token(self):
+        """Test that the credential serves the cached token and acquires a new one once it expires"""
+        app = self._mock_app("first-token", "second-token")
+        credential = self.auth_client.credential
+        
+        token = await credential.get_token("https://graph.microsoft.com/.default")
+        assert token.token == "first-token"
+        assert token.expires_on == int(self.auth_client.expires_on)
+        
+        # Served from memory while the token is valid
+        assert (await credential.get_token()).token == "first-token"
+        assert app.acquire_token_for_client.call_count == 1
+        
+        # Expiring soon, so a new token is acquired
+        self.auth_client.expires_on = time.time() + 10
+        assert (await credential.get_token()).token == "second-token"
+        assert app.acquire_token_for_client.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_credential_claims_bypass_the_cache(self):
+        """Test that a claims challenge acquires a new token"""
+        app = self._mock_app("first-token", "claims-token")
+        credential = self.auth_client.credential
+        await credential.get_token()
+        
+        token = await credential.get_token(claims='{"access_token": {}}')
+        
+        assert token.token == "claims-token"
+        assert app.acquire_token_for_client.call_args.kwargs["claims_challenge"] == '{"access_token": {}}'
+    
     @pytest.mark.asyncio
     async def test_authentication_success(self):
         """Test successful authentication"""
         # Set up mocks
-        with patch('azure.identity.aio.ClientSecretCredential') as mock_credential, \
-             patch('msgraph.GraphServiceClient') as mock_graph_client:
-            
-            mock_credential_instance = MagicMock(spec=ClientSecretCredential)
-            mock_credential.return_value = mock_credential_instance
-            
+        with patch('msgraph.GraphServiceClient') as mock_graph_client:
             mock_client_instance = MagicMock(spec=GraphServiceClient)
             mock_org_response = MagicMock()
             mock_org_response.value = [{"id": "test-org"}]
@@ -100,12 +124,7 @@ class TestAuthClient:
     async def test_authentication_failure(self):
         """Test authentication failure"""
         # Set up mocks
-        with patch('azure.identity.aio.ClientSecretCredential') as mock_credential, \
-             patch('msgraph.GraphServiceClient') as mock_graph_client:
-            
-            mock_credential_instance = MagicMock(spec=ClientSecretCredential)
-            mock_credential.return_value = mock_credential_instance
-            
+        with patch('msgraph.GraphServiceClient') as mock_graph_client:
             mock_client_instance = MagicMock(spec=GraphServiceClient)
             mock_client_instance.organization = MagicMock()
             mock_client_instance.organization.get = AsyncMock(side_effect=Exception("Authentication failed"))
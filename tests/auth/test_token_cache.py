@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for the persistent token cache
+"""
+
+import time
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+from graphreporter.auth.client import AuthClient
+from graphreporter.auth.token_cache import EncryptedTokenCache, token_cache_path
+from graphreporter.config.settings import Settings
+
+
+def add_token(cache, access_token="cached-token"):
+    """Add an access token to an MSAL cache as a token response would"""
+    cache.add({
+        "client_id": "test-client-id",
+        "scope": ["https://graph.microsoft.com/.default"],
+        "token_endpoint": "https://login.microsoftonline.com/test-tenant-id/oauth2/v2.0/token",
+        "response": {"access_token": access_token, "expires_in": 3600, "token_type": "Bearer"},
+    })
+
+
+def cached_tokens(cache):
+    """Get the access tokens held by an MSAL cache"""
+    return [entry["secret"] for entry in cache.search(cache.CredentialType.ACCESS_TOKEN)]
+
+
+class TestEncryptedTokenCache:
+    """Test cases for the EncryptedTokenCache class"""
+
+    def test_tokens_survive_a_new_process(self, tmp_path):
+        """Test that a saved cache is read back encrypted with the same credentials"""
+        path = token_cache_path(tmp_path, "test-tenant-id", "test-client-id")
+        cache = EncryptedTokenCache(path, "test-tenant-id", "test-client-id", "secret")
+        add_token(cache)
+        cache.http_cache["discovery"] = {"issuer": "https://login.microsoftonline.com"}
+        cache.save()
+
+        assert b"cached-token" not in path.read_bytes()
+        assert path.stat().st_mode & 0o077 == 0
+
+        reloaded = EncryptedTokenCache(path, "test-tenant-id", "test-client-id", "secret")
+        assert cached_tokens(reloaded) == ["cached-token"]
+        assert reloaded.http_cache == cache.http_cache
+
+    def test_rotated_secret_starts_empty(self, tmp_path):
+        """Test that a cache written with another secret is ignored"""
+        path = token_cache_path(tmp_path, "test-tenant-id", "test-client-id")
+        cache = EncryptedTokenCache(path, "test-tenant-id", "test-client-id", "old-secret")
+        add_token(cache)
+        cache.save()
+
+        reloaded = EncryptedTokenCache(path, "test-tenant-id", "test-client-id", "new-secret")
+        assert cached_tokens(reloaded) == []
+
+
+class TestAuthClientTokens:
+    """Test cases for token acquisition through AuthClient"""
+
+    def setup_method(self):
+        """Set up test cases"""
+        self.settings = MagicMock(spec=Settings)
+        self.settings.tenant_id = "test-tenant-id"
+        self.settings.client_id = "test-client-id"
+        self.settings.client_secret = "test-client-secret"
+        self.settings.authority_url = "https://login.microsoftonline.com/test-tenant-id"
+        self.settings.scopes = ["https://graph.microsoft.com/.default"]
+        self.settings.token_cache = False
+
+    @pytest.mark.asyncio
+    async def test_auth_header_is_cached_until_expiry(self):
+        """Test that a token is only acquired again when it is about to expire"""
+        with patch('graphreporter.auth.client.msal.ConfidentialClientApplication') as app_class:
+            app = app_class.return_value
+            app.acquire_token_for_client.side_effect = [
+                {"access_token": "token-1", "expires_in": 3600},
+                {"access_token": "token-2", "expires_in": 3600},
+            ]
+            auth_client = AuthClient(self.settings)
+
+            first = auth_client.get_auth_header()
+            assert auth_client.get_auth_header() is first
+            assert await auth_client.get_auth_header_async() is first
+            assert first == {"Authorization": "Bearer token-1"}
+            assert app.acquire_token_for_client.call_count == 1
+
+            auth_client.expires_on = time.time() + 30
+            assert auth_client.get_auth_header() == {"Authorization": "Bearer token-2"}
+            assert app.acquire_token_for_client.call_count == 2
+
+            await auth_client.close()
+            assert auth_client._refresh_thread is None
+
+    @pytest.mark.asyncio
+    async def test_sdk_credential_uses_cached_token(self):
+        """Test that the Graph SDK credential is served from the same token"""
+        with patch('graphreporter.auth.client.msal.ConfidentialClientApplication') as app_class:
+            app_class.return_value.acquire_token_for_client.return_value = {"access_token": "token-1", "expires_in": 3600}
+            auth_client = AuthClient(self.settings)
+
+            access_token = await auth_client.credential.get_token("https://graph.microsoft.com/.default")
+            auth_client.get_auth_header()
+
+            assert access_token.token == "token-1"
+            assert access_token.expires_on == int(auth_client.expires_on)
+            assert app_class.return_value.acquire_token_for_client.call_count == 1
+            await auth_client.close()
+
+    def test_failed_acquisition_raises(self):
+        """Test that an error response is surfaced as ValueError"""
+        with patch('graphreporter.auth.client.msal.ConfidentialClientApplication') as app_class:
+            app_class.return_value.acquire_token_for_client.return_value = {
+                "error": "invalid_client", "error_description": "Invalid client secret",
+            }
+            auth_client = AuthClient(self.settings)
+
+            with pytest.raises(ValueError, match="Invalid client secret"):
+                auth_client.get_token()
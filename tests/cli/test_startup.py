@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Startup-time regression benchmark for the CLI
+"""
+
+import json
+import subprocess
+import sys
+import time
+
+import pytest
+
+
+# Modules the CLI entry point and the core clients must not load up front
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "msgraph", "azure.identity", "azure.core")
+
+# Wall-clock budget for importing the CLI, in seconds, best of several runs
+STARTUP_BUDGET = 1.0
+
+STARTUP_SCRIPT = """
+import json, sys
+import graphreporter.cli.main
+import graphreporter.auth.client
+import graphreporter.export
+import graphreporter.export.merge
+import graphreporter.graph.applications
+import graphreporter.graph.batch
+import graphreporter.graph.client
+import graphreporter.graph.odata
+import graphreporter.graph.serviceprincipals
+import graphreporter.graph.signins
+import graphreporter.schema.batch
+import graphreporter.sync.checkpoint
+import graphreporter.sync.dedup
+import graphreporter.sync.delta
+import graphreporter.sync.resume
+import graphreporter.sync.store
+print(json.dumps(sorted(m for m in {heavy!r} if m in sys.modules)))
+"""
+
+
+def run_startup() -> subprocess.CompletedProcess:
+    """Import the CLI, the Graph clients and the sync modules in a fresh interpreter"""
+    return subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT.format(heavy=HEAVY_MODULES)],
+        capture_output=True, text=True, check=True,
+    )
+
+
+class TestStartup:
+    """Test cases for CLI startup cost"""
+
+    def test_heavy_dependencies_are_not_imported(self):
+        """Test that pandas, openpyxl and the Graph SDK only load when used"""
+        result = run_startup()
+
+        assert json.loads(result.stdout) == []
+
+    def test_exporters_still_resolve(self):
+        """Test that lazily imported exporters are available from the package"""
+        from graphreporter.export import CSVExporter, get_exporter
+
+        assert CSVExporter.__name__ == "CSVExporter"
+        with pytest.raises(ValueError):
+            get_exporter("xml")
+
+    def test_startup_within_budget(self):
+        """Test that importing the CLI stays well under a second"""
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            run_startup()
+            timings.append(time.perf_counter() - start)
+
+        assert min(timings) < STARTUP_BUDGET, f"CLI startup took {min(timings):.2f}s"
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for streaming CSV exports
+"""
+
+import csv
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+from graphreporter.config.settings import Settings
+from graphreporter.export.csv_exporter import CSVExporter
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    """CSV exporter writing to a temporary directory"""
+    settings = MagicMock(spec=Settings)
+    settings.list_encoding = "json"
+    with patch('graphreporter.export.base.get_settings', return_value=settings):
+        return CSVExporter(tmp_path)
+
+
+def read_rows(path):
+    """Read a CSV file back as header and rows"""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        return next(reader), list(reader)
+
+
+class TestCSVExportStream:
+    """Test cases for CSVExporter.export_stream"""
+
+    def test_generator_is_written_in_batches(self, exporter):
+        """Test that records are consumed batch by batch, not materialized first"""
+        consumed = []
+
+        def records():
+            for i in range(5):
+                consumed.append(i)
+                yield {"id": str(i), "status": {"errorCode": 0}}
+
+        with patch.object(CSVExporter, '_write_batch', autospec=True,
+                          side_effect=CSVExporter._write_batch) as write_batch:
+            output_file = exporter.export_stream(records(), "signins", batch_size=2)
+
+        assert [len(call.args[2]) for call in write_batch.call_args_list] == [2, 2, 1]
+        header, rows = read_rows(output_file)
+        assert header == ["id", "status.errorCode"]
+        assert rows[0] == ["0", "0"]
+        assert len(rows) == 5
+
+    def test_rows_match_export(self, exporter):
+        """Test that streamed rows are flattened and encoded like export"""
+        records = [
+            {"id": "1", "status": {"errorCode": 0}, "policies": [{"id": "p"}]},
+            {"id": "2", "status": {"errorCode": 50126}, "policies": []},
+        ]
+
+        streamed = exporter.export_stream(iter(records), "streamed", batch_size=1)
+        exported = exporter.export(records, "exported")
+
+        assert read_rows(streamed) == read_rows(exported)
+        assert read_rows(streamed)[1][0] == ["1", "0", '[{"id":"p"}]']
+
+    def test_declared_columns_fix_the_header(self, exporter):
+        """Test that declared columns give a stable header with values read from their paths"""
+        exporter.columns = {"id": "id", "status_error_code": "status.errorCode"}
+
+        output_file = exporter.export_stream(iter([{"status": {"errorCode": 7}}, {"id": "2"}]), "declared")
+
+        assert read_rows(output_file) == (["id", "status_error_code"], [["", "7"], ["2", ""]])
+
+    def test_columns_fix_the_header(self, exporter):
+        """Test that the header follows the given columns whatever the record keys"""
+        records = [{"b": 1, "extra": "x"}, {"a": 2}]
+
+        output_file = exporter.export_stream(iter(records), "fixed", columns=["a", "b"])
+
+        assert read_rows(output_file) == (["a", "b"], [["", "1"], ["2", ""]])
+
+    @pytest.mark.asyncio
+    async def test_async_iterator(self, exporter):
+        """Test that an async iterator is streamed from a running loop"""
+        async def records():
+            for i in range(3):
+                yield {"id": i}
+
+        output_file = await exporter.export_stream_async(records(), "async", batch_size=2)
+
+        assert read_rows(output_file) == (["id"], [["0"], ["1"], ["2"]])
+
+    def test_empty_stream_creates_no_file(self, exporter, tmp_path):
+        """Test that an empty stream raises like export and leaves no file behind"""
+        with pytest.raises(ValueError, match="No data to export"):
+            exporter.export_stream(iter([]), "empty")
+
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for the Excel exporter
+"""
+
+import openpyxl
+import pytest
+from unittest.mock import patch, MagicMock
+
+from graphreporter.config.settings import Settings
+from graphreporter.export.excel_exporter import ExcelExporter
+
+
+@pytest.fixture
+def settings():
+    """Settings with the default list encoding"""
+    settings = MagicMock(spec=Settings)
+    settings.list_encoding = "json"
+    return settings
+
+
+def make_exporter(tmp_path, settings, **kwargs):
+    """Excel exporter writing to a temporary directory"""
+    with patch('graphreporter.export.base.get_settings', return_value=settings):
+        return ExcelExporter(tmp_path, **kwargs)
+
+
+def sheet_values(path):
+    """Read a workbook back as sheet title -> rows of values"""
+    workbook = openpyxl.load_workbook(path)
+    return {sheet.title: [list(row) for row in sheet.iter_rows(values_only=True)] for sheet in workbook}
+
+
+class TestExcelExporter:
+    """Test cases for the ExcelExporter class"""
+
+    def test_stream_rolls_over_to_new_sheets(self, tmp_path, settings):
+        """Test that each worksheet holds at most max_sheet_rows rows with its own header"""
+        exporter = make_exporter(tmp_path, settings, max_sheet_rows=3)
+        records = ({"id": str(n), "status": {"errorCode": n}} for n in range(5))
+
+        output_file = exporter.export_stream(records, "signins", batch_size=2)
+
+        assert sheet_values(output_file) == {
+            "Data": [["id", "status.errorCode"], ["0", 0], ["1", 1]],
+            "Data 2": [["id", "status.errorCode"], ["2", 2], ["3", 3]],
+            "Data 3": [["id", "status.errorCode"], ["4", 4]],
+        }
+
+    def test_stream_rows_match_export(self, tmp_path, settings):
+        """Test that a streaming export infers the same flat columns as export"""
+        records = [{"id": "1", "status": {"errorCode": 0, "failureReason": "Other"}}, {"id": "2"}]
+
+        exported = make_exporter(tmp_path / "export", settings).export(records, "signins")
+        streamed = make_exporter(tmp_path / "stream", settings).export_stream(iter(records), "signins")
+
+        assert sheet_values(streamed) == sheet_values(exported)
+        assert sheet_values(streamed)["Data"][0] == ["id", "status.errorCode", "status.failureReason"]
+
+    def test_schema_columns_and_widths(self, tmp_path, settings):
+        """Test that nested values are flattened and columns past Z are sized"""
+        columns = {f"column_{n}": f"values.v{n}" for n in range(30)}
+        exporter = make_exporter(tmp_path, settings, columns=columns)
+
+        output_file = exporter.export({"value": [{"values": {"v27": "x" * 80}}]}, "wide")
+
+        sheet = openpyxl.load_workbook(output_file)["Data"]
+        assert sheet["AB2"].value == "x" * 80
+        assert sheet.column_dimensions["AB"].width == 52
+        assert sheet.column_dimensions["A"].width == len("column_0") + 2
+        assert sheet["A1"].font.b
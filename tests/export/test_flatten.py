@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for flattening nested Graph objects
+"""
+
+import pandas as pd
+import pytest
+from unittest.mock import patch, MagicMock
+
+from graphreporter.config.settings import Settings
+from graphreporter.export.csv_exporter import CSVExporter
+from graphreporter.export.flatten import flatten_frame, infer_columns
+from graphreporter.schema.signins import SIGNIN_COLUMNS, SIGNIN_COLUMN_TYPES
+
+
+POLICIES = [
+    {"id": "p1", "displayName": "Require MFA", "result": "success"},
+    {"id": "p2", "displayName": "Block legacy auth", "result": "notApplied"},
+]
+
+SIGNINS = [
+    {
+        "id": "1",
+        "createdDateTime": "2024-01-01T08:00:00Z",
+        "status": None,
+        "location": {"city": "Oslo", "geoCoordinates": None},
+        "appliedConditionalAccessPolicies": [],
+    },
+    {
+        "id": "2",
+        "createdDateTime": "2024-01-01T09:00:00.1234567Z",
+        "status": {"errorCode": 50126, "failureReason": "Invalid password"},
+        "location": {"city": "Bergen", "geoCoordinates": {"latitude": 60.39, "longitude": 5.32}},
+        "appliedConditionalAccessPolicies": POLICIES,
+    },
+]
+
+
+class TestFlattenFrame:
+    """Test cases for flatten_frame"""
+
+    def test_signin_schema_gives_typed_columns(self):
+        """Test that nested sign-in properties become typed columns"""
+        flat = flatten_frame(pd.DataFrame(SIGNINS), SIGNIN_COLUMNS, SIGNIN_COLUMN_TYPES)
+
+        assert list(flat.columns) == list(SIGNIN_COLUMNS)
+        assert str(flat["created_datetime"].dtype) == "datetime64[ns, UTC]"
+        assert flat["status_error_code"].tolist() == [pd.NA, 50126]
+        assert flat["location_latitude"].tolist()[1] == 60.39
+        assert pd.isna(flat["location_latitude"].iloc[0])
+        assert flat["location_city"].tolist() == ["Oslo", "Bergen"]
+        assert flat["device_browser"].isna().all()
+        assert flat["applied_conditional_access_policies"].iloc[1].startswith('[{"id":"p1"')
+
+    @pytest.mark.parametrize("list_encoding,expected", [
+        ("count", [0, 2]),
+        ("join", ["", '{"id":"p1","displayName":"Require MFA","result":"success"}; '
+                      '{"id":"p2","displayName":"Block legacy auth","result":"notApplied"}']),
+    ])
+    def test_list_encodings(self, list_encoding, expected):
+        """Test that list values follow the configured encoding"""
+        flat = flatten_frame(pd.DataFrame(SIGNINS), {"policies": "appliedConditionalAccessPolicies"},
+                             list_encoding=list_encoding)
+
+        assert flat["policies"].tolist() == expected
+
+    def test_unknown_list_encoding_raises(self):
+        """Test that a typo in the encoding is reported"""
+        with pytest.raises(ValueError, match="Unsupported list encoding"):
+            flatten_frame(pd.DataFrame(SIGNINS), list_encoding="csv")
+
+    def test_inferred_columns_scan_every_row(self):
+        """Test that a nested column is found even when its first value is empty"""
+        columns = infer_columns(pd.DataFrame(SIGNINS))
+
+        assert list(columns) == [
+            "id",
+            "createdDateTime",
+            "status.errorCode",
+            "status.failureReason",
+            "location.city",
+            "location.geoCoordinates.latitude",
+            "location.geoCoordinates.longitude",
+            "appliedConditionalAccessPolicies",
+        ]
+
+
+class TestCSVExporterFlattening:
+    """Test cases for flattening in CSVExporter.export"""
+
+    def test_export_writes_real_columns(self, tmp_path):
+        """Test that nested objects are written as columns rather than Python reprs"""
+        settings = MagicMock(spec=Settings)
+        settings.list_encoding = "count"
+        with patch('graphreporter.export.base.get_settings', return_value=settings):
+            exporter = CSVExporter(tmp_path)
+
+        output_file = exporter.export(SIGNINS, "signins")
+
+        written = pd.read_csv(output_file)
+        assert "status.errorCode" in written.columns
+        assert written["appliedConditionalAccessPolicies"].tolist() == [0, 2]
+        assert "{'" not in output_file.read_text()
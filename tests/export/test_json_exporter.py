@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for the JSON exporter
+"""
+
+import json
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from graphreporter.config.settings import Settings
+from graphreporter.export.base import BaseExporter
+from graphreporter.export.json_exporter import JSONExporter
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    """JSON exporter writing to a temporary directory"""
+    with patch('graphreporter.export.base.get_settings', return_value=MagicMock(spec=Settings)):
+        return JSONExporter(tmp_path)
+
+
+class TestJSONExporter:
+    """Test cases for the JSONExporter class"""
+
+    def test_stream_matches_export(self, tmp_path, exporter):
+        """Test that a streaming export writes the same array as export"""
+        records = [
+            {"id": str(n), "status": {"errorCode": n}, "created": datetime(2024, 1, 1, 0, 0, n)}
+            for n in range(10)
+        ]
+
+        exported = exporter.export(records, "exported")
+        streamed = exporter.export_stream(iter(records), "streamed", batch_size=4)
+
+        assert streamed.read_text(encoding="utf-8") == exported.read_text(encoding="utf-8")
+        assert json.loads(streamed.read_text(encoding="utf-8"))[9]["created"] == "2024-01-01T00:00:09"
+
+    def test_stream_keeps_requested_columns(self, exporter):
+        """Test that requested columns are kept in order and others dropped"""
+        records = iter([{"id": "1", "app": "Portal", "extra": True}])
+
+        output_file = exporter.export_stream(records, "signins", columns=["app", "id"])
+
+        assert json.loads(output_file.read_text(encoding="utf-8")) == [{"app": "Portal", "id": "1"}]
+
+    def test_streaming_hooks_are_abstract(self):
+        """Test that an exporter without streaming hooks cannot be created"""
+        class ExportOnly(BaseExporter):
+            def export(self, data, filename):
+                pass
+
+        with pytest.raises(TypeError):
+            ExportOnly()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for merging chunk CSV files
+"""
+
+import pytest
+from unittest.mock import patch
+
+from graphreporter.export import merge
+from graphreporter.export.merge import merge_csv_files, metadata_path, read_csv_metadata, write_csv_metadata
+
+
+def write_chunk(path, header, rows, metadata=True):
+    """Write a CSV chunk as the sign-in export does, with CRLF line endings"""
+    path.write_bytes(b"".join(line.encode("utf-8") + b"\r\n" for line in [header] + rows))
+    if metadata:
+        write_csv_metadata(path, header.split(","), len(rows))
+    return path
+
+
+@pytest.fixture
+def chunks(tmp_path):
+    """Three chunks sharing a header, one of them empty"""
+    return [
+        write_chunk(tmp_path / "a.csv", "id,reason", ["1,ok", '2,"multi\r\nline"']),
+        write_chunk(tmp_path / "b.csv", "id,reason", []),
+        write_chunk(tmp_path / "c.csv", "id,reason", ["3,ok"]),
+    ]
+
+
+class TestMergeCSVFiles:
+    """Test cases for merge_csv_files"""
+
+    @pytest.mark.parametrize("kernel_copies", [merge._KERNEL_COPIES, []])
+    def test_data_is_concatenated_after_one_header(self, chunks, tmp_path, kernel_copies):
+        """Test that data bytes are copied as is, with or without kernel copies"""
+        with patch.object(merge, '_KERNEL_COPIES', kernel_copies):
+            output_file, rows = merge_csv_files(chunks, tmp_path / "all.csv")
+
+        assert output_file.read_bytes() == b'id,reason\r\n1,ok\r\n2,"multi\r\nline"\r\n3,ok\r\n'
+        assert rows == 3
+        assert read_csv_metadata(output_file) == {"columns": ["id", "reason"], "rows": 3}
+
+    def test_different_headers_raise(self, chunks, tmp_path):
+        """Test that chunks with other columns are not silently mixed"""
+        chunks.append(write_chunk(tmp_path / "d.csv", "id,city", ["4,Oslo"]))
+
+        with pytest.raises(ValueError, match="d.csv differs"):
+            merge_csv_files(chunks, tmp_path / "all.csv")
+
+    def test_missing_metadata_leaves_count_unknown(self, chunks, tmp_path):
+        """Test that rows are not guessed from line breaks, and sources can be removed"""
+        metadata_path(chunks[1]).unlink()
+
+        output_file, rows = merge_csv_files(chunks, tmp_path / "all.csv", remove_sources=True)
+
+        assert rows is None
+        assert not metadata_path(output_file).exists()
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["all.csv"]
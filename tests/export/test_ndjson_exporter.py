@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for the NDJSON exporter
+"""
+
+import io
+import json
+from datetime import datetime
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+from graphreporter.config.settings import Settings
+from graphreporter.export import ndjson_exporter
+from graphreporter.export.ndjson_exporter import NDJSONExporter, dumps_line
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    """NDJSON exporter writing to a temporary directory"""
+    with patch('graphreporter.export.base.get_settings', return_value=MagicMock(spec=Settings)):
+        return NDJSONExporter(tmp_path)
+
+
+RECORD = {
+    "id": "1",
+    "createdDateTime": datetime(2024, 1, 1, 12, 30),
+    "status": {"errorCode": 0},
+    "userDisplayName": "Zoë",
+}
+
+
+class TestNDJSONExporter:
+    """Test cases for the NDJSONExporter class"""
+
+    def test_stream_writes_one_line_per_record(self, exporter):
+        """Test that nested records are kept whole, one compact line each"""
+        records = ({**RECORD, "id": str(n)} for n in range(3))
+
+        output_file = exporter.export_stream(records, "signins", batch_size=2)
+
+        lines = output_file.read_bytes().splitlines()
+        assert output_file.suffix == ".jsonl"
+        assert len(lines) == 3
+        assert b" " not in lines[0]
+        assert json.loads(lines[2]) == {
+            "id": "2",
+            "createdDateTime": "2024-01-01T12:30:00",
+            "status": {"errorCode": 0},
+            "userDisplayName": "Zoë",
+        }
+
+    def test_write_to_open_stream(self, exporter):
+        """Test that records can be piped to a binary stream with columns kept in order"""
+        output = io.BytesIO()
+
+        count = exporter.write(iter([RECORD, {"id": "2"}]), output, columns=["userDisplayName", "id"])
+
+        assert count == 2
+        assert output.getvalue().decode("utf-8").splitlines() == [
+            '{"userDisplayName":"Zoë","id":"1"}',
+            '{"userDisplayName":null,"id":"2"}',
+        ]
+
+    def test_standard_library_fallback_matches(self):
+        """Test that both serializer backends produce the same document"""
+        fast = dumps_line(RECORD)
+        with patch.object(ndjson_exporter, 'orjson', None):
+            fallback = dumps_line(RECORD)
+
+        assert fallback.endswith(b"\n")
+        assert json.loads(fallback) == json.loads(fast)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for the Parquet exporter
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+from graphreporter.config.settings import Settings
+from graphreporter.schema.signins import SIGNIN_COLUMNS
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from graphreporter.export.parquet_exporter import ParquetExporter
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    """Parquet exporter writing to a temporary directory"""
+    settings = MagicMock(spec=Settings)
+    settings.parquet_compression = "zstd"
+    with patch('graphreporter.export.base.get_settings', return_value=settings):
+        return ParquetExporter(tmp_path)
+
+
+def make_row(n):
+    """Build a flat sign-in row"""
+    row = dict.fromkeys(SIGNIN_COLUMNS)
+    row.update({
+        "id": str(n),
+        "created_datetime": f"2024-01-01T00:00:{n:02d}.1234567Z",
+        "app_display_name": "App",
+        "status_error_code": 50126 if n % 2 else 0,
+    })
+    return row
+
+
+class TestParquetExporter:
+    """Test cases for the ParquetExporter class"""
+
+    def test_stream_writes_typed_row_groups(self, exporter):
+        """Test that each batch becomes a row group of the fixed sign-in schema"""
+        output_file = exporter.export_stream((make_row(n) for n in range(5)), "signins", batch_size=2)
+
+        parquet_file = pq.ParquetFile(output_file)
+        assert parquet_file.metadata.num_row_groups == 3
+        assert parquet_file.schema_arrow.names == list(SIGNIN_COLUMNS)
+        assert parquet_file.schema_arrow.field("created_datetime").type == pa.timestamp("us", tz="UTC")
+        assert parquet_file.schema_arrow.field("status_error_code").type == pa.int32()
+
+        column_chunk = parquet_file.metadata.row_group(0).column(list(SIGNIN_COLUMNS).index("app_display_name"))
+        assert column_chunk.compression == "ZSTD"
+        assert any("DICTIONARY" in encoding for encoding in column_chunk.encodings)
+
+        table = parquet_file.read(columns=["created_datetime", "status_error_code"])
+        assert table.column("status_error_code").to_pylist() == [0, 50126, 0, 50126, 0]
+        assert table.column("created_datetime")[1].as_py() == datetime(2024, 1, 1, 0, 0, 1, 123456, tzinfo=timezone.utc)
+
+    def test_export_accepts_graph_response(self, exporter):
+        """Test that the list-based export writes the same file format"""
+        output_file = exporter.export({"value": [make_row(1)]}, "signins")
+
+        assert output_file.suffix == ".parquet"
+        assert pq.read_table(output_file).num_rows == 1
+
+    def test_raw_graph_records_are_mapped_to_typed_columns(self, exporter):
+        """Test that raw signIn objects are read through the schema paths"""
+        records = [
+            {
+                "id": "1",
+                "createdDateTime": "2024-01-01T00:00:01Z",
+                "status": {"errorCode": 50126, "failureReason": "Invalid password"},
+                "location": {"city": "Oslo", "geoCoordinates": {"latitude": 59.9}},
+                "resourceDisplayName": "Graph",
+            },
+        ]
+
+        output_file = exporter.export_stream(iter(records), "raw")
+
+        table = pq.read_table(output_file)
+        assert "createdDateTime" not in table.column_names
+        assert table.schema.field("created_datetime").type == pa.timestamp("us", tz="UTC")
+        row = table.to_pylist()[0]
+        assert row["status_error_code"] == 50126
+        assert row["status_failure_reason"] == "Invalid password"
+        assert row["location_latitude"] == 59.9
+        assert row["location_longitude"] is None
+        assert row["resourceDisplayName"] == "Graph"
+
+    def test_invalid_values_are_written_as_nulls(self, exporter):
+        """Test that values that do not convert to the column type do not fail the export"""
+        row = make_row(1)
+        row.update({"status_error_code": "n/a", "created_datetime": "yesterday", "location_latitude": {"x": 1}})
+
+        output_file = exporter.export_stream(iter([row, make_row(2)]), "invalid")
+
+        table = pq.read_table(output_file, columns=["status_error_code", "created_datetime", "location_latitude"])
+        assert table.column("status_error_code").to_pylist() == [None, 0]
+        assert table.column("created_datetime")[0].as_py() is None
+        assert table.column("location_latitude").to_pylist() == [None, None]
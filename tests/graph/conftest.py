@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared fixtures for the Graph client tests
+"""
+
+import httpx
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from graphreporter.config.settings import Settings
+from graphreporter.graph.context import GraphContext
+from graphreporter.graph.scheduler import RequestScheduler
+from graphreporter.graph.transport import AsyncTransport
+
+
+ENDPOINT = "https://graph.example.com/v1.0"
+
+
+@pytest.fixture
+def make_client():
+    """Factory creating a Graph client whose async transport is served by a handler"""
+    def factory(handler, client_class=None):
+        from graphreporter.graph.client import GraphClient
+
+        settings = MagicMock(spec=Settings)
+        settings.graph_endpoint = ENDPOINT
+        settings.scopes = ["https://graph.microsoft.com/.default"]
+        settings.max_connections = 4
+        settings.max_concurrency = 2
+        settings.request_timeout = 5.0
+        settings.requests_per_second = 100.0
+        settings.max_retries = 3
+        settings.page_prefetch = 0
+        settings.stream_pages = False
+
+        with patch('graphreporter.graph.context.AuthClient'):
+            context = GraphContext(settings)
+
+        context.scheduler = RequestScheduler(rate=100.0, burst=100)
+        context.transport = AsyncTransport(max_connections=4, max_concurrency=2, transport=httpx.MockTransport(handler))
+        client = (client_class or GraphClient)(context)
+        context.auth_client.close = AsyncMock()
+        client._get_auth_header_async = AsyncMock(return_value={"Authorization": "Bearer test-token"})
+        client.auth_client.get_auth_header.return_value = {"Authorization": "Bearer test-token"}
+        return client
+
+    return factory
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for the $batch layer
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from graphreporter.graph.serviceprincipals import ServicePrincipalsClient
+
+
+def batch_handler(sent, throttle_once=()):
+    """Create a $batch handler that echoes the app ID of each sub-request"""
+    throttled = set()
+
+    def handler(request):
+        body = json.loads(request.content)
+        sent.append(len(body["requests"]))
+        responses = []
+        for sub in body["requests"]:
+            app_id = sub["url"].split("'")[1]
+            if app_id in throttle_once and app_id not in throttled:
+                throttled.add(app_id)
+                responses.append({"id": sub["id"], "status": 429, "headers": {"retry-after": "0"}})
+            elif app_id == "missing":
+                responses.append({"id": sub["id"], "status": 200, "body": {"value": []}})
+            else:
+                responses.append({"id": sub["id"], "status": 200, "body": {"value": [{"appId": app_id}]}})
+        return httpx.Response(200, json={"responses": responses})
+
+    return handler
+
+
+class TestGraphBatcher:
+    """Test cases for the GraphBatcher class"""
+
+    def test_lookups_are_coalesced(self, make_client):
+        """Test that 45 lookups go out as batches of 20, 20 and 5"""
+        sent = []
+        handler = batch_handler(sent)
+        client = make_client(handler, ServicePrincipalsClient)
+        client.post = lambda path, body: _post(handler, body)
+
+        app_ids = [f"app-{i}" for i in range(45)] + ["missing"]
+        results = client.get_service_principals_by_app_ids(app_ids)
+
+        assert sent == [20, 20, 6]
+        assert results["app-7"] == {"appId": "app-7"}
+        assert results["missing"] is None
+
+    def test_throttled_sub_requests_are_retried(self, make_client):
+        """Test that only the throttled sub-requests are resent"""
+        sent = []
+        handler = batch_handler(sent, throttle_once={"b"})
+        client = make_client(handler, ServicePrincipalsClient)
+        client.post = lambda path, body: _post(handler, body)
+
+        results = client.get_service_principals_by_app_ids(["a", "b", "c"])
+
+        assert sent == [3, 1]
+        assert [results[k]["appId"] for k in "abc"] == ["a", "b", "c"]
+        assert client.scheduler.throttled_count == 1
+
+    @pytest.mark.asyncio
+    async def test_flush_async_resolves_futures(self, make_client):
+        """Test that futures resolve when batches are sent over the async transport"""
+        sent = []
+        client = make_client(batch_handler(sent))
+
+        batcher = client.batch()
+        futures = [batcher.submit("servicePrincipals", {"$filter": f"appId eq '{i}'"}) for i in range(25)]
+        await batcher.flush_async()
+        await client.aclose()
+
+        assert sorted(sent) == [5, 20]
+        assert futures[24].result() == {"value": [{"appId": "24"}]}
+
+    def test_single_lookup_uses_shared_batcher(self, make_client):
+        """Test that a single lookup is sent as a $batch and a miss returns None"""
+        sent = []
+        handler = batch_handler(sent)
+        client = make_client(handler, ServicePrincipalsClient)
+        client.post = lambda path, body: _post(handler, body)
+
+        assert client.get_service_principal_by_app_id("a") == {"appId": "a"}
+        assert client.get_service_principal_by_app_id("missing") is None
+        assert sent == [1, 1]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_async_lookups_are_coalesced(self, make_client):
+        """Test that single lookups awaited together share one $batch"""
+        sent = []
+        client = make_client(batch_handler(sent), ServicePrincipalsClient)
+
+        results = await asyncio.gather(*(client.get_service_principal_by_app_id_async(f"app-{i}") for i in range(5)))
+        await client.aclose()
+
+        assert sent == [5]
+        assert results[3] == {"appId": "app-3"}
+
+
+def _post(handler, body):
+    """Serve a blocking $batch POST from the handler"""
+    return handler(httpx.Request("POST", "https://graph.example.com/v1.0/$batch", json=body)).json()
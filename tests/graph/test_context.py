@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for the shared Graph context
+"""
+
+import pytest
+from unittest.mock import patch, AsyncMock, MagicMock
+
+from graphreporter.config.settings import Settings
+from graphreporter.graph import context as context_module
+from graphreporter.graph.applications import ApplicationsClient
+from graphreporter.graph.context import GraphContext, close_context, get_context
+from graphreporter.graph.serviceprincipals import ServicePrincipalsClient
+from graphreporter.graph.signins import SignInClient
+
+
+@pytest.fixture
+def settings():
+    """Settings for building contexts without a configured environment"""
+    settings = MagicMock(spec=Settings)
+    settings.max_connections = 4
+    settings.max_concurrency = 2
+    settings.request_timeout = 5.0
+    settings.requests_per_second = 100.0
+    return settings
+
+
+@pytest.fixture
+def auth_client_class():
+    """Patch the credential so no tokens are requested"""
+    with patch('graphreporter.graph.context.AuthClient') as auth_client_class:
+        auth_client_class.return_value.close = AsyncMock()
+        yield auth_client_class
+
+
+class TestGraphContext:
+    """Test cases for the GraphContext class"""
+
+    def test_clients_share_connections_and_credential(self, settings, auth_client_class):
+        """Test that clients built on the process-wide context share its resources"""
+        with patch.object(context_module, '_context', None), \
+             patch('graphreporter.graph.context.get_settings', return_value=settings):
+            clients = [SignInClient(), ApplicationsClient(), ServicePrincipalsClient()]
+
+            assert auth_client_class.call_count == 1
+            for client in clients:
+                assert client.context is get_context()
+                assert client.session is clients[0].session
+                assert client.transport is clients[0].transport
+                assert client.auth_client is clients[0].auth_client
+
+            close_context()
+            assert get_context() is not clients[0].context
+
+    @pytest.mark.asyncio
+    async def test_async_context_manager_closes_resources(self, settings, auth_client_class):
+        """Test that leaving the context closes the transport and the credential"""
+        async with GraphContext(settings) as context:
+            context.transport.aclose = AsyncMock()
+            client = SignInClient(context)
+            assert client.settings is settings
+
+        assert context.closed
+        context.transport.aclose.assert_awaited_once()
+        context.auth_client.close.assert_awaited_once()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for the base Graph client
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+from unittest.mock import MagicMock
+
+
+ENDPOINT = "https://graph.example.com/v1.0"
+
+
+def _response(body=None, status_code=200, headers=None):
+    """Build a mocked requests.Response"""
+    response = MagicMock(ok=status_code < 400, status_code=status_code, headers=headers or {})
+    response.content = json.dumps(body).encode()
+    response.iter_content.return_value = [response.content]
+    return response
+
+
+class TestGraphClientAsync:
+    """Test cases for the async GraphClient path"""
+
+    @pytest.mark.asyncio
+    async def test_get_paginated_async_follows_next_link(self, make_client):
+        """Test that all pages are walked via @odata.nextLink"""
+        def handler(request):
+            assert request.headers["Authorization"] == "Bearer test-token"
+            if "skiptoken" in str(request.url):
+                return httpx.Response(200, json={"value": [{"id": "3"}]})
+            return httpx.Response(200, json={
+                "value": [{"id": "1"}, {"id": "2"}],
+                "@odata.nextLink": f"{ENDPOINT}/auditLogs/signIns?$skiptoken=abc",
+            })
+
+        client = make_client(handler)
+        items = [item async for item in client.get_paginated_async("auditLogs/signIns", {"$top": "2"})]
+        await client.aclose()
+
+        assert [item["id"] for item in items] == ["1", "2", "3"]
+
+    @pytest.mark.asyncio
+    async def test_get_many_async_preserves_order(self, make_client):
+        """Test that concurrent requests come back in request order"""
+        def handler(request):
+            return httpx.Response(200, json={"path": request.url.path})
+
+        client = make_client(handler)
+        results = await client.get_many_async([("applications", None), ("servicePrincipals", None)])
+        await client.aclose()
+
+        assert [r["path"] for r in results] == ["/v1.0/applications", "/v1.0/servicePrincipals"]
+
+    @pytest.mark.asyncio
+    async def test_get_async_raises_on_error(self, make_client):
+        """Test that a failed request raises ValueError with the error body"""
+        def handler(request):
+            return httpx.Response(403, json={"error": {"code": "Authorization_RequestDenied"}})
+
+        client = make_client(handler)
+        with pytest.raises(ValueError, match="Authorization_RequestDenied"):
+            await client.get_async("auditLogs/signIns")
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_throttled_next_link_is_retried(self, make_client):
+        """Test that a 429 on the nextLink path is retried after Retry-After"""
+        calls = {"next": 0}
+
+        def handler(request):
+            if "skiptoken" in str(request.url):
+                calls["next"] += 1
+                if calls["next"] == 1:
+                    return httpx.Response(429, headers={"Retry-After": "0"})
+                return httpx.Response(200, json={"value": [{"id": "2"}]})
+            return httpx.Response(200, json={
+                "value": [{"id": "1"}],
+                "@odata.nextLink": f"{ENDPOINT}/applications?$skiptoken=abc",
+            })
+
+        client = make_client(handler)
+        items = [item async for item in client.get_paginated_async("applications")]
+        await client.aclose()
+
+        assert [item["id"] for item in items] == ["1", "2"]
+        assert calls["next"] == 2
+        assert client.scheduler.throttled_count == 1
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_report_the_error_body(self, make_client):
+        """Test that the last throttled response of a streamed request is read for its details"""
+        def handler(request):
+            return httpx.Response(429, headers={"Retry-After": "0"}, json={"error": {"code": "TooManyRequests"}})
+
+        client = make_client(handler)
+        with pytest.raises(ValueError, match="TooManyRequests"):
+            await client._send_async(f"{ENDPOINT}/auditLogs/signIns", stream=True)
+        await client.aclose()
+
+    def test_get_paginated_retries_throttled_next_link(self, make_client):
+        """Test that the blocking nextLink path goes through the retry loop"""
+        client = make_client(lambda request: httpx.Response(500))
+
+        first = _response({"value": [{"id": "1"}], "@odata.nextLink": f"{ENDPOINT}/next"})
+        throttled = _response(status_code=429, headers={"Retry-After": "0"})
+        second = _response({"value": [{"id": "2"}]})
+        client.session = MagicMock()
+        client.session.request.side_effect = [first, throttled, second]
+
+        items = list(client.get_paginated("applications"))
+
+        assert [item["id"] for item in items] == ["1", "2"]
+        assert client.session.request.call_count == 3
+
+    def test_get_paginated_prefetch_is_bounded(self, make_client):
+        """Test that pages are fetched ahead of the consumer, but only prefetch of them"""
+        client = make_client(lambda request: httpx.Response(500))
+
+        def page(n):
+            body = {"value": [{"id": n}]}
+            if n < 5:
+                body["@odata.nextLink"] = f"{ENDPOINT}/next?page={n + 1}"
+            return _response(body)
+
+        client.session = MagicMock()
+        client.session.request.side_effect = [page(n) for n in range(1, 6)]
+
+        items = client.get_paginated("applications", prefetch=1)
+        assert next(items)["id"] == 1
+
+        # Page 2 is queued and page 3 is waiting for room while page 1 is consumed
+        deadline = time.monotonic() + 2
+        while client.session.request.call_count < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        assert client.session.request.call_count == 3
+
+        assert [item["id"] for item in items] == [2, 3, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_get_paginated_async_prefetch(self, make_client):
+        """Test that the async prefetch overlaps fetching with consumption"""
+        fetched = []
+
+        def handler(request):
+            n = int(request.url.params.get("page", 1))
+            fetched.append(n)
+            body = {"value": [{"id": n}]}
+            if n < 4:
+                body["@odata.nextLink"] = f"{ENDPOINT}/applications?page={n + 1}"
+            return httpx.Response(200, json=body)
+
+        client = make_client(handler)
+        items = []
+        async for item in client.get_paginated_async("applications", prefetch=2):
+            if item["id"] == 1:
+                await asyncio.sleep(0.1)
+                assert fetched == [1, 2, 3, 4]
+            items.append(item["id"])
+        await client.aclose()
+
+        assert items == [1, 2, 3, 4]
+
+    def test_get_many_sync_wrapper(self, make_client):
+        """Test the blocking wrapper around get_many_async"""
+        def handler(request):
+            return httpx.Response(200, json={"value": [json.loads(request.url.params["n"])]})
+
+        client = make_client(handler)
+        results = client.get_many([("applications", {"n": "1"}), ("applications", {"n": "2"})])
+
+        assert [r["value"][0] for r in results] == [1, 2]
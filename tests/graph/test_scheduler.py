@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for the request scheduler
+"""
+
+from graphreporter.graph.scheduler import RequestScheduler
+
+
+class TestRequestScheduler:
+    """Test cases for the RequestScheduler class"""
+
+    def test_burst_then_paced(self):
+        """Test that requests beyond the burst are scheduled ahead of time"""
+        scheduler = RequestScheduler(rate=10.0, burst=2)
+
+        assert scheduler.reserve() == 0
+        assert scheduler.reserve() == 0
+        # The third request waits for a refill and the fourth queues behind it
+        third = scheduler.reserve()
+        fourth = scheduler.reserve()
+        assert 0.05 < third <= 0.1
+        assert fourth > third
+
+    def test_throttle_pauses_and_backs_off(self):
+        """Test that a 429 halves rate and concurrency and pauses new requests"""
+        scheduler = RequestScheduler(rate=10.0, burst=10, max_concurrency=4)
+        scheduler.acquire()
+
+        retry_after = scheduler.release(429, {"Retry-After": "2"})
+
+        assert retry_after == 2.0
+        assert scheduler.rate == 5.0
+        assert scheduler.concurrency == 2
+        assert scheduler.reserve() > 1.5
+
+    def test_unavailable_only_reduces_concurrency(self):
+        """Test that a 503 pauses and halves concurrency but keeps the rate"""
+        scheduler = RequestScheduler(rate=10.0, burst=10, max_concurrency=4)
+        scheduler.acquire()
+
+        assert scheduler.release(503, {"Retry-After": "1"}) == 1.0
+        assert scheduler.rate == 10.0
+        assert scheduler.concurrency == 2
+
+    def test_throttle_without_retry_after_uses_exponential_backoff(self):
+        """Test the fallback delay when Graph omits Retry-After"""
+        scheduler = RequestScheduler()
+
+        assert scheduler.release(503, {}, attempt=0) == 1.0
+        assert scheduler.release(503, {}, attempt=3) == 8.0
+
+    def test_success_speeds_up_and_restores_concurrency(self):
+        """Test additive increase after healthy responses"""
+        scheduler = RequestScheduler(rate=1.0, max_rate=5.0, max_concurrency=4)
+        scheduler.release(429, {"Retry-After": "0"})
+        assert scheduler.concurrency == 2
+
+        for _ in range(40):
+            assert scheduler.release(200, {}) is None
+
+        assert scheduler.rate == 5.0
+        assert scheduler.concurrency == 4
+
+    def test_throttle_limit_header_eases_off(self):
+        """Test that approaching the throttle limit lowers the rate"""
+        scheduler = RequestScheduler(rate=10.0)
+
+        scheduler.release(200, {"x-ms-throttle-limit-percentage": "0.9"})
+
+        assert scheduler.rate == 9.0
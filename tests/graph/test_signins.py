@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for the sign-in logs client
+"""
+
+import re
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from graphreporter.graph.signins import SignInClient
+from graphreporter.sync.checkpoint import CheckpointStore
+from graphreporter.sync.store import SignInStore
+
+
+START = datetime(2024, 1, 1)
+END = datetime(2024, 1, 5)
+
+
+def signins_handler(requests_seen):
+    """Serve one sign-in per hour of the requested window, newest first, 10 per page"""
+    def handler(request):
+        requests_seen.append(str(request.url))
+        params = request.url.params
+        if "skip" in params:
+            window, skip = params["window"], int(params["skip"])
+        else:
+            window, skip = params["$filter"], 0
+
+        match = re.search(r"ge (\S+)Z and createdDateTime (le|lt) (\S+)Z", window)
+        start = datetime.fromisoformat(match.group(1))
+        end = datetime.fromisoformat(match.group(3))
+        stamps = []
+        current = start
+        while current < end or (match.group(2) == "le" and current == end):
+            stamps.append(current)
+            current += timedelta(hours=1)
+        stamps.reverse()
+
+        page = stamps[skip:skip + 10]
+        body = {"value": [{"id": ts.isoformat(), "createdDateTime": ts.isoformat() + "Z"} for ts in page]}
+        if skip + 10 < len(stamps):
+            body["@odata.nextLink"] = str(httpx.URL(
+                "https://graph.example.com/v1.0/auditLogs/signIns",
+                params={"window": window, "skip": skip + 10},
+            ))
+        return httpx.Response(200, json=body)
+
+    return handler
+
+
+class TestSignInClientParallel:
+    """Test cases for the parallel sign-in fan-out"""
+
+    def test_split_window_is_disjoint_and_newest_first(self, make_client):
+        """Test that sub-windows cover the range once, newest first"""
+        client = make_client(signins_handler([]), SignInClient)
+
+        windows = client._split_window(START, END, 4)
+
+        assert windows[0] == (START + timedelta(days=3), END, True)
+        assert windows[-1] == (START, START + timedelta(days=1), False)
+        assert all(windows[i][0] == windows[i + 1][1] for i in range(3))
+
+    @pytest.mark.asyncio
+    async def test_parallel_matches_serial_order(self, make_client):
+        """Test that the fan-out yields the same entries in global desc order"""
+        seen = []
+        client = make_client(signins_handler(seen), SignInClient)
+
+        serial = [s["id"] async for s in client.get_signins_async(START, END)]
+        parallel = [s["id"] async for s in client.get_signins_parallel_async(START, END, slices=4, buffer_size=5)]
+        await client.aclose()
+
+        assert len(serial) == 4 * 24 + 1
+        assert parallel == serial
+
+    @pytest.mark.asyncio
+    async def test_parallel_respects_max_results(self, make_client):
+        """Test that the fan-out stops at max_results"""
+        client = make_client(signins_handler([]), SignInClient)
+
+        results = [s async for s in client.get_signins_parallel_async(START, END, max_results=15, slices=3)]
+        await client.aclose()
+
+        assert len(results) == 15
+        assert results[0]["createdDateTime"] == "2024-01-05T00:00:00Z"
+
+    def test_sync_get_signins_with_slices(self, make_client):
+        """Test that the blocking iterator contract is kept in parallel mode"""
+        client = make_client(signins_handler([]), SignInClient)
+
+        stamps = [s["createdDateTime"] for s in client.get_signins(START, END, slices=4)]
+
+        assert len(stamps) == 97
+        assert stamps == sorted(stamps, reverse=True)
+
+
+class TestSignInClientIncremental:
+    """Test cases for the incremental sign-in sync"""
+
+    def test_second_run_only_returns_new_signins(self, make_client, tmp_path):
+        """Test that a rerun resumes from the checkpoint without duplicates"""
+        store = CheckpointStore(tmp_path)
+        client = make_client(signins_handler([]), SignInClient)
+
+        first = [s["id"] for s in client.get_signins_incremental(days=1, slices=2, store=store)]
+        second = [s["id"] for s in client.get_signins_incremental(days=1, slices=2, store=store)]
+
+        assert len(first) >= 24
+        assert not set(first) & set(second)
+        assert store.load(store.key("signins")).high_water_mark.isoformat() == max(first + second)
+
+
+class TestSignInClientProjection:
+    """Test cases for $select pushdown"""
+
+    def test_columns_are_sent_as_select(self, make_client):
+        """Test that requested columns reach every sub-window request"""
+        seen = []
+        client = make_client(signins_handler(seen), SignInClient)
+
+        list(client.get_signins(START, END, slices=2, columns=iter(["location_city", "app_id"])))
+
+        selects = {httpx.URL(url).params.get("$select") for url in seen if "skip" not in httpx.URL(url).params}
+        assert selects == {"id,createdDateTime,location,appId"}
+
+
+class TestSignInClientCached:
+    """Test cases for sign-ins served from the local store"""
+
+    def test_overlapping_query_only_fetches_the_gap(self, make_client, tmp_path):
+        """Test that a second query fetches the uncovered range and reads the rest locally"""
+        seen = []
+        store = SignInStore(tmp_path / "signins.sqlite3")
+        client = make_client(signins_handler(seen), SignInClient)
+
+        first = list(client.get_signins_cached(START, END, slices=2, store=store))
+        seen.clear()
+        second = list(client.get_signins_cached(START + timedelta(days=2), END + timedelta(days=2), slices=2, store=store))
+
+        filters = {httpx.URL(url).params["$filter"] for url in seen if "skip" not in httpx.URL(url).params}
+        assert all("ge 2024-01-05" in f or "ge 2024-01-06" in f for f in filters)
+        assert len(first) == 97
+        assert len(second) == 97
+        assert [s["id"] for s in second] == sorted((s["id"] for s in second), reverse=True)
+        assert store.missing(START, END + timedelta(days=2)) == []
+
+    def test_default_store_is_closed_when_abandoned(self, make_client, tmp_path):
+        """Test that a store opened by the call is closed when the caller stops early"""
+        client = make_client(signins_handler([]), SignInClient)
+        client.settings.state_dir = str(tmp_path)
+
+        with patch.object(SignInStore, "close", autospec=True, side_effect=SignInStore.close) as close:
+            signins = client.get_signins_cached(START, END, slices=2)
+            next(signins)
+            signins.close()
+
+        close.assert_called_once()
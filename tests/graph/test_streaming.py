@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for the streaming page decoder
+"""
+
+import json
+
+import httpx
+import pytest
+
+from graphreporter.graph.streaming import PageDecoder
+
+
+ENDPOINT = "https://graph.example.com/v1.0"
+
+PAGE = {
+    "@odata.context": f"{ENDPOINT}/$metadata#auditLogs/signIns",
+    "value": [
+        {"id": "1", "userDisplayName": "Zoë", "riskLevel": None, "status": {"errorCode": 0}},
+        {"id": "2", "userDisplayName": "Bob", "riskLevel": "low", "status": {"errorCode": 50126}},
+    ],
+    "@odata.nextLink": f"{ENDPOINT}/auditLogs/signIns?$skiptoken=abc",
+}
+
+
+class TestPageDecoder:
+    """Test cases for the PageDecoder class"""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 4096])
+    def test_items_and_metadata_across_chunk_boundaries(self, chunk_size):
+        """Test that any chunking, including split UTF-8 sequences, decodes the same"""
+        body = json.dumps(PAGE, ensure_ascii=False).encode("utf-8")
+        decoder = PageDecoder()
+
+        items = []
+        for i in range(0, len(body), chunk_size):
+            items.extend(decoder.feed(body[i:i + chunk_size]))
+        items.extend(decoder.close())
+
+        assert items == PAGE["value"]
+        assert decoder.metadata["@odata.nextLink"] == PAGE["@odata.nextLink"]
+
+    def test_items_are_returned_before_the_page_ends(self):
+        """Test that completed items are available while the page is downloading"""
+        decoder = PageDecoder()
+
+        assert decoder.feed(b'{"value": [{"id": "1"}, {"id"') == [{"id": "1"}]
+        assert decoder.feed(b': "2"}]}') == [{"id": "2"}]
+        assert decoder.close() == []
+
+    def test_truncated_page_raises(self):
+        """Test that a body cut off mid-page is reported"""
+        decoder = PageDecoder()
+        decoder.feed(b'{"value": [{"id": "1"}, {"id": "2"')
+
+        with pytest.raises(ValueError):
+            decoder.close()
+
+
+class TestStreamedPagination:
+    """Test cases for streamed pagination through GraphClient"""
+
+    @pytest.mark.asyncio
+    async def test_get_paginated_async_stream_follows_next_link(self, make_client):
+        """Test that streamed pages follow the nextLink found in the page metadata"""
+        def handler(request):
+            if "skiptoken" in str(request.url):
+                return httpx.Response(200, json={"value": [{"id": "3"}]})
+            return httpx.Response(200, json={
+                "value": [{"id": "1"}, {"id": "2"}],
+                "@odata.nextLink": f"{ENDPOINT}/applications?$skiptoken=abc",
+            })
+
+        client = make_client(handler)
+        items = [item async for item in client.get_paginated_async("applications", stream=True)]
+        await client.aclose()
+
+        assert [item["id"] for item in items] == ["1", "2", "3"]
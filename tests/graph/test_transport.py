@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for the async transport
+"""
+
+import asyncio
+
+import httpx
+
+from graphreporter.graph.transport import AsyncTransport
+
+
+class TestAsyncTransport:
+    """Test cases for AsyncTransport"""
+
+    def test_client_of_previous_loop_is_closed(self):
+        """Test that switching event loops does not leak the previous connection pool"""
+        transport = AsyncTransport(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+
+        asyncio.run(transport.get("https://graph.example.com/v1.0/me"))
+        first = transport._client
+        asyncio.run(transport.get("https://graph.example.com/v1.0/me"))
+
+        assert first.is_closed
+        assert transport._client is not first
+        asyncio.run(transport.aclose())
+        assert transport._client is None
@@ -0,0 +1,222 @@
+import csv
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from graphreporter.export.merge import read_csv_metadata
+from graphreporter.reports.signin_logs import SignInLogsClient
+from graphreporter.schema.signins import SIGNIN_CSV_COLUMNS
+from graphreporter.sync.resume import ExportJournal
+
+
+def make_log(n):
+    """Build a minimal SignIn model."""
+    return SimpleNamespace(
+        id=str(n), created_date_time=f"2024-01-01T00:00:{n:02d}Z",
+        user_display_name="User", user_principal_name="user@example.com", user_id="u",
+        app_id="a", app_display_name="App", ip_address="10.0.0.1", client_app_used="Browser",
+        status=None, location=None, device_detail=None,
+    )
+
+
+def make_raw_log(n):
+    """Build a minimal signIn object as returned in the Graph JSON body."""
+    return {
+        "id": str(n), "createdDateTime": f"2024-01-01T00:00:{n:02d}Z",
+        "userPrincipalName": "user@example.com", "status": {"errorCode": 0},
+    }
+
+
+def make_graph_client(pages):
+    """Build a GraphServiceClient whose sign-in pages are linked by next links.
+
+    Pages are served both as SignIn models and as raw JSON through the request adapter.
+    """
+    def next_link(i):
+        return f"https://graph.example.com/next/{i + 1}" if i + 1 < len(pages) else None
+
+    responses = [
+        SimpleNamespace(value=[make_log(n) for n in page], odata_next_link=next_link(i))
+        for i, page in enumerate(pages)
+    ]
+    bodies = []
+    for i, page in enumerate(pages):
+        body = {"value": [make_raw_log(n) for n in page]}
+        if next_link(i):
+            body["@odata.nextLink"] = next_link(i)
+        bodies.append(json.dumps(body).encode())
+
+    graph_client = MagicMock()
+    sign_ins = graph_client.audit_logs.sign_ins
+    sign_ins.get = AsyncMock(return_value=responses[0])
+    sign_ins.to_get_request_information.return_value = 0
+    sign_ins.with_url.side_effect = lambda url: SimpleNamespace(
+        get=AsyncMock(return_value=responses[int(url.rsplit("/", 1)[1])]),
+        to_get_request_information=lambda: int(url.rsplit("/", 1)[1]),
+    )
+    graph_client.request_adapter.send_primitive_async = AsyncMock(
+        side_effect=lambda request_info, response_type, error_map: bodies[request_info]
+    )
+    return graph_client
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prefetch", [0, 2])
+async def test_get_signin_logs_follows_every_page(prefetch):
+    """Test that results are not capped at the first page."""
+    graph_client = make_graph_client([[1, 2], [3, 4], [5]])
+    signin_client = SignInLogsClient(graph_client, prefetch=prefetch)
+
+    logs = await signin_client.get_signin_logs()
+
+    assert [log["id"] for log in logs] == ["1", "2", "3", "4", "5"]
+    assert graph_client.audit_logs.sign_ins.with_url.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_max_results_stops_paging():
+    """Test that no further pages are requested once max_results is reached."""
+    graph_client = make_graph_client([[1, 2], [3, 4], [5]])
+    signin_client = SignInLogsClient(graph_client, prefetch=0)
+
+    logs = [log async for log in signin_client.iter_signin_logs(max_results=3)]
+
+    assert [log["id"] for log in logs] == ["1", "2", "3"]
+    assert graph_client.audit_logs.sign_ins.with_url.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_export_to_csv_streams_all_pages(tmp_path):
+    """Test that the CSV export holds every page and appends without a second header."""
+    output_file = str(tmp_path / "signins.csv")
+
+    await SignInLogsClient(make_graph_client([[1, 2], [3]])).export_to_csv(output_file)
+    await SignInLogsClient(make_graph_client([[4]])).export_to_csv(output_file, append=True)
+
+    with open(output_file, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert [row["id"] for row in rows] == ["1", "2", "3", "4"]
+    assert rows[0]["created_datetime"] == "2024-01-01T00:00:01Z"
+    assert rows[0]["status_error_code"] == "0"
+    assert rows[0]["location_city"] == ""
+    assert read_csv_metadata(output_file)["rows"] == 4
+
+
+@pytest.mark.asyncio
+async def test_export_to_csv_half_open_window(tmp_path):
+    """Test that a chunk with an exclusive end leaves its end to the next chunk."""
+    graph_client = make_graph_client([[1]])
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 2)
+
+    await SignInLogsClient(graph_client).export_to_csv(
+        str(tmp_path / "signins.csv"), start_date=start, end_date=end, end_inclusive=False
+    )
+
+    request_configuration = graph_client.audit_logs.sign_ins.to_get_request_information.call_args[0][0]
+    assert request_configuration.query_parameters.filter == (
+        "createdDateTime ge 2024-01-01T00:00:00Z and createdDateTime lt 2024-01-02T00:00:00Z"
+    )
+
+
+@pytest.mark.asyncio
+async def test_export_to_csv_keeps_default_header(tmp_path):
+    """Test that the default CSV header matches chunk files of earlier runs."""
+    output_file = str(tmp_path / "signins.csv")
+
+    await SignInLogsClient(make_graph_client([[1]])).export_to_csv(output_file)
+
+    with open(output_file, newline='', encoding='utf-8') as f:
+        header = next(csv.reader(f))
+    assert header == list(SIGNIN_CSV_COLUMNS)
+    assert "applied_conditional_access_policies" not in header
+
+
+@pytest.mark.asyncio
+async def test_write_rows_encodes_lists(tmp_path):
+    """Test that list values are written as JSON, not as Python reprs."""
+    output_file = str(tmp_path / "signins.csv")
+    rows = [{"id": "1", "policies": [{"id": "p1", "result": "success"}]}]
+
+    SignInLogsClient(make_graph_client([[]])).write_rows(rows, output_file)
+
+    with open(output_file, newline='', encoding='utf-8') as f:
+        written = list(csv.DictReader(f))
+    assert json.loads(written[0]["policies"]) == [{"id": "p1", "result": "success"}]
+
+
+@pytest.mark.asyncio
+async def test_export_to_csv_without_logs_creates_no_file(tmp_path):
+    """Test that an empty result leaves no file behind."""
+    output_file = tmp_path / "signins.csv"
+
+    result = await SignInLogsClient(make_graph_client([[]])).export_to_csv(str(output_file))
+
+    assert result is None
+    assert not output_file.exists()
+
+
+@pytest.mark.asyncio
+async def test_iter_signin_rows_skips_model_deserialization():
+    """Test that the raw-JSON path maps pages to flat rows without the model path."""
+    graph_client = make_graph_client([[1], [2]])
+    signin_client = SignInLogsClient(graph_client)
+
+    rows = [row async for row in signin_client.iter_signin_rows(columns=["id", "status_error_code"])]
+
+    assert rows == [{"id": "1", "status_error_code": 0}, {"id": "2", "status_error_code": 0}]
+    graph_client.audit_logs.sign_ins.get.assert_not_called()
+    request_configuration = graph_client.audit_logs.sign_ins.to_get_request_information.call_args[0][0]
+    assert request_configuration.query_parameters.select == ["id", "createdDateTime", "status"]
+
+
+@pytest.mark.asyncio
+async def test_get_signin_batch_fills_columns_across_pages(tmp_path):
+    """Test that every page lands in one column batch that write_rows accepts."""
+    signin_client = SignInLogsClient(make_graph_client([[1, 2], [3, 4], [5]]), prefetch=0)
+
+    batch = await signin_client.get_signin_batch(max_results=4, columns=["id", "status_error_code"])
+
+    assert batch.column("id") == ["1", "2", "3", "4"]
+    assert batch[0] == {"id": "1", "status_error_code": 0}
+
+    output_file = str(tmp_path / "signins.csv")
+    signin_client.write_rows(batch, output_file)
+    with open(output_file, newline='', encoding='utf-8') as f:
+        assert [row["id"] for row in csv.DictReader(f)] == ["1", "2", "3", "4"]
+    assert read_csv_metadata(output_file)["rows"] == 4
+
+
+@pytest.mark.asyncio
+async def test_export_to_csv_resumes_after_last_committed_page(tmp_path):
+    """Test that a resumed chunk drops rows written after its last commit and skips committed pages."""
+    output_file = str(tmp_path / "signins.csv")
+    journal = ExportJournal(tmp_path, "job")
+    journal.start(datetime(2024, 1, 1), datetime(2024, 1, 2))
+
+    graph_client = make_graph_client([[1, 2], [3, 4], [5]])
+    serve = graph_client.request_adapter.send_primitive_async.side_effect
+
+    def fail_last_page(request_info, response_type, error_map):
+        if request_info == 2:
+            raise ValueError("connection reset")
+        return serve(request_info, response_type, error_map)
+
+    graph_client.request_adapter.send_primitive_async.side_effect = fail_last_page
+    with pytest.raises(ValueError):
+        await SignInLogsClient(graph_client, prefetch=0).export_to_csv(output_file, journal=journal, chunk_id="chunk-1")
+
+    # A row of a page that was being written when the run stopped
+    with open(output_file, "a", newline='', encoding='utf-8') as f:
+        f.write("partial\n")
+
+    graph_client.request_adapter.send_primitive_async.side_effect = serve
+    result = await SignInLogsClient(graph_client, prefetch=0).export_to_csv(output_file, journal=journal, chunk_id="chunk-1")
+
+    with open(result, newline='', encoding='utf-8') as f:
+        assert [row["id"] for row in csv.DictReader(f)] == ["1", "2", "3", "4", "5"]
+    assert read_csv_metadata(result)["rows"] == 5
+    requested = [call.args[0] for call in graph_client.request_adapter.send_primitive_async.call_args_list]
+    assert requested == [0, 1, 2, 2]
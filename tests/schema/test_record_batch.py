@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for the column-oriented record batch
+"""
+
+import pandas as pd
+from unittest.mock import patch, MagicMock
+
+from graphreporter.config.settings import Settings
+from graphreporter.export.csv_exporter import CSVExporter
+from graphreporter.schema.batch import POOL_LIMIT, RecordBatch
+from graphreporter.schema.signins import SIGNIN_COLUMNS, SIGNIN_COLUMN_TYPES
+
+
+def make_signin(n):
+    """Build a raw signIn object"""
+    return {
+        "id": f"id-{n}",
+        "createdDateTime": f"2024-01-01T00:00:{n % 60:02d}Z",
+        "appDisplayName": "Azure Portal",
+        "status": {"errorCode": n % 2},
+        "location": {"city": "Oslo"},
+    }
+
+
+class TestRecordBatch:
+    """Test cases for RecordBatch"""
+
+    def test_records_are_stored_by_column(self):
+        """Test that nested properties are read into flat columns"""
+        batch = RecordBatch.from_records([make_signin(1), make_signin(2)], SIGNIN_COLUMNS)
+
+        assert len(batch) == 2
+        assert batch.column("status_error_code") == [1, 0]
+        assert batch.column("location_city") == ["Oslo", "Oslo"]
+        assert batch[1]["id"] == "id-2"
+        assert batch[1]["device_browser"] is None
+        assert list(batch)[0]["created_datetime"] == "2024-01-01T00:00:01Z"
+        assert len(batch[:1]) == 1
+
+    def test_repeated_strings_are_shared(self):
+        """Test that equal strings of a column are stored once, until the column proves unique"""
+        batch = RecordBatch({"app": "appDisplayName", "id": "id"})
+        batch.extend(make_signin(n) for n in range(POOL_LIMIT + 10))
+
+        apps = batch.column("app")
+        assert all(app is apps[0] for app in apps)
+        assert batch._pools[1] is None
+
+    def test_rows_encode_lists(self):
+        """Test that list values are encoded for flat text writers"""
+        record = make_signin(1)
+        record["appliedConditionalAccessPolicies"] = [{"id": "p1"}, {"id": "p2"}]
+        batch = RecordBatch.from_records([record], {"id": "id", "policies": "appliedConditionalAccessPolicies"})
+
+        assert list(batch.rows("json")) == [("id-1", '[{"id":"p1"},{"id":"p2"}]')]
+        assert list(batch.rows("count")) == [("id-1", 2)]
+        assert list(batch.rows())[0][1] == [{"id": "p1"}, {"id": "p2"}]
+
+    def test_frame_is_typed_by_exporter(self, tmp_path):
+        """Test that exporters consume a batch without building row dicts"""
+        batch = RecordBatch.from_records([make_signin(1), make_signin(2)], SIGNIN_COLUMNS)
+        settings = MagicMock(spec=Settings)
+        settings.list_encoding = "json"
+        with patch('graphreporter.export.base.get_settings', return_value=settings):
+            exporter = CSVExporter(tmp_path, SIGNIN_COLUMNS, SIGNIN_COLUMN_TYPES)
+
+        output_file = exporter.export(batch, "signins")
+
+        written = pd.read_csv(output_file)
+        assert list(written.columns) == list(SIGNIN_COLUMNS)
+        assert written["status_error_code"].tolist() == [1, 0]
+        assert written["app_display_name"].tolist() == ["Azure Portal", "Azure Portal"]
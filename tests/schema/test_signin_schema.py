@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for the sign-in output schema
+"""
+
+import pytest
+
+from graphreporter.schema.signins import SIGNIN_COLUMNS, build_select, flatten_signin, select_properties
+
+
+class TestSelectProperties:
+    """Test cases for the $select projection"""
+
+    def test_nested_columns_select_their_parent_once(self):
+        """Test that nested columns collapse onto their top-level property"""
+        select = build_select(["status_error_code", "status_failure_reason", "app_display_name"])
+
+        assert select == "id,createdDateTime,status,appDisplayName"
+
+    def test_graph_property_paths_are_accepted(self):
+        """Test that dotted Graph paths work alongside flat column names"""
+        assert select_properties(["deviceDetail.browser", "riskState"]) == [
+            "id", "createdDateTime", "deviceDetail", "riskState",
+        ]
+
+    def test_default_covers_every_output_column(self):
+        """Test that no columns means every column of the flat schema"""
+        properties = select_properties()
+
+        assert {path.split(".")[0] for path in SIGNIN_COLUMNS.values()} == set(properties)
+
+    def test_unknown_column_raises(self):
+        """Test that a typo is reported instead of silently dropping data"""
+        with pytest.raises(ValueError, match="statuss"):
+            build_select(["statuss"])
+
+
+class TestFlattenSignin:
+    """Test cases for mapping raw signIn objects to flat rows"""
+
+    def test_nested_properties_map_to_flat_columns(self):
+        """Test that dotted paths are resolved and missing properties become None"""
+        record = {
+            "id": "1",
+            "createdDateTime": "2024-01-01T00:00:00Z",
+            "status": {"errorCode": 50126, "failureReason": "Invalid password"},
+            "location": None,
+        }
+
+        row = flatten_signin(record)
+
+        assert list(row) == list(SIGNIN_COLUMNS)
+        assert row["status_error_code"] == 50126
+        assert row["status_failure_reason"] == "Invalid password"
+        assert row["location_city"] is None
+        assert row["device_browser"] is None
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for incremental export checkpoints
+"""
+
+from datetime import datetime, timedelta
+
+from graphreporter.sync.checkpoint import CheckpointStore, IncrementalSync, parse_timestamp
+
+
+def signin(record_id, created):
+    """Build a minimal sign-in record"""
+    return {"id": record_id, "createdDateTime": created}
+
+
+class TestIncrementalSync:
+    """Test cases for the IncrementalSync class"""
+
+    def test_first_run_uses_lookback_and_saves_high_water_mark(self, tmp_path):
+        """Test that the first run looks back and checkpoints the newest records"""
+        store = CheckpointStore(tmp_path)
+        sync = IncrementalSync(store, "signins", timedelta(days=7))
+        assert datetime.utcnow() - sync.start_date >= timedelta(days=7)
+
+        records = [
+            signin("c", "2024-01-02T10:00:00Z"),
+            signin("b", "2024-01-02T10:00:00Z"),
+            signin("a", "2024-01-01T09:00:00Z"),
+        ]
+        assert list(sync.filter(records)) == records
+        sync.commit()
+
+        checkpoint = store.load("signins")
+        assert checkpoint.high_water_mark == datetime(2024, 1, 2, 10)
+        assert checkpoint.boundary_ids == {"b", "c"}
+
+    def test_next_run_skips_records_at_the_boundary(self, tmp_path):
+        """Test that the inclusive boundary does not export records twice"""
+        store = CheckpointStore(tmp_path)
+        first = IncrementalSync(store, "signins", timedelta(days=7))
+        list(first.filter([signin("b", "2024-01-02T10:00:00Z")]))
+        first.commit()
+
+        second = IncrementalSync(store, "signins", timedelta(days=7))
+        assert second.start_date == datetime(2024, 1, 2, 10)
+
+        records = [
+            signin("d", "2024-01-02T11:00:00.1234567Z"),
+            signin("c", "2024-01-02T10:00:00Z"),
+            signin("b", "2024-01-02T10:00:00Z"),
+        ]
+        assert [r["id"] for r in second.filter(records)] == ["d", "c"]
+
+    def test_late_arrivals_inside_the_settle_window_are_exported(self, tmp_path):
+        """Test that the next run queries before the mark and drops only exported ids"""
+        store = CheckpointStore(tmp_path)
+        first = IncrementalSync(store, "signins", timedelta(days=7))
+        first.start_date = datetime(2024, 1, 2)
+        list(first.filter([signin("b", "2024-01-02T10:00:00Z"), signin("a", "2024-01-02T09:30:00Z")]))
+        first.commit()
+
+        second = IncrementalSync(store, "signins", timedelta(days=7))
+        assert second.start_date == datetime(2024, 1, 2, 9)
+
+        records = [
+            signin("c", "2024-01-02T10:05:00Z"),
+            signin("b", "2024-01-02T10:00:00Z"),
+            signin("late", "2024-01-02T09:45:00Z"),
+            signin("a", "2024-01-02T09:30:00Z"),
+        ]
+        assert [r["id"] for r in second.filter(records)] == ["c", "late"]
+        second.commit()
+
+        checkpoint = store.load("signins")
+        assert checkpoint.high_water_mark == datetime(2024, 1, 2, 10, 5)
+        assert checkpoint.window_start == datetime(2024, 1, 2, 9, 5)
+        assert set(checkpoint.recent_ids) == {"a", "b", "c", "late"}
+
+    def test_legacy_checkpoint_starts_at_the_mark(self, tmp_path):
+        """Test that a checkpoint without recent ids does not export its boundary twice"""
+        store = CheckpointStore(tmp_path)
+        (tmp_path / "signins.json").write_text('{"high_water_mark": "2024-01-02T10:00:00Z", "boundary_ids": ["b"]}')
+
+        sync = IncrementalSync(store, "signins", timedelta(days=7))
+        assert sync.start_date == datetime(2024, 1, 2, 10)
+        assert [r["id"] for r in sync.filter([signin("b", "2024-01-02T10:00:00Z")])] == []
+
+    def test_checkpoint_is_unchanged_until_commit(self, tmp_path):
+        """Test that an interrupted run does not move the high-water mark"""
+        store = CheckpointStore(tmp_path)
+        sync = IncrementalSync(store, "signins", timedelta(days=7))
+        list(sync.filter([signin("a", "2024-01-01T00:00:00Z")]))
+
+        assert store.load("signins") is None
+
+
+class TestCheckpointStore:
+    """Test cases for the CheckpointStore class"""
+
+    def test_key_depends_on_filters_only(self, tmp_path):
+        """Test that each combination of filters gets its own key"""
+        store = CheckpointStore(tmp_path)
+
+        assert store.key("signins") == "signins"
+        assert store.key("signins", user_id=None) == "signins"
+        assert store.key("signins", app_id="x") == store.key("signins", app_id="x", user_id=None)
+        assert store.key("signins", app_id="x") != store.key("signins", app_id="y")
+
+    def test_parse_timestamp_normalizes_to_naive_utc(self):
+        """Test that offsets and long fractions are normalized"""
+        assert parse_timestamp("2024-01-01T12:00:00.1234567Z") == datetime(2024, 1, 1, 12, 0, 0, 123456)
+        assert parse_timestamp("2024-01-01T14:00:00+02:00") == datetime(2024, 1, 1, 12)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for deduplication across chunk windows
+"""
+
+from datetime import datetime
+
+from graphreporter.sync.dedup import BloomFilter, Deduplicator
+
+
+def signin(record_id, created):
+    """Build a minimal sign-in record"""
+    return {"id": record_id, "createdDateTime": created}
+
+
+BOUNDARY = datetime(2024, 1, 2)
+
+
+class TestDeduplicator:
+    """Test cases for the Deduplicator class"""
+
+    def test_boundary_records_are_written_once(self):
+        """Test that a record returned by both chunks of a boundary is dropped the second time"""
+        dedup = Deduplicator(boundaries=[BOUNDARY])
+        first_chunk = [signin("a", "2024-01-01T12:00:00Z"), signin("b", "2024-01-02T00:00:00Z")]
+        second_chunk = [signin("b", "2024-01-02T00:00:00Z"), signin("c", "2024-01-02T00:00:30.5Z")]
+
+        kept = [record["id"] for record in dedup.filter(first_chunk + second_chunk)]
+
+        assert kept == ["a", "b", "c"]
+        assert dedup.counters() == {
+            "seen": 4,
+            "unique": 3,
+            "duplicates": 1,
+            "boundary_duplicates": 1,
+            "probable_duplicates": 0,
+            "boundary_ids": 2,
+        }
+        assert dedup.summary() == "Duplicates dropped: 1 of 4 records (1 at chunk boundaries)"
+
+    def test_exact_set_only_holds_boundary_records(self):
+        """Test that memory stays bounded: records away from boundaries are not kept"""
+        dedup = Deduplicator(boundaries=[BOUNDARY])
+        records = [signin(str(n), "2024-01-01T12:00:00Z") for n in range(100)]
+
+        assert len(list(dedup.filter(records + records))) == 200
+        assert dedup.boundary_ids == set()
+
+    def test_whole_run_filter_drops_retried_chunks(self):
+        """Test that the Bloom filter catches duplicates anywhere in the run"""
+        dedup = Deduplicator(boundaries=[BOUNDARY], capacity=1000)
+        chunk = [signin(str(n), "2024-01-01T12:00:00Z") for n in range(100)]
+
+        assert len(list(dedup.filter(chunk))) == 100
+        assert list(dedup.filter(chunk)) == []
+        assert dedup.probable_duplicates == 100
+        assert "100 by the whole-run filter" in dedup.summary()
+
+
+class TestBloomFilter:
+    """Test cases for the BloomFilter class"""
+
+    def test_no_false_negatives_and_few_false_positives(self):
+        """Test that added strings are always found and others rarely"""
+        bloom = BloomFilter(capacity=10000, error_rate=0.01)
+        for n in range(10000):
+            bloom.add(f"id-{n}")
+
+        assert all(f"id-{n}" in bloom for n in range(10000))
+        false_positives = sum(f"other-{n}" in bloom for n in range(10000))
+        assert false_positives < 300
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for the delta sync of directory collections
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from graphreporter.sync.delta import DeltaSync
+
+
+SELECT = "id,appId,displayName"
+
+
+def make_client(rounds):
+    """Build a client whose iter_pages serves one list of pages per call"""
+    client = MagicMock()
+    client.iter_pages.side_effect = rounds
+    return client
+
+
+class TestDeltaSync:
+    """Test cases for the DeltaSync class"""
+
+    def test_later_sync_applies_only_changes(self, tmp_path):
+        """Test that adds, partial updates and removals are applied to the snapshot"""
+        client = make_client([
+            [
+                {"value": [{"id": "1", "displayName": "One"}], "@odata.nextLink": "next"},
+                {"value": [{"id": "2", "displayName": "Two"}], "@odata.deltaLink": "delta-1"},
+            ],
+            [
+                {"value": [
+                    {"id": "1", "displayName": "Uno"},
+                    {"id": "2", "@removed": {"reason": "deleted"}},
+                    {"id": "3", "displayName": "Three"},
+                ], "@odata.deltaLink": "delta-2"},
+            ],
+        ])
+
+        first = DeltaSync(client, "applications", SELECT, tmp_path).sync()
+        assert sorted(app["displayName"] for app in first) == ["One", "Two"]
+        client.iter_pages.assert_called_with("applications/delta", {"$select": SELECT})
+
+        sync = DeltaSync(client, "applications", SELECT, tmp_path)
+        second = sync.sync()
+        client.iter_pages.assert_called_with("delta-1", None)
+        assert sorted(app["displayName"] for app in second) == ["Three", "Uno"]
+        assert (sync.added, sync.updated, sync.removed) == (1, 1, 1)
+
+    def test_expired_delta_link_falls_back_to_full_sync(self, tmp_path):
+        """Test that a resync error restarts from an empty snapshot"""
+        client = make_client([
+            [{"value": [{"id": "1"}], "@odata.deltaLink": "delta-1"}],
+            ValueError("Graph API request failed: {'error': {'code': 'resyncRequired'}}"),
+            [{"value": [{"id": "2"}], "@odata.deltaLink": "delta-2"}],
+        ])
+
+        DeltaSync(client, "applications", SELECT, tmp_path).sync()
+        objects = DeltaSync(client, "applications", SELECT, tmp_path).sync()
+
+        assert objects == [{"id": "2"}]
+
+    def test_other_errors_are_raised(self, tmp_path):
+        """Test that ordinary request failures are not mistaken for an expired token"""
+        client = make_client([
+            [{"value": [], "@odata.deltaLink": "delta-1"}],
+            ValueError("Graph API request failed: Forbidden"),
+        ])
+
+        DeltaSync(client, "applications", SELECT, tmp_path).sync()
+        with pytest.raises(ValueError, match="Forbidden"):
+            DeltaSync(client, "applications", SELECT, tmp_path).sync()
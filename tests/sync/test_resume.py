@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for resumable exports
+"""
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from graphreporter.sync.resume import ExportJournal, iter_resumable_pages
+
+
+PAGES = {
+    None: {"value": [1, 2], "@odata.nextLink": "page-2"},
+    "page-2": {"value": [3, 4], "@odata.nextLink": "page-3"},
+    "page-3": {"value": [5]},
+}
+
+
+def make_client():
+    """Build a client whose iter_pages walks PAGES from an optional nextLink"""
+    def iter_pages(path, params=None, next_link=None):
+        page = PAGES[next_link]
+        while True:
+            yield page
+            if "@odata.nextLink" not in page:
+                return
+            page = PAGES[page["@odata.nextLink"]]
+
+    client = MagicMock()
+    client.iter_pages.side_effect = iter_pages
+    return client
+
+
+class TestExportJournal:
+    """Test cases for the ExportJournal class"""
+
+    def test_resume_continues_after_last_committed_page(self, tmp_path):
+        """Test that an interrupted chunk restarts at the page after the last one written"""
+        client = make_client()
+        journal = ExportJournal(tmp_path, "job")
+        journal.start(datetime(2024, 1, 1), datetime(2024, 1, 2))
+
+        written = []
+        pages = iter_resumable_pages(client, journal, "chunk-1", "auditLogs/signIns")
+        written.extend(next(pages)["value"])
+        written.extend(next(pages)["value"])
+        pages.close()  # Interrupted while the second page is being written
+
+        progress = journal.chunk("chunk-1")
+        assert progress == {"next_link": "page-2", "written": 2, "output": None, "offset": None, "complete": False}
+
+        resumed = ExportJournal(tmp_path, "job")
+        resumed.start(datetime(2024, 2, 1), datetime(2024, 2, 2), resume=True)
+        written = written[:progress["written"]]
+        for page in iter_resumable_pages(client, resumed, "chunk-1", "auditLogs/signIns"):
+            written.extend(page["value"])
+
+        assert written == [1, 2, 3, 4, 5]
+        assert resumed.is_complete("chunk-1")
+        assert resumed.chunk("chunk-1")["written"] == 5
+
+    def test_resume_keeps_original_window(self, tmp_path):
+        """Test that a resumed export reuses the window of the interrupted run"""
+        ExportJournal(tmp_path, "app one/two").start(datetime(2024, 1, 1), datetime(2024, 1, 31))
+
+        window = ExportJournal(tmp_path, "app one/two").start(
+            datetime(2024, 2, 1), datetime(2024, 2, 29), resume=True
+        )
+
+        assert window == (datetime(2024, 1, 1), datetime(2024, 1, 31))
+
+    def test_complete_chunk_with_missing_output_is_exported_again(self, tmp_path):
+        """Test that a chunk whose file was deleted is not skipped"""
+        journal = ExportJournal(tmp_path, "job")
+        journal.start(datetime(2024, 1, 1), datetime(2024, 1, 2))
+        output = tmp_path / "chunk.csv"
+        output.write_text("id\n1\n")
+        journal.complete("chunk-1", 1, str(output))
+
+        assert journal.is_complete("chunk-1")
+        output.unlink()
+        assert not journal.is_complete("chunk-1")
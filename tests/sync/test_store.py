@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test for the local sign-in store
+"""
+
+from datetime import datetime, timedelta
+
+from graphreporter.sync.store import SignInStore
+
+
+DAY = timedelta(days=1)
+START = datetime(2024, 1, 1)
+
+
+def signin(ts, upn="alice@example.com", app_id="app-1"):
+    """Build a minimal sign-in record"""
+    return {
+        "id": f"{upn}-{ts.isoformat()}",
+        "createdDateTime": ts.isoformat() + "Z",
+        "userId": upn.split("@")[0],
+        "userPrincipalName": upn,
+        "appId": app_id,
+        "location": {"city": "Oslo"},
+    }
+
+
+class TestSignInStore:
+    """Test cases for SignInStore"""
+
+    def test_missing_returns_gaps_around_covered_ranges(self, tmp_path):
+        """Test that only uncovered parts of a range are reported"""
+        store = SignInStore(tmp_path / "signins.sqlite3")
+        store.save([], START + DAY, START + 2 * DAY)
+        store.save([], START + 3 * DAY, START + 4 * DAY)
+
+        assert store.missing(START, START + 5 * DAY) == [
+            (START, START + DAY),
+            (START + 2 * DAY, START + 3 * DAY),
+            (START + 4 * DAY, START + 5 * DAY),
+        ]
+        assert store.missing(START + DAY, START + 2 * DAY) == []
+
+    def test_adjacent_ranges_are_merged(self, tmp_path):
+        """Test that touching ranges collapse into one interval"""
+        store = SignInStore(tmp_path / "signins.sqlite3")
+        store.save([], START, START + DAY)
+        store.save([], START + 2 * DAY, START + 3 * DAY)
+        store.save([], START + DAY, START + 2 * DAY)
+
+        assert store._db.execute("SELECT COUNT(*) FROM coverage").fetchone() == (1,)
+        assert store.missing(START, START + 3 * DAY) == []
+
+    def test_unfiltered_coverage_answers_filtered_queries(self, tmp_path):
+        """Test that a range fetched for everyone covers a single user, but not the reverse"""
+        store = SignInStore(tmp_path / "signins.sqlite3")
+        store.save([signin(START + timedelta(hours=1))], START, START + DAY, user_id="Alice@example.com")
+        store.save([], START + DAY, START + 2 * DAY)
+
+        assert store.missing(START, START + 2 * DAY, user_id="alice@example.com", app_id="app-1") == []
+        assert store.missing(START, START + 2 * DAY) == [(START, START + DAY)]
+        assert store.missing(START, START + 2 * DAY, user_id="bob@example.com") == [(START, START + DAY)]
+
+    def test_query_filters_orders_and_projects(self, tmp_path):
+        """Test that stored sign-ins come back like a Graph query would return them"""
+        store = SignInStore(tmp_path / "signins.sqlite3")
+        records = [
+            signin(START + timedelta(hours=1)),
+            signin(START + timedelta(hours=2), upn="bob@example.com"),
+            signin(START + timedelta(hours=3), app_id="app-2"),
+        ]
+        assert store.save(records + records[:1], START, START + DAY) == 4
+
+        assert [r["id"] for r in store.query(START, START + DAY)] == [r["id"] for r in reversed(records)]
+        assert [r["id"] for r in store.query(START, START + DAY, user_id="ALICE@example.com", app_id="app-1")] == [
+            records[0]["id"]
+        ]
+        assert [r["id"] for r in store.query(START, START + DAY, user_id="bob")] == [records[1]["id"]]
+        assert list(store.query(START, START + DAY, columns=["location_city"]))[0] == {
+            "id": records[2]["id"],
+            "createdDateTime": records[2]["createdDateTime"],
+            "location": {"city": "Oslo"},
+        }
+
+    def test_query_applies_odata_filter(self, tmp_path):
+        """Test that a filter Graph rejects for sign-ins is evaluated locally"""
+        store = SignInStore(tmp_path / "signins.sqlite3")
+        records = [signin(START + timedelta(hours=1)), signin(START + timedelta(hours=2), app_id="portal-app")]
+        store.save(records, START, START + DAY)
+
+        assert [r["id"] for r in store.query(START, START + DAY, odata_filter="contains(appId, 'PORTAL')")] == [
+            records[1]["id"]
+        ]